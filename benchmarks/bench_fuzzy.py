@@ -0,0 +1,64 @@
+"""
+Micro-benchmark: per-element thefuzz loops vs. the batched rapidfuzz cdist kernel.
+
+    python -m benchmarks.bench_fuzzy
+"""
+import time
+import numpy as np
+from thefuzz import fuzz
+from benchmarks.synthetic_pages import generate_elements, generate_visual_elements
+from utilities.fuzzy_kernel import weighted_attribute_scores
+from utilities.scoring_engine import BatchScoringEngine
+
+SIZES = [100, 1000, 10000]
+QUERIES = ["username", "password", "login button", "employee name"]
+ENGINE_WEIGHTS = {'aria-label': 1.0, 'placeholder': 0.9, 'label_text': 1.0, 'name': 0.4, 'id': 0.05}
+OCR_WEIGHTS = {
+    'id': 1.0, 'name': 0.9, 'aria-label': 0.9,
+    'alt': 0.8, 'placeholder': 0.8, 'labelText': 0.8,
+    'text': 0.7, 'src': 0.5, 'role': 0.4
+}
+
+
+def legacy_engine_fuzzy(query, elements, weights):
+    """The pre-kernel BatchScoringEngine row: three thefuzz calls per element."""
+    return np.array([
+        fuzz.partial_ratio(query, el['aria'].lower()) * weights['aria-label'] +
+        fuzz.partial_ratio(query, el['placeholder'].lower()) * weights['placeholder'] +
+        fuzz.token_sort_ratio(query, el['intent'].lower()) * weights['label_text']
+        for el in elements
+    ])
+
+
+def legacy_attr_scores(query, elements, weights):
+    """The pre-kernel attribute loop from test_code_generation_2._find_locator_weighted."""
+    return np.array([sum(fuzz.partial_ratio(query, str(el.get(k, "")).lower()) * v
+                         for k, v in weights.items() if el.get(k)) for el in elements])
+
+
+def _time(fn):
+    started = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - started, out
+
+
+def run():
+    scorer = BatchScoringEngine(embedder=None, weights=ENGINE_WEIGHTS)
+    print(f"{'engine':>12} | {'elements':>8} | {'loop (s)':>9} | {'cdist (s)':>9} | {'speedup':>8} | same")
+    print("-" * 68)
+    for size in SIZES:
+        elements = generate_elements(size)
+        loop_t, old = _time(lambda: np.vstack([legacy_engine_fuzzy(q, elements, ENGINE_WEIGHTS) for q in QUERIES]))
+        kernel_t, new = _time(lambda: scorer._fuzzy_matrix(QUERIES, elements))
+        same = np.array_equal(old, new)
+        print(f"{'ai_engine':>12} | {size:>8} | {loop_t:>9.3f} | {kernel_t:>9.3f} | {loop_t / kernel_t:>7.1f}x | {'✅' if same else '❌'}")
+
+        visual = generate_visual_elements(size)
+        loop_t, old = _time(lambda: [legacy_attr_scores(q, visual, OCR_WEIGHTS) for q in QUERIES])
+        kernel_t, new = _time(lambda: [weighted_attribute_scores(q, visual, OCR_WEIGHTS) for q in QUERIES])
+        same = all(np.array_equal(o, n) for o, n in zip(old, new))
+        print(f"{'ocr_gen2':>12} | {size:>8} | {loop_t:>9.3f} | {kernel_t:>9.3f} | {loop_t / kernel_t:>7.1f}x | {'✅' if same else '❌'}")
+
+
+if __name__ == "__main__":
+    run()
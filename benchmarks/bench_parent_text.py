@@ -0,0 +1,120 @@
+"""
+Micro-benchmark: container text fetched per candidate (one elementFromPoint execute_script
+each, the pre-fold test_code_generation_2 loop) vs. scraped with every element by
+_get_deep_elements and scored in one cdist call.
+
+    python -m benchmarks.bench_parent_text                          # synthetic pages
+    python -m benchmarks.bench_parent_text --fixture fixtures/login # page recorded with --record-fixtures
+    python -m benchmarks.bench_parent_text --rtt-ms 5               # slower (remote/grid) WebDriver
+
+ReplayDriver sleeps --rtt-ms on every execute_script, standing in for the WebDriver HTTP roundtrip.
+"""
+import argparse
+import time
+import numpy as np
+from thefuzz import fuzz
+from benchmarks.synthetic_pages import SyntheticPage
+from utilities.fuzzy_kernel import weighted_attribute_scores
+from utilities.replay_driver import ReplayDriver
+
+SIZES = [100, 1000, 10000]
+STEPS = ["Enter username as 'Admin'", "Click on Login button", "Employee Name"]
+PARENT_WEIGHTS = {'parentText': 0.3}
+LEGACY_PARENT_SCRIPT = """
+                let el = document.elementFromPoint(arguments[0], arguments[1]);
+                let p = el ? el.closest('tr, div, section, li, form, [role="gridcell"]') : null;
+                return p ? p.innerText.split('\\n').slice(0,2).join(' ') : "";
+            """
+
+
+class SlowReplayDriver(ReplayDriver):
+    """ReplayDriver with a fixed per-script roundtrip."""
+
+    def __init__(self, rtt_s, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rtt_s = rtt_s
+
+    def execute_script(self, script, *args):
+        time.sleep(self.rtt_s)
+        return super().execute_script(script, *args)
+
+
+def legacy_parent_responder(elements):
+    """Answers LEGACY_PARENT_SCRIPT at each element's probe point (rect + 2) with its container text."""
+    by_point = {(el['rect']['x'] + 2, el['rect']['y'] + 2): el.get('parentText', '') for el in elements}
+    return ("elementFromPoint", lambda driver, x, y: by_point.get((x, y), ""))
+
+
+def recorded_page(fixture_dir):
+    """The last test_code_generation_2 scrape stored in a fixture (needs a recording that has parentText)."""
+    fixture = ReplayDriver.load(fixture_dir).fixture
+    scrapes = [e for e in fixture["scripts"].values() if "foundElements" in e.get("head", "")]
+    if not scrapes:
+        raise SystemExit(f"❌ {fixture_dir} holds no test_code_generation_2 scrape")
+    return fixture, scrapes[-1]["responses"][-1]
+
+
+def legacy_parent_bonuses(driver, query, elements, candidates):
+    """The removed per-candidate loop: one roundtrip + one partial_ratio per element over the semantic filter."""
+    bonuses = np.zeros(len(elements))
+    for i in candidates:
+        rect = elements[i]['rect']
+        parent_text = driver.execute_script(LEGACY_PARENT_SCRIPT, rect['x'] + 2, rect['y'] + 2)
+        bonuses[i] = (fuzz.partial_ratio(query, parent_text.lower()) * 0.3) if parent_text else 0
+    return bonuses
+
+
+def semantic_candidates(query, elements):
+    """Indices the scoring loop keeps (semantic_sim >= 0.15), from the engine's own embedder."""
+    from steps.test_code_generation_2 import EMBEDDER, AIAutomationFramework
+    from utilities.word_vectors import cosine_similarities
+    sims = cosine_similarities(EMBEDDER.vectors([query])[0],
+                               EMBEDDER.vectors([AIAutomationFramework._identity(el) for el in elements]))
+    return [i for i, sim in enumerate(sims) if sim >= 0.15]
+
+
+def _time(fn):
+    started = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - started, out
+
+
+def run(sizes=SIZES, rtt_ms=2.0, fixture_dir=None):
+    rtt_s = rtt_ms / 1000
+    if fixture_dir:
+        fixture, elements = recorded_page(fixture_dir)
+        responders = [legacy_parent_responder(elements)]
+        pages = [(fixture_dir, elements, lambda: SlowReplayDriver(rtt_s, fixture, responders))]
+    else:
+        pages = []
+        for n in sizes:
+            page = SyntheticPage(n)
+            responders = page.responders() + [legacy_parent_responder(page.visual)]
+            pages.append((f"synthetic/{n}", page.visual, lambda r=responders: SlowReplayDriver(rtt_s, None, r)))
+
+    print(f"roundtrip: {rtt_ms} ms per execute_script")
+    print(f"{'page':>22} | {'step':>26} | {'calls':>6} | {'legacy (s)':>10} | {'folded (s)':>10} | {'speedup':>8}")
+    print("-" * 98)
+    for name, elements, make_driver in pages:
+        for step in STEPS:
+            query = step.lower()
+            candidates = semantic_candidates(query, elements)
+            legacy_driver = make_driver()
+            legacy_t, _ = _time(lambda: legacy_parent_bonuses(legacy_driver, query, elements, candidates))
+            # Folded: the container text rode along with the scrape the step makes anyway (+0 roundtrips)
+            folded_t, _ = _time(lambda: weighted_attribute_scores(query, elements, PARENT_WEIGHTS))
+            print(f"{name:>22} | {step[:26]:>26} | {legacy_driver.calls['scripts']:>6} | {legacy_t:>10.3f} | "
+                  f"{folded_t:>10.3f} | {legacy_t / max(folded_t, 1e-9):>7.0f}x")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--rtt-ms", type=float, default=2.0, help="simulated WebDriver roundtrip per script")
+    parser.add_argument("--fixture", default=None, help="fixture directory written by pytest --record-fixtures")
+    args = parser.parse_args(argv)
+    run(args.sizes, args.rtt_ms, args.fixture)
+
+
+if __name__ == "__main__":
+    main()
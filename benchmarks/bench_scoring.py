@@ -0,0 +1,61 @@
+"""
+Micro-benchmark: legacy per-element spaCy loop vs. BatchScoringEngine.
+
+    python -m benchmarks.bench_scoring
+"""
+import time
+import spacy
+from thefuzz import fuzz
+from benchmarks.synthetic_pages import generate_elements
+from utilities.ai_engine import AIAutomationFramework
+from utilities.scoring_engine import BatchScoringEngine
+from utilities.word_vectors import SpacyEmbedder
+
+SIZES = [100, 1000, 10000]
+QUERIES = ["username", "password", "login button", "employee name"]
+
+
+def legacy_rank(nlp, weights, user_query, elements):
+    """The pre-batching loop from _find_locator_weighted, kept here as the reference."""
+    query_doc = nlp(user_query.lower())
+    matches = []
+    for el in elements:
+        scores = {
+            'aria-label': fuzz.partial_ratio(user_query.lower(), el['aria'].lower()),
+            'placeholder': fuzz.partial_ratio(user_query.lower(), el['placeholder'].lower()),
+            'label_text': fuzz.token_sort_ratio(user_query.lower(), el['intent'].lower())
+        }
+        weighted_sum = sum(scores[k] * weights.get(k, 0) for k in scores)
+        el_doc = nlp(el['intent'].lower())
+        sim = query_doc.similarity(el_doc) if query_doc.vector_norm > 0 else 0
+        matches.append({"total": (weighted_sum / 2) + (sim * 50), "element": el})
+    matches.sort(key=lambda x: x['total'], reverse=True)
+    return matches
+
+
+def run(top_k=5):
+    nlp = spacy.load("en_core_web_md")
+    weights = AIAutomationFramework.WEIGHTS
+    engine = BatchScoringEngine(SpacyEmbedder(nlp), weights)
+
+    print(f"{'elements':>9} | {'legacy (s)':>11} | {'batched (s)':>11} | {'speedup':>8} | top-{top_k} match")
+    print("-" * 64)
+    for size in SIZES:
+        elements = generate_elements(size)
+        legacy_t = batched_t = 0.0
+        same = True
+        for q in QUERIES:
+            t0 = time.perf_counter()
+            old = legacy_rank(nlp, weights, q, elements)[:top_k]
+            legacy_t += time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            new = engine.rank(q, elements, top_k=top_k)
+            batched_t += time.perf_counter() - t0
+
+            same &= [m['element']['xpath'] for m in old] == [m['element']['xpath'] for m in new]
+        print(f"{size:>9} | {legacy_t:>11.3f} | {batched_t:>11.3f} | {legacy_t / batched_t:>7.1f}x | {'✅' if same else '❌'}")
+
+
+if __name__ == "__main__":
+    run()
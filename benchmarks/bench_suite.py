@@ -0,0 +1,245 @@
+"""
+Offline benchmark suite: the locator engines against synthetic pages (100 / 1k / 10k
+elements) and recorded fixtures, served by ReplayDriver. No browser, no network.
+
+    python -m benchmarks.bench_suite                      # run + compare with the baseline
+    python -m benchmarks.bench_suite --save-baseline      # store this machine's numbers
+    python -m benchmarks.bench_suite --fixtures fixtures  # + replay of --record-fixtures runs
+    python -m benchmarks.bench_suite --check              # exit 1 on a p50 regression (or no baseline)
+
+Fixtures come from a live run with:  pytest --generate --record-fixtures fixtures
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+from benchmarks.synthetic_pages import SyntheticPage
+from utilities.ai_engine import AIAutomationFramework
+from utilities.replay_driver import FIXTURE_FILE, ReplayDriver
+
+SIZES = [100, 1000, 10000]
+STEP = '[ai] user enters "Username" and "Password" then clicks "Login"'
+QUERY = "Employee Name"
+OCR_STEPS = ["Enter username as 'Admin'", "Click on Login button"]
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def measure(fn, repeat, warmup=1):
+    """Wall-clock samples (ms) of `repeat` calls after `warmup` unmeasured ones."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def summarize(samples, items=1):
+    ms = np.array(samples, dtype=np.float64)
+    mean = float(ms.mean())
+    return {
+        "n": len(samples),
+        "p50_ms": round(float(np.percentile(ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(ms, 95)), 3),
+        "mean_ms": round(mean, 3),
+        "ops_per_s": round(1000 / mean, 2) if mean else 0.0,
+        "items_per_s": round(items * 1000 / mean, 1) if mean else 0.0
+    }
+
+
+class Suite:
+    def __init__(self, sizes, repeat):
+        self.sizes = sizes
+        self.repeat = repeat
+        self.results = {}
+        self.skipped = {}
+        self._workdir = tempfile.mkdtemp(prefix="ai_bench_")
+        self._scorer = None
+        self._engines = 0
+
+    def engine(self, driver):
+        """Fresh engine (empty memory, empty DOM cache) that shares one loaded scorer."""
+        self._engines += 1
+        engine = AIAutomationFramework(driver, memory_file=os.path.join(self._workdir, f"mem_{self._engines}.json"),
+                                       memory_flush_interval=None, embedding_cache=None, audit_mode="off")
+        if self._scorer is None:
+            self._scorer = engine._get_scorer()
+        engine._scorer = self._scorer
+        return engine
+
+    def record(self, name, samples, items=1):
+        self.results[name] = summarize(samples, items)
+        s = self.results[name]
+        print(f"{name:<42} p50 {s['p50_ms']:>10.2f} ms   p95 {s['p95_ms']:>10.2f} ms   {s['ops_per_s']:>9.2f} ops/s")
+
+    # --- 🧠 utilities.ai_engine ---
+
+    def bench_ai_engine(self, page):
+        n = page.count
+        self.record(f"get_step_metadata/heal/{n}",
+                    measure(lambda: self.engine(page.driver()).get_step_metadata(STEP), self.repeat), n)
+
+        warm = self.engine(page.driver())
+        warm.get_step_metadata(STEP)
+        self.record(f"get_step_metadata/memory/{n}", measure(lambda: warm.get_step_metadata(STEP), self.repeat), n)
+
+        self.record(f"find_locator_weighted/{n}",
+                    measure(lambda: self.engine(page.driver())._find_locator_weighted(QUERY), self.repeat), n)
+
+        # Same page, several steps: the index is built once per DOM generation and reused
+        indexed, scanning = self.engine(page.driver()), self.engine(page.driver())
+        scanning.pruner.top_n = None  # every element scored: the pre-index path
+        for engine in (indexed, scanning):
+            engine._find_locator_weighted(QUERY)
+        self.record(f"find_locator_weighted/warm/{n}",
+                    measure(lambda: indexed._find_locator_weighted(QUERY), self.repeat), n)
+        self.record(f"find_locator_weighted/warm_full_scan/{n}",
+                    measure(lambda: scanning._find_locator_weighted(QUERY), self.repeat), n)
+
+    # --- 👁️ OCR engines (steps/test_code_generation1.py, steps/test_code_generation_2.py) ---
+
+    def _ocr_engines(self):
+        if not hasattr(self, '_ocr'):
+            self._ocr = {}
+            models = os.path.join(os.getenv("EASYOCR_MODULE_PATH", os.path.expanduser("~/.EasyOCR")), "model")
+            if not os.path.isdir(models):
+                self.skipped["ocr"] = f"no EasyOCR models in {models} (downloading them needs network)"
+                return self._ocr
+            try:
+                from steps import test_code_generation1 as gen1
+                from steps import test_code_generation_2 as gen2
+            except ImportError as e:
+                self.skipped["ocr"] = f"OCR engine dependencies missing: {e}"
+                return self._ocr
+            self._ocr = {"ocr_gen1": gen1.AIAutomationFramework(None),
+                         "ocr_gen2": gen2.AIAutomationFramework(None, audit_mode="off")}
+        return self._ocr
+
+    def bench_ocr_engines(self, page):
+        engines = self._ocr_engines()
+        if not engines:
+            return
+        if not page.screenshot_png():
+            self.skipped["ocr"] = "Pillow is needed to render the synthetic screenshot"
+            return
+        n = page.count
+        for name, engine in engines.items():
+            engine.driver = page.driver()
+            ocr_results = engine._get_ocr_data()
+            self.record(f"{name}/ocr/{n}", measure(engine._get_ocr_data, self.repeat, warmup=0))
+            self.record(f"{name}/find_locator_weighted/{n}",
+                        measure(lambda: [engine._find_locator_weighted(s, ocr_results) for s in OCR_STEPS],
+                                self.repeat), n * len(OCR_STEPS))
+            if hasattr(engine, 'ocr_report'):
+                # 📐 Region OCR around the DOM candidates vs. the full frame (anchor rate in ocr_report)
+                for mode in ("roi", "band"):
+                    engine.ocr_mode = mode
+                    self.record(f"{name}/ocr_{mode}/{n}",
+                                measure(lambda: engine._get_ocr_data(OCR_STEPS), self.repeat, warmup=0))
+                engine.ocr_mode = "full"
+                engine._get_ocr_data(OCR_STEPS)
+                print(f"📐 {name}: {engine.ocr_report.stats()}")
+
+    # --- 📼 recorded fixtures ---
+
+    def bench_fixtures(self, fixture_root):
+        for name in sorted(os.listdir(fixture_root)):
+            fixture_dir = os.path.join(fixture_root, name)
+            if not os.path.exists(os.path.join(fixture_dir, FIXTURE_FILE)):
+                continue
+            scrapes = [s for s in ReplayDriver.load(fixture_dir).fixture["scrapes"] if s["intents"] and s["elements"]]
+            if not scrapes:
+                self.skipped[f"replay/{name}"] = "no recorded scrapes"
+                continue
+            engine = self.engine(ReplayDriver())
+            scorer, threshold = engine._get_scorer(), engine.THRESHOLD
+
+            def score_all():
+                for s in scrapes:
+                    scorer.assign(scorer.score_matrix(s["intents"], s["elements"]), threshold)
+
+            elements = sum(len(s["elements"]) for s in scrapes)
+            self.record(f"replay/{name}/score_assign", measure(score_all, self.repeat), elements)
+
+    def run(self, fixture_root=None, ocr=True):
+        for n in self.sizes:
+            page = SyntheticPage(n)
+            self.bench_ai_engine(page)
+            if ocr:
+                self.bench_ocr_engines(page)
+        if fixture_root:
+            self.bench_fixtures(fixture_root)
+        for case, reason in self.skipped.items():
+            print(f"⏭️ skipped {case}: {reason}")
+        return self.results
+
+
+def compare(results, baseline, tolerance):
+    """Prints p50 deltas against the baseline; returns the cases that regressed beyond tolerance."""
+    regressions = []
+    print(f"\n{'case':<42} {'baseline p50':>13} {'now p50':>10} {'delta':>8}")
+    for name, now in results.items():
+        base = baseline.get(name)
+        if not base:
+            print(f"{name:<42} {'-':>13} {now['p50_ms']:>10.2f}      new")
+            continue
+        delta = (now['p50_ms'] - base['p50_ms']) / base['p50_ms'] if base['p50_ms'] else 0.0
+        flag = ""
+        if delta > tolerance:
+            regressions.append(name)
+            flag = " ❌"
+        print(f"{name:<42} {base['p50_ms']:>13.2f} {now['p50_ms']:>10.2f} {delta:>+7.0%}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--fixtures", default=None, help="directory written by pytest --record-fixtures")
+    parser.add_argument("--no-ocr", action="store_true")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed p50 slowdown (0.25 = 25%%)")
+    parser.add_argument("--check", action="store_true")
+    parser.add_argument("--json", default=None, help="also write this run's results here")
+    args = parser.parse_args(argv)
+    if args.check and not args.save_baseline and not os.path.exists(args.baseline):
+        # Nothing to compare against is not a pass: fail before spending the run
+        print(f"❌ --check needs a baseline, none at {args.baseline} (run with --save-baseline first)")
+        return 1
+
+    results = Suite(args.sizes, args.repeat).run(args.fixtures, ocr=not args.no_ocr)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=4)
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=4, sort_keys=True)
+        print(f"\n💾 Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline} yet (run with --save-baseline)")
+        return 0
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        regressions = compare(results, json.load(f), args.tolerance)
+    if regressions and args.check:
+        print(f"\n❌ {len(regressions)} case(s) slower than baseline by more than {args.tolerance:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
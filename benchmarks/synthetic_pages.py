@@ -0,0 +1,126 @@
+import random
+
+# Vocabulary that looks like a busy React admin page (OrangeHRM-ish)
+LABELS = [
+    "Username", "Password", "Login", "Forgot your password", "Search", "Admin", "PIM", "Leave",
+    "Time", "Recruitment", "My Info", "Performance", "Dashboard", "Directory", "Maintenance",
+    "Claim", "Buzz", "Employee Name", "Employee Id", "Job Title", "Sub Unit", "Include",
+    "Supervisor Name", "Reset", "Add", "Edit", "Delete", "Save", "Cancel", "First Name",
+    "Middle Name", "Last Name", "Country", "Region", "Gender", "Male", "Female", "Nationality",
+    "Date of Birth", "Marital Status", "Upload", "Records Found", "Actions", "Status", "Help",
+]
+TAGS = ["input", "button", "a", "div", "span", "i", "svg", "select", "textarea"]
+
+
+def _component_type(tag):
+    if tag in ("input", "textarea"):
+        return "TEXTBOX"
+    if tag == "select":
+        return "DROPDOWN"
+    return "BUTTON"
+
+
+def generate_elements(count, seed=7):
+    """Builds `count` fake scrape records in the shape returned by ai_engine._get_deep_elements."""
+    rnd = random.Random(seed)
+    elements = []
+    for i in range(count):
+        tag = rnd.choice(TAGS)
+        words = rnd.sample(LABELS, rnd.choice([1, 1, 1, 2]))
+        intent = " ".join(words) if rnd.random() > 0.1 else f"{words[0]} {i}"
+        is_input = tag in ("input", "textarea")
+        elements.append({
+            "intent": intent,
+            "component_type": _component_type(tag),
+            "xpath": f"//*[@id='el-{i}']",
+            "tag": tag,
+            "class": f"oxd-{tag}-{i % 17}",
+            "placeholder": intent if is_input and rnd.random() > 0.5 else "",
+            "aria": intent if rnd.random() > 0.8 else "",
+        })
+    return elements
+
+
+VIEWPORT = (1280, 800)
+
+
+def generate_visual_elements(count, seed=7):
+    """Same page in the shape the OCR engines' scrapers return (attributes + viewport rect)."""
+    rnd = random.Random(seed)
+    cols = 5
+    elements = []
+    for i, el in enumerate(generate_elements(count, seed)):
+        col, row = i % cols, i // cols
+        tag = "img" if el['tag'] in ("svg", "i") and rnd.random() > 0.5 else el['tag']
+        elements.append({
+            "tag": tag, "id": f"el-{i}" if rnd.random() > 0.3 else "", "name": "",
+            "placeholder": el['placeholder'], "text": "" if tag in ("input", "img") else el['intent'],
+            "alt": el['intent'] if tag == "img" else "", "src": f"/images/{tag}-{i}.png" if tag == "img" else "",
+            "role": "button" if el['component_type'] == "BUTTON" and tag == "div" else "",
+            "aria-label": el['aria'], "labelText": el['intent'] if tag in ("input", "textarea") else "",
+            "className": el['class'], "parentText": el['intent'],
+            "rect": {"x": 20 + col * 250, "y": 20 + row * 40, "width": 220, "height": 30}
+        })
+    return elements
+
+
+class SyntheticPage:
+    """
+    🧪 A generated page served through ReplayDriver: answers the engines' scrape scripts
+    with `count` synthetic elements and renders their labels into a screenshot for OCR.
+    """
+
+    def __init__(self, count, seed=7):
+        self.count = count
+        self.elements = [dict(el, sid=i) for i, el in enumerate(generate_elements(count, seed))]
+        self.visual = generate_visual_elements(count, seed)
+        self._png = None
+
+    def _scrape(self, driver, options):
+        if options.get('knownDoc') == "synthetic" and options.get('knownGen') == 1:
+            return {"docId": "synthetic", "gen": 1, "unchanged": True}
+        elements = self.elements
+        if options.get('intents'):
+            # No in-page trigram ranking here: every element is a candidate for every intent
+            tag = {intent: 1.0 for intent in options['intents']}
+            elements = [dict(el, prefilter=tag) for el in elements]
+        return {"docId": "synthetic", "gen": 1, "full": True, "elements": elements, "dropped": [],
+                "scan": {"visited": self.count, "ms": 0, "truncated": False, "depthCapped": False}}
+
+    def responders(self):
+        return [
+            ("knownDoc", self._scrape),                          # utilities.dom_snapshot
+            ("findRecursive", lambda driver, *a: self.visual),   # test_code_generation_2
+            ("parentText", lambda driver, *a: self.visual),      # test_screenshots_to_code_generation
+            ("s.opacity", lambda driver, *a: self.visual),       # test_code_generation1
+        ]
+
+    def screenshot_png(self):
+        """Labels drawn at their rects (viewport only); empty when Pillow is not installed."""
+        if self._png is None:
+            try:
+                from io import BytesIO
+                from PIL import Image, ImageDraw
+            except ImportError:
+                self._png = b""
+                return self._png
+            image = Image.new("RGB", VIEWPORT, "white")
+            draw = ImageDraw.Draw(image)
+            for el in self.visual:
+                r = el['rect']
+                if r['y'] + r['height'] > VIEWPORT[1]:
+                    break
+                draw.rectangle([r['x'], r['y'], r['x'] + r['width'], r['y'] + r['height']], outline="gray")
+                draw.text((r['x'] + 6, r['y'] + 8), el['text'] or el['placeholder'] or el['alt'], fill="black")
+            buffer = BytesIO()
+            image.save(buffer, format="PNG")
+            self._png = buffer.getvalue()
+        return self._png
+
+    def driver(self):
+        from utilities.replay_driver import ReplayDriver, empty_fixture
+        fixture = empty_fixture()
+        png = self.screenshot_png()
+        if png:
+            fixture["screenshots"].append(png)
+        return ReplayDriver(fixture, self.responders())
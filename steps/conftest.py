@@ -1,7 +1,14 @@
 import os, pytest, re, json, time
 from selenium import webdriver
 from utilities.ai_engine import AIAutomationFramework
+from utilities.locator_trust import DEFAULT_TRUST_TTL
+from utilities.ocr_cache import OCR_CACHE
+from utilities.ocr_service import get_ocr_service, loaded_services
+from utilities.phase_timing import PHASE_TIMER, PhaseTimingPlugin
+from utilities.readiness import READINESS_REPORT, PageReadiness
+from utilities.replay_driver import RecordingDriver
 from utilities.spark_assist import SparkAssist
+from utilities.visual_audit import AUDIT_MODES, DEFAULT_AUDIT_MODE
 
 processed_scenarios = set()
 
@@ -9,23 +16,73 @@ processed_scenarios = set()
 def pytest_addoption(parser):
     parser.addoption("--generate", action="store_true")
     parser.addoption("--page-file", action="store", default=None)
+    # Use a .db file (SQLite backend) when healing from several xdist workers
+    parser.addoption("--memory-file", action="store", default="ai_ui_memory.json")
+    # 🎥 recorded = no in-page painting, one annotated screenshot per step written to logs/
+    parser.addoption("--audit-mode", action="store", default=DEFAULT_AUDIT_MODE, choices=AUDIT_MODES)
+    # ⏱️ Per-phase p50/p95 of the AI resolver (terminal summary + JSON)
+    parser.addoption("--phase-timing", action="store_true")
+    parser.addoption("--phase-timing-json", action="store", default="logs/phase_timing.json")
+    # 📼 Record scrapes / script responses / screenshots per feature for the offline benchmarks
+    parser.addoption("--record-fixtures", action="store", default=None)
+    # 🤝 Seconds a verified locator is reused without revalidation (0 = validate every lookup)
+    parser.addoption("--trust-ttl", action="store", type=float, default=DEFAULT_TRUST_TTL)
+    # 👁️ Load the EasyOCR models in the background while the session starts (once per worker)
+    parser.addoption("--warm-ocr", action="store_true")
+
+
+def pytest_configure(config):
+    if config.getoption("--phase-timing"):
+        config.pluginmanager.register(PhaseTimingPlugin(config.getoption("--phase-timing-json")),
+                                      "ai_phase_timing")
+
+
+def pytest_sessionstart(session):
+    if session.config.getoption("--warm-ocr"):
+        get_ocr_service().warm()
 
 
 @pytest.fixture(scope="session")
-def ai_engine(): return AIAutomationFramework(driver=None)
+def ai_engine(request):
+    engine = AIAutomationFramework(driver=None, memory_file=request.config.getoption("--memory-file"),
+                                   audit_mode=request.config.getoption("--audit-mode"),
+                                   trust_ttl=request.config.getoption("--trust-ttl"))
+    yield engine
+    engine.flush_memory()
+    engine.render_audit()
+    print(f"\n🧠 AI Engine Stats: {engine.stats()}")
 
 
 @pytest.fixture()
 def setup(request, ai_engine):
     driver = webdriver.Chrome()
     driver.maximize_window()
+    # ⏱️ Instrument fetch/XHR before the app's own scripts run on every page
+    PageReadiness().attach(driver)
     feature_name = request.node.fspath.purebasename
+    record_dir = request.config.getoption("--record-fixtures")
+    if record_dir:
+        driver = RecordingDriver(driver, os.path.join(record_dir, feature_name))
     ai_engine.driver = driver
     ai_engine.set_context(feature_name)
     yield {'driver': driver, 'feature_name': feature_name}
+    if record_dir:
+        driver.save()
     driver.quit()
 
 
+def pytest_terminal_summary(terminalreporter):
+    """⏱️ Readiness report (time spent waiting vs. the fixed sleeps it replaced), OCR load cost and cache."""
+    if READINESS_REPORT.entries:
+        terminalreporter.section("AI page readiness")
+        for line in READINESS_REPORT.lines():
+            terminalreporter.write_line(line)
+    for service in loaded_services():
+        terminalreporter.write_line(f"👁️ OCR service: {service.stats()}")
+    if OCR_CACHE.stats()["hit_rate"] or OCR_CACHE.misses:
+        terminalreporter.write_line(f"🖼️ OCR cache: {OCR_CACHE.stats()}")
+
+
 @pytest.fixture(scope="function")
 def ai_context(): return {"prompt": "", "buffer": {}}
 
@@ -76,8 +133,14 @@ def pytest_bdd_before_step(request, feature, scenario, step):
 
         print(f"\n🤖 [AI Discovery]: Intent: '{raw_text}'")
 
-        # 🎯 Resolve metadata
-        metadata_list = engine.get_step_metadata(raw_text, page_context=setup_data['feature_name'])
+        # 🎯 Resolve metadata: every intent of the step in one wait / scrape / score matrix
+        PHASE_TIMER.set_scope(context=setup_data['feature_name'], step=raw_text)
+        with PHASE_TIMER.span("step"):
+            intents = engine.extract_intents(raw_text)
+            resolved = engine.resolve_many(intents, page_context=setup_data['feature_name'])
+            # 🤝 Trusted (unvalidated) locators are checked against the live page before they are buffered
+            metadata_list = [m for m in engine.confirm_many(resolved, page_context=setup_data['feature_name']) if m]
+            engine.capture_audit(f"{setup_data['feature_name']} {step.name}")
 
         if metadata_list:
             for meta in metadata_list:
@@ -104,6 +167,9 @@ def pytest_bdd_after_scenario(request, feature, scenario):
     ai_ctx = request.getfixturevalue("ai_context")
     setup_data = request.getfixturevalue("setup")
 
+    # 💾 WRITE-BEHIND: Persist the locators healed during this scenario in one batch
+    request.getfixturevalue("ai_engine").flush_memory()
+
     # 🎯 GATEKEEPER: Only run if --generate is on and we have captured metadata
     should_run = (
             request.config.getoption("--generate") and
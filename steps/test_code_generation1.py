@@ -1,34 +1,37 @@
-import os
 import re
-import time
 import cv2
-import easyocr
 import numpy as np
-import spacy
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
 from thefuzz import fuzz
+from utilities.locator_validation import StrategyVerifier
+from utilities.ocr_cache import OCR_CACHE, page_reader
+from utilities.ocr_service import get_ocr_service
+from utilities.proximity import proximity_bonuses
+from utilities.readiness import wait_until_ready
+from utilities.screen_capture import ARTIFACTS, ScreenFrame, encode_png
+from utilities.word_vectors import cosine_similarities, load_embedder
 
-# Load medium model for word vectors
-try:
-    nlp = spacy.load("en_core_web_md")
-except OSError:
-    os.system("python -m spacy download en_core_web_md")
-    nlp = spacy.load("en_core_web_md")
+# Word vectors only: memory-mapped table when exported, en_core_web_md otherwise
+EMBEDDER = load_embedder()
 
 # Pre-calculate Centroids outside for performance
-VIS_CENTROID = nlp("logo branding icon image graphic picture banner").vector
-INP_CENTROID = nlp("textbox input field textarea typing entry").vector
-ACT_CENTROID = nlp("button link click submit press toggle").vector
+VIS_CENTROID, INP_CENTROID, ACT_CENTROID = EMBEDDER.vectors([
+    "logo branding icon image graphic picture banner",
+    "textbox input field textarea typing entry",
+    "button link click submit press toggle"
+])
 
 
 class AIAutomationFramework:
-    def __init__(self, driver, confidence_threshold=40):
+    def __init__(self, driver, confidence_threshold=40, artifacts=ARTIFACTS, ocr_cache=OCR_CACHE, verify_top_k=5):
         self.driver = driver
-        self.reader = easyocr.Reader(['en'])
+        self.ocr = get_ocr_service()
+        self.ocr_cache = ocr_cache
         self.screenshot_path = "discovery_view.png"
+        self.artifacts = artifacts
+        self.frame = None
         self.confidence_threshold = confidence_threshold
+        self.verifier = StrategyVerifier(verify_top_k)
         self.locator_repo = set()
 
         self.WEIGHTS = {
@@ -44,10 +47,15 @@ class AIAutomationFramework:
         return digits > 5 and (digits / len(value) > 0.4)
 
     def _get_ocr_data(self):
-        self.driver.save_screenshot(self.screenshot_path)
-        results = self.reader.readtext(self.screenshot_path)
-        img = cv2.imread(self.screenshot_path)
+        self.frame = ScreenFrame.grab(self.driver)
+        results = page_reader(self.ocr, self.ocr_cache, self.driver).readtext(self.frame.rgb)
+        self.artifacts.write_png(self.screenshot_path, self.frame.png)
+        self.artifacts.submit("debug_ocr_view.png", lambda frame=self.frame: self._render_ocr_debug(frame, results))
+        return results
 
+    @staticmethod
+    def _render_ocr_debug(frame, results):
+        img = frame.bgr()
         for (bbox, text, prob) in results:
             top_left = tuple(map(int, bbox[0]))
             bottom_right = tuple(map(int, bbox[2]))
@@ -55,29 +63,11 @@ class AIAutomationFramework:
             cv2.rectangle(img, top_left, bottom_right, color, 2)
             cv2.putText(img, f"{text}", (top_left[0], top_left[1] - 5),
                         cv2.FONT_HERSHEY_SIMPLEX, 0.4, color, 1)
-
-        cv2.imwrite("debug_ocr_view.png", img)
-        return results
-
-    def _calculate_distance(self, ocr_bbox, el_rect):
-        ocr_points = np.array(ocr_bbox)
-        ocr_center = np.mean(ocr_points, axis=0)
-        el_center = [el_rect['x'] + (el_rect['width'] / 2), el_rect['y'] + (el_rect['height'] / 2)]
-        return np.linalg.norm(ocr_center - el_center)
-
-    def _verify_locator(self, strategy, selector):
-        try:
-            element = WebDriverWait(self.driver, 1.5).until(
-                EC.visibility_of_element_located((strategy, selector))
-            )
-            return element if element.is_displayed() and element.is_enabled() else None
-        except:
-            return None
+        return encode_png(img)
 
     def _find_locator_weighted(self, user_step, ocr_results):
         # 1. Centroid-Based Intent Categorization
-        user_doc = nlp(user_step.lower())
-        u_vec = user_doc.vector
+        u_vec = EMBEDDER.vectors([user_step.lower()])[0]
 
         def cosine_sim(v1, v2):
             return np.dot(v1, v2) / (np.linalg.norm(v1) * np.linalg.norm(v2))
@@ -89,15 +79,7 @@ class AIAutomationFramework:
         }
         primary_intent = max(scores, key=scores.get)
 
-        # 2. OCR Anchor Detection
-        anchor_box = None
-        highest_ocr_score = 0
-        for (bbox, text, prob) in ocr_results:
-            score = fuzz.partial_ratio(user_step.lower(), text.lower())
-            if score > highest_ocr_score and score > 75:
-                highest_ocr_score, anchor_box = score, bbox
-
-        # 3. DOM Scraper with Visibility Filtering
+        # 2. DOM Scraper with Visibility Filtering
         elements = self.driver.execute_script("""
             return Array.from(document.querySelectorAll('input, button, a, img, select, [role="button"], svg')).filter(el => {
                 const s = window.getComputedStyle(el);
@@ -115,14 +97,17 @@ class AIAutomationFramework:
             });
         """)
 
-        # 4. Batch Semantic Processing
+        # 3. Batch Semantic Processing
         identities = [f"{el['tag']} {el['alt']} {el['placeholder']} {el['text']} {el['labelText']}".lower() for el in
                       elements]
-        element_docs = list(nlp.pipe(identities))
+        semantic_sims = cosine_similarities(u_vec, EMBEDDER.vectors(identities))
+
+        # 4. OCR Anchor Proximity: every matching OCR box, weighted by its score, one KD-tree query
+        proximity, anchor_count = proximity_bonuses(user_step, ocr_results, elements)
 
         matches = []
         for i, el in enumerate(elements):
-            semantic_sim = user_doc.similarity(element_docs[i])
+            semantic_sim = float(semantic_sims[i])
 
             # Apply Dynamic Intent Penalties
             if primary_intent == "visual" and el['tag'] not in ['img', 'svg', 'picture', 'canvas']:
@@ -140,14 +125,10 @@ class AIAutomationFramework:
                     w = 0.05 if self._is_unstable(attr, val) else weight
                     attr_score += (fuzz.partial_ratio(user_step.lower(), val) * w)
 
-            # Proximity Calculation
-            proximity_bonus = 0
-            if anchor_box:
-                dist = self._calculate_distance(anchor_box, el['rect'])
-                proximity_bonus = max(0, 100 * (1 - (dist / 500)))
+            proximity_bonus = float(proximity[i])
 
             # Semantic Boost Fallback for Logos
-            if not anchor_box and primary_intent == "visual" and el['tag'] in ['img', 'svg']:
+            if not anchor_count and primary_intent == "visual" and el['tag'] in ['img', 'svg']:
                 final_score = (attr_score + (semantic_sim * 150))
             else:
                 final_score = (attr_score * semantic_sim) + proximity_bonus
@@ -157,24 +138,27 @@ class AIAutomationFramework:
 
         matches.sort(key=lambda x: x[0], reverse=True)
 
-        # 5. Verification Waterfall
-        for score, el in matches:
-            strategies = []
-            if el['id'] and not self._is_unstable('id', el['id']): strategies.append((By.ID, el['id']))
-            if el['name']: strategies.append((By.NAME, el['name']))
-
-            if el['tag'] in ['img', 'svg']:
-                if el['alt']: strategies.append((By.XPATH, f"//img[@alt='{el['alt']}']"))
-                if el['src']:
-                    fname = el['src'].split('/')[-1].split('?')[0]
-                    if len(fname) > 3: strategies.append((By.XPATH, f"//img[contains(@src, '{fname}')]"))
-            elif el['text'] and len(el['text']) < 50:
-                strategies.append((By.XPATH, f"//*[contains(text(),'{el['text'][:15]}')]"))
-
-            for strat, val in strategies:
-                if self._verify_locator(strat, val): return (strat, val), score
+        # 5. Verification Waterfall (one execute_script per top-k candidates)
+        picked = self.verifier.pick(self.driver, [self._strategies(el) for score, el in matches])
+        if picked:
+            i, locator, _ = picked
+            return locator, matches[i][0]
         return None, 0
 
+    def _strategies(self, el):
+        strategies = []
+        if el['id'] and not self._is_unstable('id', el['id']): strategies.append((By.ID, el['id']))
+        if el['name']: strategies.append((By.NAME, el['name']))
+
+        if el['tag'] in ['img', 'svg']:
+            if el['alt']: strategies.append((By.XPATH, f"//img[@alt='{el['alt']}']"))
+            if el['src']:
+                fname = el['src'].split('/')[-1].split('?')[0]
+                if len(fname) > 3: strategies.append((By.XPATH, f"//img[contains(@src, '{fname}')]"))
+        elif el['text'] and len(el['text']) < 50:
+            strategies.append((By.XPATH, f"//*[contains(text(),'{el['text'][:15]}')]"))
+        return strategies
+
     def discover_repository(self, steps):
         print(f"\n{'=' * 60}\nAI DISCOVERY ENGINE: CENTROID-VISIBLE MODE\n{'=' * 60}")
         ocr_results = self._get_ocr_data()
@@ -185,6 +169,7 @@ class AIAutomationFramework:
                 print(f"STEP: {step} | ✅ {loc_info[0]}='{loc_info[1]}' | Score: {score:.2f}")
             else:
                 print(f"STEP: {step} | ❌ NOT FOUND")
+        print(f"🎯 Verifier: {self.verifier.stats()}")
 
 
 # --- Test Execution ---
@@ -192,7 +177,7 @@ def test_locator_extraction(setup):
     driver = setup['driver']
     try:
         driver.get("https://opensource-demo.orangehrmlive.com/web/index.php/auth/login")
-        time.sleep(4)  # Allow React to hydrate
+        wait_until_ready(driver, baseline=4, label="orangehrm login")  # Allow React to hydrate
         discovery = AIAutomationFramework(driver)
         discovery.discover_repository([
             "Verify company logo",
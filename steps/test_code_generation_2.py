@@ -2,31 +2,67 @@ import json
 import os
 import re
 import time
-import easyocr
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
-import spacy
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
-from thefuzz import fuzz
+from utilities.embedding_cache import EmbeddingCache
+from utilities.fuzzy_kernel import weighted_attribute_scores
+from utilities.locator_validation import StrategyVerifier
+from utilities.ocr_cache import OCR_CACHE, page_reader
+from utilities.ocr_regions import DEFAULT_OCR_MODE, RegionOcrReport, candidate_regions, read_regions
+from utilities.ocr_service import get_ocr_service
+from utilities.phase_timing import PHASE_TIMER, StageClock
+from utilities.proximity import ocr_anchors, proximity_bonuses
+from utilities.readiness import wait_until_ready
+from utilities.screen_capture import ARTIFACTS, ScreenFrame
+from utilities.visual_audit import DEFAULT_AUDIT_MODE, VisualAudit
+from utilities.word_vectors import cosine_similarities, load_embedder
 
 # --- INITIALIZATION ---
-try:
-    nlp = spacy.load("en_core_web_md")
-except OSError:
-    os.system("python -m spacy download en_core_web_md")
-    nlp = spacy.load("en_core_web_md")
+# Word vectors only (memory-mapped table when exported, en_core_web_md otherwise),
+# behind the persistent embedding cache so repeated labels are never re-embedded
+EMBEDDER = EmbeddingCache(load_embedder())
+# "value" or 'value' (apostrophes inside words, e.g. user's, are not quotes)
+QUOTED = re.compile(r'"([^"]+)"' r"|(?<!\w)'([^']+)'(?!\w)")
 
-VIS_CENTROID = nlp("logo branding icon image graphic picture banner").vector
-INP_CENTROID = nlp("textbox input field textarea typing entry username password").vector
-ACT_CENTROID = nlp("button link click submit press toggle signin login").vector
+VIS_CENTROID, INP_CENTROID, ACT_CENTROID = EMBEDDER.vectors([
+    "logo branding icon image graphic picture banner",
+    "textbox input field textarea typing entry username password",
+    "button link click submit press toggle signin login"
+])
+
+
+def _get_ner():
+    """
+    The spaCy pipeline the embedder already loaded (no exported vector table), else None:
+    NER alone is not worth loading the full model the table exists to avoid.
+    """
+    return getattr(EMBEDDER.embedder, 'nlp', None)
 
 
 class AIAutomationFramework:
-    def __init__(self, driver, confidence_threshold=40):
+    def __init__(self, driver, confidence_threshold=40, audit_mode=DEFAULT_AUDIT_MODE, artifacts=ARTIFACTS,
+                 ocr_mode=DEFAULT_OCR_MODE, roi_top_k=5, roi_scale=1.0, ocr_cache=OCR_CACHE,
+                 pipelined=True, timer=PHASE_TIMER, verify_top_k=5):
         self.driver = driver
-        self.reader = easyocr.Reader(['en'])
+        self.audit = VisualAudit(audit_mode)
+        self.ocr = get_ocr_service()
+        self.ocr_cache = ocr_cache
         self.screenshot_path = "discovery_view.png"
+        self.artifacts = artifacts
+        self.frame = None
+        # 📐 full | roi (crops around the top DOM candidates) | band (the strip they span), full-frame fallback
+        self.ocr_mode = ocr_mode
+        self.roi_top_k = roi_top_k
+        self.roi_scale = roi_scale
+        self.ocr_report = RegionOcrReport()
+        self._dpr = None
+        # ⚡ OCR on a worker thread while the DOM is scraped and embedded (WebDriver stays on this thread)
+        self.pipelined = pipelined
+        self.timer = timer
+        self._ocr_pool = None
+        self._clock = None
+        self.verifier = StrategyVerifier(verify_top_k)
         self.repo_path = "locator_repository.json"
         self.confidence_threshold = confidence_threshold
 
@@ -35,8 +71,16 @@ class AIAutomationFramework:
             'alt': 0.8, 'placeholder': 0.8, 'labelText': 0.8,
             'text': 0.7, 'src': 0.5, 'role': 0.4
         }
-
-    def _highlight(self, element, color="#00FF00", duration=1.0):
+        # Container context ("Employee Name" row/card text) scraped with each element
+        self.PARENT_WEIGHTS = {'parentText': 0.3}
+
+    def _highlight(self, element, color="#00FF00", duration=1.0, rect=None):
+        if self.audit.recording:
+            # Scraped rect when we have one, otherwise one WebDriver rect call (no sleep, no style writes)
+            self.audit.mark([rect or element.rect], color)
+            return
+        if not self.audit.live:
+            return
         original_style = element.get_attribute('style')
         self.driver.execute_script(
             f"arguments[0].setAttribute('style', 'border: 3px solid {color}; box-shadow: 0 0 15px {color};');",
@@ -46,16 +90,25 @@ class AIAutomationFramework:
         self.driver.execute_script("arguments[0].setAttribute('style', arguments[1]);", element, original_style)
 
     def _extract_action_data(self, user_step):
-        quoted = re.findall(r'"([^"]*)"', user_step)
-        if quoted: return quoted[0]
-        doc = nlp(user_step)
-        for ent in doc.ents:
+        quoted = QUOTED.search(user_step)
+        if quoted: return quoted.group(1) or quoted.group(2)
+        ner = _get_ner()
+        if ner is None: return None
+        for ent in ner(user_step).ents:
             return ent.text
         return None
 
     def _get_deep_elements(self):
         return self.driver.execute_script("""
             const foundElements = [];
+            // One innerText per container, however many of its children are scraped
+            const parentTexts = new Map();
+            function containerText(el) {
+                const p = el.closest('tr, div, section, li, form, [role="gridcell"]');
+                if (!p) return "";
+                if (!parentTexts.has(p)) parentTexts.set(p, p.innerText.split('\\n').slice(0,2).join(' '));
+                return parentTexts.get(p);
+            }
             function findRecursive(root) {
                 const items = root.querySelectorAll('input, button, a, img, select, textarea, [role="button"], [role="tab"], [role="checkbox"], svg, span, div');
                 items.forEach(el => {
@@ -69,6 +122,7 @@ class AIAutomationFramework:
                             'alt': el.alt || "", 'src': el.src || "", 'role': el.getAttribute('role') || "",
                             'aria-label': el.getAttribute('aria-label') || "",
                             'labelText': lbl ? lbl.innerText : "",
+                            'parentText': containerText(el),
                             'rect': { 'x': r.left, 'y': r.top, 'width': r.width, 'height': r.height }
                         });
                     }
@@ -79,33 +133,113 @@ class AIAutomationFramework:
             return foundElements;
         """)
 
-    def _get_ocr_data(self):
-        self.driver.save_screenshot(self.screenshot_path)
-        return self.reader.readtext(self.screenshot_path)
-
-    def _calculate_distance(self, ocr_bbox, el_rect):
-        ocr_center = np.mean(np.array(ocr_bbox), axis=0)
-        el_center = [el_rect['x'] + (el_rect['width'] / 2), el_rect['y'] + (el_rect['height'] / 2)]
-        return np.linalg.norm(ocr_center - el_center)
-
-    def _verify_locator(self, strategy, selector):
+    def _get_ocr_data(self, steps=None):
+        frame, reader, regions, _ = self._capture_for_ocr(steps)
+        return self._read_ocr(frame, reader, regions, steps)
+
+    def _capture_for_ocr(self, steps):
+        """WebDriver half of OCR: the screenshot, plus a scrape for the candidate regions in roi/band mode."""
+        self.frame = ScreenFrame.grab(self.driver)
+        self.artifacts.write_png(self.screenshot_path, self.frame.png)
+        reader = page_reader(self.ocr, self.ocr_cache, self.driver)
+        regions, elements = None, None
+        if self.ocr_mode != "full" and steps:
+            elements = self._get_deep_elements()
+            regions = candidate_regions(self._candidate_rects(steps, elements), self.frame.rgb.shape,
+                                        self._device_pixel_ratio(), mode=self.ocr_mode)
+        return self.frame, reader, regions, elements
+
+    def _read_ocr(self, frame, reader, regions, steps):
+        """CPU half of OCR: decode + EasyOCR, no WebDriver calls (safe on a worker thread)."""
+        image = frame.rgb
+        frame_pixels = image.shape[0] * image.shape[1]
+        steps = list(steps or [])
+
+        if regions is not None:
+            if regions:
+                started = time.perf_counter()
+                results = read_regions(reader, image, regions, self.roi_scale)
+                anchors = sum(1 for step in steps if len(ocr_anchors(step, results)[1]))
+                self.ocr_report.record(self.ocr_mode, time.perf_counter() - started,
+                                       sum((x1 - x0) * (y1 - y0) for x0, y0, x1, y1 in regions), frame_pixels,
+                                       len(results), anchors, len(steps))
+                if anchors:
+                    return results
+            # No candidate on screen, or no region held any step's text: read the whole frame
+            self.ocr_report.fallbacks += 1
+
+        started = time.perf_counter()
+        results = reader.readtext(image)
+        anchors = sum(1 for step in steps if len(ocr_anchors(step, results)[1]))
+        self.ocr_report.record("full", time.perf_counter() - started, frame_pixels, frame_pixels,
+                               len(results), anchors, len(steps))
+        return results
+
+    def _start_pipeline(self, steps):
         """
-        Scans all elements matching the selector and returns the first visible/enabled one.
+        ⚡ Captures the screenshot, hands OCR to the worker thread, then scrapes and embeds
+        the page here while it runs. Returns (OCR future, scraped elements).
         """
-        try:
-            # 1. Find ALL elements matching the strategy
-            elements = WebDriverWait(self.driver, 1.2).until(
-                EC.presence_of_all_elements_located((strategy, selector))
-            )
-
-            # 2. Iterate to find the actual interactive one
-            for element in elements:
-                if element.is_displayed() and element.is_enabled():
-                    return element
-
-            return None
-        except:
-            return None
+        self._clock = StageClock(self.timer)
+        if self._ocr_pool is None:
+            self._ocr_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ocr")
+        with self._clock.stage("capture"):
+            frame, reader, regions, elements = self._capture_for_ocr(steps)
+
+        def ocr_job():
+            with self._clock.stage("ocr"):
+                return self._read_ocr(frame, reader, regions, steps)
+
+        future = self._ocr_pool.submit(ocr_job)
+        if elements is None:
+            with self._clock.stage("scrape"):
+                elements = self._get_deep_elements()
+        with self._clock.stage("embed", texts=len(elements) + len(steps)):
+            # Warms the embedding cache for every step's scoring pass
+            EMBEDDER.vectors([self._identity(el) for el in elements] + [step.lower() for step in steps])
+        return future, elements
+
+    def _stop_pipeline(self):
+        """Shuts the OCR worker down so each engine leaves no thread behind."""
+        if self._ocr_pool is not None:
+            self._ocr_pool.shutdown(wait=True)
+            self._ocr_pool = None
+
+    def _stage(self, name, **counts):
+        """A pipeline stage while OCR runs in the background, a plain timer span otherwise."""
+        return self._clock.stage(name, **counts) if self._clock else self.timer.span(name, **counts)
+
+    def _join_ocr(self, ocr_results):
+        """Blocks on the pipelined OCR only when proximity scoring needs the anchors."""
+        if not hasattr(ocr_results, 'result'):
+            return ocr_results
+        if self._clock is None:
+            return ocr_results.result()
+        with self._clock.stage("ocr_join"):
+            return ocr_results.result()
+
+    def _candidate_rects(self, steps, elements):
+        """Rects of the top roi_top_k elements per step by attribute score (one scrape for all steps)."""
+        rects = []
+        for step in steps:
+            scores = weighted_attribute_scores(step.lower(), elements, self.WEIGHTS)
+            for i in np.argsort(-scores, kind="stable")[:self.roi_top_k]:
+                if scores[i] > 0:
+                    rects.append(elements[i]['rect'])
+        return rects
+
+    def _device_pixel_ratio(self):
+        """CSS px -> screenshot px, asked once per engine."""
+        if self._dpr is None:
+            try:
+                self._dpr = float(self.driver.execute_script("return window.devicePixelRatio || 1;"))
+            except Exception:
+                self._dpr = 1.0
+        return self._dpr
+
+    @staticmethod
+    def _identity(el):
+        return f"{el['tag']} {el['alt']} {el['aria-label']} {el['placeholder']} {el['text']} {el['labelText']}".lower()
 
     def _is_unstable(self, attr, value):
         if not value or len(value) < 6: return False
@@ -113,32 +247,32 @@ class AIAutomationFramework:
         digits = len(re.findall(r'\d', value))
         return digits > 5 and (digits / len(value) > 0.4)
 
-    def _find_locator_weighted(self, user_step, ocr_results):
-        user_doc = nlp(user_step.lower())
-        u_vec = user_doc.vector
+    def _find_locator_weighted(self, user_step, ocr_results, elements=None):
+        """`ocr_results` may be the pipelined OCR future; `elements` a scrape taken for this step already."""
+        with self._stage("score"):
+            u_vec = EMBEDDER.vectors([user_step.lower()])[0]
 
-        def cosine_sim(v1, v2):
-            return np.dot(v1, v2) / (np.linalg.norm(v1) * np.linalg.norm(v2))
+            def cosine_sim(v1, v2):
+                return np.dot(v1, v2) / (np.linalg.norm(v1) * np.linalg.norm(v2))
 
-        scores = {"visual": cosine_sim(u_vec, VIS_CENTROID), "input": cosine_sim(u_vec, INP_CENTROID),
-                  "action": cosine_sim(u_vec, ACT_CENTROID)}
-        primary_intent = max(scores, key=scores.get)
+            scores = {"visual": cosine_sim(u_vec, VIS_CENTROID), "input": cosine_sim(u_vec, INP_CENTROID),
+                      "action": cosine_sim(u_vec, ACT_CENTROID)}
+            primary_intent = max(scores, key=scores.get)
 
-        anchor_box = None
-        for (bbox, text, prob) in ocr_results:
-            if fuzz.partial_ratio(user_step.lower(), text.lower()) > 75:
-                anchor_box = bbox
-                break
+            if elements is None:
+                elements = self._get_deep_elements()
+            semantic_sims = cosine_similarities(u_vec, EMBEDDER.vectors([self._identity(el) for el in elements]))
+            # One native cdist call per WEIGHTS attribute instead of partial_ratio per attribute per element
+            attr_scores = weighted_attribute_scores(user_step.lower(), elements, self.WEIGHTS)
+            # Container text came with the scrape: no elementFromPoint roundtrip per candidate
+            parent_bonuses = weighted_attribute_scores(user_step.lower(), elements, self.PARENT_WEIGHTS)
 
-        elements = self._get_deep_elements()
-        identities = [
-            f"{el['tag']} {el['alt']} {el['aria-label']} {el['placeholder']} {el['text']} {el['labelText']}".lower() for
-            el in elements]
-        element_docs = list(nlp.pipe(identities))
+        # 📍 Every matching OCR box is a weighted anchor; one KD-tree query scores all elements
+        proximity, _ = proximity_bonuses(user_step, self._join_ocr(ocr_results), elements)
 
         matches = []
         for i, el in enumerate(elements):
-            semantic_sim = user_doc.similarity(element_docs[i])
+            semantic_sim = float(semantic_sims[i])
             if semantic_sim < 0.15: continue
 
             penalty = 1.0
@@ -151,73 +285,82 @@ class AIAutomationFramework:
 
             adj_semantic = semantic_sim * penalty
 
-            parent_text = self.driver.execute_script("""
-                let el = document.elementFromPoint(arguments[0], arguments[1]);
-                let p = el ? el.closest('tr, div, section, li, form, [role="gridcell"]') : null;
-                return p ? p.innerText.split('\\n').slice(0,2).join(' ') : "";
-            """, el['rect']['x'] + 2, el['rect']['y'] + 2)
-            parent_bonus = (fuzz.partial_ratio(user_step.lower(), parent_text.lower()) * 0.3) if parent_text else 0
+            parent_bonus = float(parent_bonuses[i])
 
-            attr_score = sum(fuzz.partial_ratio(user_step.lower(), str(el.get(k, "")).lower()) * v
-                             for k, v in self.WEIGHTS.items() if el.get(k))
+            attr_score = float(attr_scores[i])
 
-            proximity_bonus = 0
-            if anchor_box:
-                dist = self._calculate_distance(anchor_box, el['rect'])
-                proximity_bonus = max(0, 100 * (1 - (dist / 500)))
+            proximity_bonus = float(proximity[i])
 
             final_score = (attr_score * adj_semantic) + proximity_bonus + parent_bonus
             matches.append({"total": round(final_score, 2), "element": el})
 
         matches.sort(key=lambda x: x['total'], reverse=True)
 
-        for report in matches:
-            el = report['element']
-            tag, txt, aria = el['tag'], el['text'].strip(), el.get('aria-label', "").strip()
-            strategies = []
-
-            if el['id'] and not self._is_unstable('id', el['id']): strategies.append((By.ID, el['id']))
-            if el['name']: strategies.append((By.NAME, el['name']))
-            if txt:
-                strategies.append((By.XPATH, f"//{tag}[normalize-space(.)='{txt}']"))
-                strategies.append((By.XPATH, f"//{tag}[contains(normalize-space(.),'{txt[:15]}')]"))
-            if aria: strategies.append((By.XPATH, f"//{tag}[@aria-label='{aria}']"))
-            if tag in ['img', 'svg'] and el['alt']: strategies.append((By.XPATH, f"//{tag}[@alt='{el['alt']}']"))
-
-            for strat, val in strategies:
-                found_el = self._verify_locator(strat, val)
-                if found_el:
-                    self._highlight(found_el)
-                    return {"strategy": strat, "value": val}, report['total']
+        picked = self.verifier.pick(self.driver, [self._strategies(report['element']) for report in matches])
+        if picked:
+            i, (strat, val), found = picked
+            self._highlight(found['element'], rect=matches[i]['element']['rect'])
+            return {"strategy": strat, "value": val}, matches[i]['total']
         return None, 0
 
+    def _strategies(self, el):
+        tag, txt, aria = el['tag'], el['text'].strip(), el.get('aria-label', "").strip()
+        strategies = []
+        if el['id'] and not self._is_unstable('id', el['id']): strategies.append((By.ID, el['id']))
+        if el['name']: strategies.append((By.NAME, el['name']))
+        if txt:
+            strategies.append((By.XPATH, f"//{tag}[normalize-space(.)='{txt}']"))
+            strategies.append((By.XPATH, f"//{tag}[contains(normalize-space(.),'{txt[:15]}')]"))
+        if aria: strategies.append((By.XPATH, f"//{tag}[@aria-label='{aria}']"))
+        if tag in ['img', 'svg'] and el['alt']: strategies.append((By.XPATH, f"//{tag}[@alt='{el['alt']}']"))
+        return strategies
+
     def discover_repository(self, steps):
         repo = {}
         if os.path.exists(self.repo_path):
             with open(self.repo_path, 'r') as f: repo = json.load(f)
 
-        ocr_results = self._get_ocr_data()
+        prefetched = None
+        if self.pipelined:
+            ocr_results, prefetched = self._start_pipeline(steps)
+        else:
+            ocr_results = self._get_ocr_data(steps)
         print(f"\n{'=' * 60}\nAI UNIVERSAL ENGINE: EXECUTION START\n{'=' * 60}")
 
-        for step in steps:
-            data_val = self._extract_action_data(step)
-
-            if step in repo:
-                cached = repo[step]
-                found = self._verify_locator(cached['strategy'], cached['value'])
-                if found:
-                    self._highlight(found, color="#FFFF00", duration=0.5)
-                    print(f"STEP: {step} | ✅ CACHE HIT | Data: {data_val}")
-                    continue
-
-            loc_info, score = self._find_locator_weighted(step, ocr_results)
-            if loc_info:
-                repo[step] = {"strategy": loc_info['strategy'], "value": loc_info['value'], "score": score}
-                with open(self.repo_path, 'w') as f:
-                    json.dump(repo, f, indent=4)
-                print(f"STEP: {step} | ✨ DISCOVERED: {loc_info['strategy']}='{loc_info['value']}' | Score: {score}")
-            else:
-                print(f"STEP: {step} | ❌ NOT FOUND")
+        try:
+            for step in steps:
+                data_val = self._extract_action_data(step)
+
+                if step in repo:
+                    cached = repo[step]
+                    picked = self.verifier.pick(self.driver, [[(cached['strategy'], cached['value'])]], unique=False)
+                    if picked:
+                        found = picked[2]
+                        self._highlight(found['element'], color="#FFFF00", duration=0.5, rect=found['rect'])
+                        print(f"STEP: {step} | ✅ CACHE HIT | Data: {data_val}")
+                        self.audit.capture(self.driver, step)
+                        continue
+
+                # The pipeline's scrape is still current for the first step that needs one
+                loc_info, score = self._find_locator_weighted(step, ocr_results, prefetched)
+                prefetched = None
+                if loc_info:
+                    repo[step] = {"strategy": loc_info['strategy'], "value": loc_info['value'], "score": score}
+                    with open(self.repo_path, 'w') as f:
+                        json.dump(repo, f, indent=4)
+                    print(f"STEP: {step} | ✨ DISCOVERED: {loc_info['strategy']}='{loc_info['value']}' | Score: {score}")
+                else:
+                    print(f"STEP: {step} | ❌ NOT FOUND")
+                self.audit.capture(self.driver, step)
+        finally:
+            self._stop_pipeline()
+        self.audit.render()
+        if self._clock is not None:
+            self._join_ocr(ocr_results)
+            print(f"⚡ Pipeline: {self._clock.finish()}")
+            self._clock = None
+        print(f"📐 OCR ({self.ocr_mode}): {self.ocr_report.stats()}")
+        print(f"🎯 Verifier: {self.verifier.stats()}")
 
 
 # --- TEST EXECUTION BLOCK ---
@@ -228,7 +371,7 @@ def test_locator_extraction(setup):
         # Navigate
         print("Navigating to OrangeHRM...")
         driver.get("https://opensource-demo.orangehrmlive.com/web/index.php/auth/login")
-        time.sleep(5)  # Allow page to settle
+        wait_until_ready(driver, baseline=5, label="orangehrm login")  # Allow page to settle
 
         # Initialize and Run
         discovery = AIAutomationFramework(driver)
@@ -1,12 +1,11 @@
-import time
 import pytest
+from utilities.readiness import wait_until_ready
 
 
 @pytest.mark.sanity
 def test_sample_tc__3(setup):
     driver = setup['driver']
-    time.sleep(5)
     driver.get("https://www.amazon.com/")
+    wait_until_ready(driver, baseline=5, label="amazon home")
     print("*********tested************")
-    time.sleep(5)
     driver.quit()
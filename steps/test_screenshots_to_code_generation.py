@@ -1,24 +1,30 @@
-import easyocr
-import time
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from thefuzz import fuzz
+from utilities.ocr_cache import OCR_CACHE, page_reader
+from utilities.ocr_service import get_ocr_service
+from utilities.readiness import wait_until_ready
+from utilities.screen_capture import ARTIFACTS, ScreenFrame
 
 
 class AIAutomationFramework:
-    def __init__(self, driver, confidence_threshold=50):
+    def __init__(self, driver, confidence_threshold=50, artifacts=ARTIFACTS, ocr_cache=OCR_CACHE):
         self.driver = driver
-        self.reader = easyocr.Reader(['en'])
+        self.ocr = get_ocr_service()
+        self.ocr_cache = ocr_cache
         self.screenshot_path = "latest_view.png"
+        self.artifacts = artifacts
+        self.frame = None
         self.confidence_threshold = confidence_threshold
         # The Set to store unique identified locators
         self.locator_repo = set()
 
     def _get_ocr_data(self):
         """Captures the visual state for semantic context."""
-        self.driver.save_screenshot(self.screenshot_path)
-        return self.reader.readtext(self.screenshot_path)
+        self.frame = ScreenFrame.grab(self.driver)
+        self.artifacts.write_png(self.screenshot_path, self.frame.png)
+        return page_reader(self.ocr, self.ocr_cache, self.driver).readtext(self.frame.rgb)
 
     def _verify_locator(self, strategy, selector):
         """Pings the browser to confirm the element exists."""
@@ -127,7 +133,7 @@ class AIAutomationFramework:
 def test_locator_extraction(setup):
     driver = setup['driver']
     driver.get("https://opensource-demo.orangehrmlive.com/web/index.php/auth/login")
-    time.sleep(3)
+    wait_until_ready(driver, baseline=3, label="orangehrm login")
 
     framework = AIAutomationFramework(driver)
 
@@ -0,0 +1,41 @@
+from utilities.candidate_index import CandidateIndex, CandidatePruner
+
+LABELS = ["Username", "Username 82", "Password", "Search", "Email", "Submit"]
+
+
+def _elements():
+    return [{"xpath": f"//*[@id='el-{i}']", "intent": label} for i, label in enumerate(LABELS)]
+
+
+def test_index_ranks_the_exact_label_first():
+    ids = CandidateIndex(_elements()).top("username", 2)
+    assert [LABELS[i] for i in ids] == ["Username", "Username 82"]
+
+
+def test_pruner_keeps_the_top_n_per_intent():
+    pruner = CandidatePruner(top_n=2, min_elements=3)
+    picked = pruner.prune(["username", "password"], _elements(), version=1)
+
+    assert [el["intent"] for el in picked] == ["Username", "Username 82", "Password"]
+    assert (pruner.builds, pruner.pruned, pruner.fallbacks) == (1, 1, 0)
+
+
+def test_pruner_falls_back_to_a_full_scan_without_overlap():
+    pruner = CandidatePruner(top_n=2, min_elements=3)
+    elements = _elements()
+
+    assert pruner.prune(["username", "qqq"], elements, version=1) is elements
+    assert (pruner.pruned, pruner.fallbacks) == (0, 1)
+
+
+def test_pruner_skips_small_pages_and_rebuilds_per_version():
+    pruner = CandidatePruner(top_n=2, min_elements=100)
+    elements = _elements()
+    assert pruner.prune(["username"], elements, version=1) is elements
+    assert pruner.builds == 0
+
+    pruner.min_elements = 3
+    pruner.prune(["username"], elements, version=1)
+    pruner.prune(["password"], elements, version=1)
+    pruner.prune(["password"], elements, version=2)
+    assert pruner.builds == 2
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+from utilities.ai_engine import AIAutomationFramework
+from utilities.scoring_engine import BatchScoringEngine
+
+
+class FakeValidator:
+    """Answers each XPath from `statuses` ('ok' when unknown) and records every call."""
+
+    def __init__(self, statuses):
+        self.statuses = statuses
+        self.calls = []
+
+    def validate(self, driver, xpaths, highlight_color=None, audit=None):
+        self.calls.append(list(xpaths))
+        return [self.statuses.get(xp, 'ok') for xp in xpaths]
+
+    def highlight(self, driver, xpaths, color, audit=None):
+        pass
+
+
+class FixedScorer:
+    """score_matrix from a fixed totals table, the real conflict-free assign."""
+
+    def __init__(self, totals):
+        self.totals = np.array(totals, dtype=np.float64)
+
+    def score_matrix(self, queries, elements):
+        return self.totals[:len(queries), :len(elements)]
+
+    assign = staticmethod(BatchScoringEngine.assign)
+
+
+def _element(xpath, intent):
+    return {"xpath": xpath, "intent": intent, "tag": "input", "component_type": "TEXTBOX", "class": ""}
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = AIAutomationFramework(None, memory_file=str(tmp_path / "memory.json"), trust_ttl=60)
+    engine._wait_for_app_ready = lambda: None
+    engine._candidates = lambda queries, elements: elements
+    yield engine
+    engine.memory.close()
+
+
+def test_untrusted_metas_skip_the_roundtrip(engine):
+    engine.validator = FakeValidator({})
+    metas = [_element("//*[@id='user']", "Username"), None]
+
+    assert engine.confirm_many(metas, "login_page") == metas
+    assert engine.validator.calls == []
+
+
+def test_stale_trusted_meta_heals_without_stealing(engine):
+    engine.validator = FakeValidator({"//*[@id='user']": 'missing'})
+    held = _element("//*[@id='pass']", "Password")
+    metas = [dict(_element("//*[@id='user']", "Username"), trusted=True), held]
+    # The held element scores best for the stale intent; the heal must take the runner-up
+    scraped = [held, _element("//*[@id='user-2']", "Username")]
+    engine._get_deep_elements = lambda intents=None: scraped
+    engine._scorer = FixedScorer([[90.0, 60.0]])
+
+    confirmed = engine.confirm_many(metas, "login_page")
+
+    assert confirmed[0]["xpath"] == "//*[@id='user-2']"
+    assert confirmed[1] is held
+    assert engine.trust.stats()["confirm_failures"] == 1
+
+
+def test_lost_trusted_meta_comes_back_as_none(engine):
+    engine.validator = FakeValidator({"//*[@id='user']": 'hidden'})
+    engine._get_deep_elements = lambda intents=None: []
+    metas = [dict(_element("//*[@id='user']", "Username"), trusted=True)]
+
+    assert engine.confirm_many(metas, "login_page") == [None]
+    assert engine.validator.calls == [["//*[@id='user']"]]
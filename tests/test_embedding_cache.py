@@ -0,0 +1,106 @@
+import hashlib
+import os
+import numpy as np
+from utilities.embedding_cache import HEADER, KEY_BYTES, MAGIC, EmbeddingCache
+
+
+class FakeEmbedder:
+    """Deterministic 4d vectors; counts what actually reached the model."""
+    width = 4
+    version = "fake-v1"
+
+    def __init__(self):
+        self.embedded = []
+
+    def vectors(self, texts):
+        self.embedded.extend(texts)
+        return np.array([[len(t), t.count("a"), t.count(" "), 1.0] for t in texts], dtype=np.float32)
+
+
+def test_misses_are_embedded_once_and_served_from_memory(tmp_path):
+    embedder = FakeEmbedder()
+    cache = EmbeddingCache(embedder, path=str(tmp_path / "embeddings.bin"))
+
+    first = cache.vectors(["User Name", "Password", "user   name"])
+    second = cache.vectors(["Password"])
+
+    assert embedder.embedded == ["user name", "password"]
+    np.testing.assert_array_equal(first[0], first[2])
+    np.testing.assert_array_equal(second[0], first[1])
+    assert cache.stats()["misses"] == 3 and cache.stats()["memory_hits"] == 1
+
+
+def test_binary_layout_is_header_plus_fixed_size_records(tmp_path):
+    path = tmp_path / "embeddings.bin"
+    EmbeddingCache(FakeEmbedder(), path=str(path)).vectors(["login", "logout"])
+
+    data = path.read_bytes()
+    assert HEADER.unpack(data[:HEADER.size]) == (MAGIC, 4)
+    record = KEY_BYTES + 4 * 4
+    assert len(data) == HEADER.size + 2 * record
+    vec = np.frombuffer(data[HEADER.size + KEY_BYTES:HEADER.size + record], dtype=np.float32)
+    np.testing.assert_array_equal(vec, [5, 0, 0, 1])
+
+
+def test_keys_are_stable_across_runs(tmp_path):
+    path = str(tmp_path / "embeddings.bin")
+    EmbeddingCache(FakeEmbedder(), path=path).vectors(["Employee Name"])
+
+    embedder = FakeEmbedder()
+    reopened = EmbeddingCache(embedder, path=path)
+    vec = reopened.vectors(["employee  NAME"])
+
+    assert embedder.embedded == []
+    assert reopened.stats()["disk_hits"] == 1
+    np.testing.assert_array_equal(vec[0], [13, 1, 1, 1])
+    # The key is a pure function of model version + normalized text, nothing process-specific
+    expected = hashlib.blake2b(b"fake-v1\0employee name", digest_size=KEY_BYTES).digest()
+    assert reopened._key("employee name") == expected
+
+
+def test_model_version_is_part_of_the_key(tmp_path):
+    path = str(tmp_path / "embeddings.bin")
+    EmbeddingCache(FakeEmbedder(), path=path).vectors(["login"])
+
+    other = FakeEmbedder()
+    other.version = "fake-v2"
+    EmbeddingCache(other, path=path).vectors(["login"])
+    assert other.embedded == ["login"]
+
+
+def test_memory_tier_is_lru_bounded(tmp_path):
+    cache = EmbeddingCache(FakeEmbedder(), path=None, memory_items=2)
+    cache.vectors(["a", "b"])
+    cache.vectors(["a"])  # b is now the least recently used
+    cache.vectors(["c"])
+
+    assert len(cache._lru) == 2
+    assert cache._key("a") in cache._lru and cache._key("c") in cache._lru
+    assert cache._key("b") not in cache._lru
+
+
+def test_partial_tail_is_skipped_not_truncated(tmp_path):
+    path = tmp_path / "embeddings.bin"
+    EmbeddingCache(FakeEmbedder(), path=str(path)).vectors(["login"])
+    with open(path, 'ab') as f:
+        f.write(b"\x01" * 7)  # another worker's append still in flight
+    size = os.path.getsize(path)
+
+    embedder = FakeEmbedder()
+    reopened = EmbeddingCache(embedder, path=str(path))
+
+    assert os.path.getsize(path) == size
+    assert reopened.stats()["disk_items"] == 1
+    reopened.vectors(["login"])
+    assert embedder.embedded == []
+
+
+def test_other_layout_disables_the_disk_tier(tmp_path):
+    path = tmp_path / "embeddings.bin"
+    path.write_bytes(HEADER.pack(MAGIC, 300))
+
+    cache = EmbeddingCache(FakeEmbedder(), path=str(path))
+    cache.vectors(["login"])
+
+    assert cache.path is None
+    assert path.read_bytes() == HEADER.pack(MAGIC, 300)
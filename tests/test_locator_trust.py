@@ -0,0 +1,45 @@
+import time
+from utilities.locator_trust import LocatorTrust
+
+XPATH = "//*[@id='login']"
+
+
+def test_ttl_zero_never_trusts():
+    trust = LocatorTrust(ttl=0)
+    trust.verified("login_page", XPATH, ("doc", 1, time.monotonic()))
+    assert not trust.trusted("login_page", XPATH, ("doc", 1, time.monotonic()))
+
+
+def test_same_generation_is_trusted_until_navigation():
+    trust = LocatorTrust(ttl=0.001)
+    trust.verified("login_page", XPATH, ("doc", 4, time.monotonic()))
+    time.sleep(0.01)
+
+    assert trust.trusted("login_page", XPATH, ("doc", 4, time.monotonic()))
+    assert trust.trusted_generation == 1
+    # Same generation, but a new document: revoked, not just expired
+    assert not trust.trusted("login_page", XPATH, ("other-doc", 4, time.monotonic()))
+    assert trust.revoked == 1
+    assert not trust.trusted("login_page", XPATH, ("doc", 4, time.monotonic()))
+
+
+def test_ttl_covers_a_changed_generation():
+    trust = LocatorTrust(ttl=60, per_context={"dashboard": 0})
+    trust.verified("login_page", XPATH, ("doc", 1, time.monotonic()))
+    trust.verified("dashboard", XPATH, ("doc", 1, time.monotonic()))
+
+    assert trust.trusted("login_page", XPATH, ("doc", 2, time.monotonic()))
+    assert trust.trusted_ttl == 1
+    assert not trust.trusted("dashboard", XPATH, ("doc", 2, time.monotonic()))
+
+
+def test_confirmation_spends_the_skipped_roundtrip():
+    trust = LocatorTrust(ttl=60)
+    trust.skipped(1)
+    trust.skipped(1)
+    trust.confirmed(2)
+    trust.failed()
+
+    stats = trust.stats()
+    assert stats["roundtrips_avoided"] == 1
+    assert (stats["confirmations"], stats["confirm_failures"]) == (2, 1)
@@ -0,0 +1,35 @@
+from utilities.locator_validation import BulkLocatorValidator
+from utilities.visual_audit import VisualAudit
+
+
+class ScriptDriver:
+    """Answers every execute_script with `response` and records the calls."""
+
+    def __init__(self, response):
+        self.response = response
+        self.calls = []
+
+    def execute_script(self, script, *args):
+        self.calls.append(args)
+        return self.response
+
+
+def test_validate_counts_one_batch():
+    validator = BulkLocatorValidator()
+    assert validator.validate(ScriptDriver(['ok', 'missing']), ["//a", "//b"]) == ['ok', 'missing']
+    assert validator.stats() == {"batches": 1, "checked": 2, "stale": 1, "roundtrips_saved": 5}
+
+
+def test_highlight_leaves_the_validation_counters_alone():
+    validator = BulkLocatorValidator()
+    driver = ScriptDriver(['ok'])
+    validator.highlight(driver, ["//a"], "springgreen", audit=VisualAudit("live"))
+
+    assert driver.calls == [(["//a"], "springgreen", False)]
+    assert validator.stats()["checked"] == validator.stats()["batches"] == 0
+
+
+def test_highlight_skips_the_roundtrip_when_audit_is_off():
+    driver = ScriptDriver(['ok'])
+    BulkLocatorValidator().highlight(driver, ["//a"], "springgreen", audit=VisualAudit("off"))
+    assert driver.calls == []
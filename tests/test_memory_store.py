@@ -0,0 +1,114 @@
+import json
+import pytest
+from utilities.memory_store import JsonMemoryStore, MemoryBackend, SqliteMemoryStore, open_memory_store
+
+LOGIN = {"xpath": "//*[@id='login']", "tag": "button", "component_type": "BUTTON", "class": "btn"}
+USER = {"xpath": "//*[@id='user']", "tag": "input", "component_type": "TEXTBOX", "class": ""}
+
+
+def _stored(xpath, last_verified):
+    return {"xpath": xpath, "tag": "input", "component_type": "TEXTBOX", "class": "", "last_verified": last_verified}
+
+
+def test_backend_contract_is_abstract():
+    with pytest.raises(TypeError):
+        MemoryBackend("unused")
+
+
+def test_factory_picks_backend_by_extension(tmp_path):
+    assert isinstance(open_memory_store(str(tmp_path / "m.json")), JsonMemoryStore)
+    store = open_memory_store(str(tmp_path / "m.db"))
+    assert isinstance(store, SqliteMemoryStore)
+    store.close()
+    with pytest.raises(ValueError):
+        open_memory_store(str(tmp_path / "m.json"), backend="redis")
+
+
+# --- 🗄️ SQLite ---
+
+@pytest.fixture
+def sqlite_store(tmp_path):
+    store = SqliteMemoryStore(str(tmp_path / "memory.db"))
+    yield store
+    store.close()
+
+
+def test_sqlite_upsert_replaces_the_row(sqlite_store):
+    sqlite_store.record_heal("Login", LOGIN, "login_page")
+    sqlite_store.record_heal("login", dict(LOGIN, xpath="//button[1]"), "login_page")
+
+    assert sqlite_store.snapshot() == {"login_page": {"login": sqlite_store.lookup("LOGIN", "login_page")}}
+    assert sqlite_store.lookup("login", "login_page")["xpath"] == "//button[1]"
+    assert sqlite_store.heals == 2
+
+
+def test_sqlite_lookup_prefers_page_then_common(sqlite_store):
+    sqlite_store.record_heal("login", LOGIN, "common")
+    sqlite_store.record_heal("login", dict(LOGIN, xpath="//*[@id='page-login']"), "login_page")
+
+    assert sqlite_store.lookup("login", "login_page")["xpath"] == "//*[@id='page-login']"
+    assert sqlite_store.lookup("login", "dashboard")["xpath"] == LOGIN["xpath"]
+    assert sqlite_store.lookup("missing", "login_page") is None
+    assert (sqlite_store.hits, sqlite_store.misses) == (2, 1)
+
+
+def test_sqlite_import_keeps_the_newer_row(sqlite_store, tmp_path):
+    sqlite_store._conn.execute(sqlite_store.UPSERT, sqlite_store._row(
+        "login_page", "username", _stored("//*[@id='db']", "2026-01-02 00:00:00")))
+    sqlite_store._conn.execute(sqlite_store.UPSERT, sqlite_store._row(
+        "login_page", "password", _stored("//*[@id='db-pw']", "2026-01-02 00:00:00")))
+    exported = tmp_path / "ai_ui_memory.json"
+    exported.write_text(json.dumps({"login_page": {
+        "Username": _stored("//*[@id='older']", "2026-01-01 00:00:00"),
+        "password": _stored("//*[@id='newer']", "2026-01-03 00:00:00"),
+        "broken": {"tag": "div"},
+    }}))
+
+    assert sqlite_store.import_json(str(exported)) == 2
+    assert sqlite_store.lookup("username", "login_page")["xpath"] == "//*[@id='db']"
+    assert sqlite_store.lookup("password", "login_page")["xpath"] == "//*[@id='newer']"
+    assert sqlite_store.lookup("broken", "login_page") is None
+
+
+# --- 🧠 JSON write-behind ---
+
+def test_json_heals_are_served_before_the_flush(tmp_path):
+    path = tmp_path / "ai_ui_memory.json"
+    store = JsonMemoryStore(str(path))
+    store.record_heal("Username", USER, "login_page")
+
+    assert store.lookup("username", "login_page")["xpath"] == USER["xpath"]
+    assert not path.exists()
+    assert store.pending() == 1
+
+    assert store.flush() == 1
+    assert json.loads(path.read_text())["login_page"]["username"]["xpath"] == USER["xpath"]
+    assert store.pending() == 0 and store.flush() == 0
+
+
+def test_json_flush_merges_with_other_writers(tmp_path):
+    path = tmp_path / "ai_ui_memory.json"
+    path.write_text(json.dumps({"login_page": {"password": _stored("//*[@id='pw']", "2026-01-01 00:00:00")}}))
+    store = JsonMemoryStore(str(path))
+    store.lookup("password", "login_page")  # loads the file
+
+    # Another worker heals and flushes after our load
+    other = JsonMemoryStore(str(path))
+    other.record_heal("login", LOGIN, "common")
+    other.flush()
+
+    store.record_heal("username", USER, "login_page")
+    store.flush()
+
+    on_disk = json.loads(path.read_text())
+    assert set(on_disk["login_page"]) == {"password", "username"}
+    assert on_disk["common"]["login"]["xpath"] == LOGIN["xpath"]
+    assert store.lookup("login", "login_page")["xpath"] == LOGIN["xpath"]
+
+
+def test_json_lookup_falls_back_to_common(tmp_path):
+    store = JsonMemoryStore(str(tmp_path / "ai_ui_memory.json"))
+    store.record_heal("login", LOGIN, "common")
+
+    assert store.lookup("login", "dashboard")["xpath"] == LOGIN["xpath"]
+    assert store.lookup("logout", "dashboard") is None
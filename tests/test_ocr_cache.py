@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+from utilities.ocr_cache import OcrResultCache, frame_hash
+
+RESULTS = [([[1, 2], [11, 2], [11, 6], [1, 6]], "Username", 0.9)]
+
+
+def _frame(seed):
+    return np.random.default_rng(seed).integers(0, 256, (120, 160, 3), dtype=np.uint8)
+
+
+class CountingOcr:
+    def __init__(self):
+        self.calls = 0
+
+    def readtext(self, image):
+        self.calls += 1
+        return RESULTS
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return OcrResultCache(path=str(tmp_path), tolerance=0)
+
+
+def test_identical_frame_is_a_memory_hit(cache):
+    ocr = CountingOcr()
+    first = cache.readtext(ocr, _frame(1), url="https://app/login")
+    again = cache.readtext(ocr, _frame(1).copy(), url="https://app/login")
+
+    assert again == first == [[[[1.0, 2.0], [11.0, 2.0], [11.0, 6.0], [1.0, 6.0]], "Username", 0.9]]
+    assert ocr.calls == 1
+    assert (cache.memory_hits, cache.misses) == (1, 1)
+
+
+def test_other_frame_or_url_misses_at_tolerance_zero(cache):
+    assert frame_hash(_frame(1)) != frame_hash(_frame(2))
+    cache.put(_frame(1), RESULTS, url="https://app/login")
+
+    assert cache.get(_frame(2), url="https://app/login") is None
+    assert cache.get(_frame(1), url="https://app/dashboard") is None
+    assert (cache.near_hits, cache.misses) == (0, 2)
+
+
+def test_disk_tier_is_shared_between_instances(cache, tmp_path):
+    cache.put(_frame(1), RESULTS, url="https://app/login")
+    other = OcrResultCache(path=str(tmp_path), tolerance=0)
+
+    assert other.get(_frame(1), url="https://app/login") == cache.get(_frame(1), url="https://app/login")
+    assert other.disk_hits == 1
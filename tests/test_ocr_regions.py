@@ -0,0 +1,49 @@
+import numpy as np
+from utilities import ocr_regions
+from utilities.ocr_regions import candidate_regions, read_regions
+
+FRAME = (200, 300, 3)
+
+
+class BoxOcr:
+    """Finds one word at a fixed box inside whatever crop it is given."""
+
+    def __init__(self):
+        self.crops = []
+
+    def readtext(self, crop):
+        self.crops.append(crop.shape[:2])
+        return [([[1, 2], [11, 2], [11, 6], [1, 6]], "Username", 0.9)]
+
+
+def test_rects_map_to_padded_screenshot_pixels():
+    rect = {"x": 10, "y": 20, "width": 30, "height": 10}
+    assert candidate_regions([rect], FRAME, dpr=2.0, pad=5) == [[10, 30, 90, 70]]
+
+
+def test_regions_are_clipped_merged_and_skip_offscreen_rects():
+    rects = [{"x": 0, "y": 0, "width": 20, "height": 10},
+             {"x": 25, "y": 0, "width": 20, "height": 10},
+             {"x": 10, "y": 500, "width": 20, "height": 10},
+             {"x": 10, "y": 10, "width": 0, "height": 10}]
+    assert candidate_regions(rects, FRAME, pad=4, gap=2) == [[0, 0, 49, 14]]
+    assert candidate_regions(rects[:1], FRAME, pad=4, mode="band") == [[0, 0, 300, 14]]
+
+
+def test_roi_boxes_map_back_to_page_coordinates():
+    image = np.zeros(FRAME, dtype=np.uint8)
+    ocr = BoxOcr()
+    (bbox, text, _), = read_regions(ocr, image, [[40, 30, 120, 90]])
+
+    assert ocr.crops == [(60, 80)]
+    assert bbox == [[41, 32], [51, 32], [51, 36], [41, 36]]
+    assert text == "Username"
+
+
+def test_downscaled_roi_boxes_are_scaled_back(monkeypatch):
+    monkeypatch.setattr(ocr_regions, "_resize", lambda image, scale: image[::2, ::2])
+    ocr = BoxOcr()
+    (bbox, _, _), = read_regions(ocr, np.zeros(FRAME, dtype=np.uint8), [[40, 30, 120, 90]], scale=0.5)
+
+    assert ocr.crops == [(30, 40)]
+    assert bbox == [[42, 34], [62, 34], [62, 42], [42, 42]]
@@ -0,0 +1,38 @@
+import numpy as np
+from utilities.proximity import PROXIMITY_RADIUS, ProximityIndex, proximity_bonuses
+
+LABEL_BOX = [[100, 40], [180, 40], [180, 60], [100, 60]]
+OCR = [(LABEL_BOX, "Username", 0.9), ([[400, 300], [470, 300], [470, 320], [400, 320]], "Forgot password", 0.8)]
+ELEMENTS = [{"rect": {"x": x, "y": y, "width": 200, "height": 30}} for x, y in
+            [(40, 70), (300, 45), (40, 400), (900, 700)]]
+
+
+def _legacy_bonus(ocr_bbox, el_rect):
+    """The removed per-element _calculate_distance bonus against the single best label."""
+    ocr_center = np.mean(np.array(ocr_bbox), axis=0)
+    el_center = [el_rect['x'] + (el_rect['width'] / 2), el_rect['y'] + (el_rect['height'] / 2)]
+    dist = np.linalg.norm(ocr_center - el_center)
+    return max(0, 100 * (1 - (dist / 500)))
+
+
+def test_single_anchor_matches_the_nearest_label_distance():
+    bonuses, anchors = proximity_bonuses("username", OCR, ELEMENTS)
+
+    assert anchors == 1
+    assert np.allclose(bonuses, [_legacy_bonus(LABEL_BOX, el['rect']) for el in ELEMENTS])
+    assert bonuses[-1] == 0
+
+
+def test_no_anchor_no_bonus():
+    bonuses, anchors = proximity_bonuses("employee name", OCR, ELEMENTS)
+    assert anchors == 0 and not bonuses.any()
+
+
+def test_closest_weighted_anchor_wins():
+    index = ProximityIndex(ELEMENTS)
+    anchors = np.array([[140.0, 85.0], [140.0, 415.0]])
+    bonuses = index.bonuses(anchors, np.array([1.0, 0.5]))
+
+    assert np.isclose(bonuses[0], 100.0)
+    assert np.isclose(bonuses[2], 50.0)
+    assert np.isclose(bonuses[1], 100 * (1 - np.hypot(400 - 140, 60 - 85) / PROXIMITY_RADIUS))
@@ -0,0 +1,22 @@
+import numpy as np
+from utilities.scoring_engine import BatchScoringEngine
+
+THRESHOLD = 38.0
+
+
+def test_assign_resolves_conflicting_maxima():
+    # Both intents score best on element 0; greedy would leave intent 1 with nothing
+    totals = np.array([[90.0, 80.0],
+                       [85.0, 10.0]])
+    assert BatchScoringEngine.assign(totals, THRESHOLD) == [1, 0]
+
+
+def test_assign_leaves_sub_threshold_rows_unassigned():
+    totals = np.array([[20.0, 30.0],
+                       [50.0, 12.0]])
+    assert BatchScoringEngine.assign(totals, THRESHOLD) == [None, 0]
+
+
+def test_assign_more_intents_than_elements():
+    assert BatchScoringEngine.assign(np.array([[60.0], [95.0]]), THRESHOLD) == [None, 0]
+    assert BatchScoringEngine.assign(np.zeros((2, 0)), THRESHOLD) == [None, None]
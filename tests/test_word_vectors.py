@@ -0,0 +1,18 @@
+import pytest
+from utilities.word_vectors import TOKEN_RE, VERIFY_TEXTS
+
+
+@pytest.fixture(scope="module")
+def tokenizer():
+    # The blank English pipeline carries the same tokenizer rules as en_core_web_md
+    return pytest.importorskip("spacy").blank("en").tokenizer
+
+
+@pytest.mark.parametrize("text", VERIFY_TEXTS)
+def test_table_tokens_match_spacy(tokenizer, text):
+    assert TOKEN_RE.findall(text) == [token.text for token in tokenizer(text)]
+
+
+def test_clitics_split_like_spacy():
+    assert TOKEN_RE.findall("Don't have an account?") == ["Do", "n't", "have", "an", "account", "?"]
+    assert TOKEN_RE.findall("User's e-mail:") == ["User", "'s", "e", "-", "mail", ":"]
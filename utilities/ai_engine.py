@@ -1,32 +1,68 @@
 import os
 import re
-import time
-import json
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from thefuzz import fuzz
+from utilities.candidate_index import CandidatePruner
+from utilities.dom_snapshot import DomSnapshotCache
+from utilities.embedding_cache import DEFAULT_CACHE_PATH, EmbeddingCache
+from utilities.locator_trust import DEFAULT_TRUST_TTL, LocatorTrust
+from utilities.locator_validation import BulkLocatorValidator
+from utilities.memory_store import open_memory_store
+from utilities.phase_timing import PHASE_TIMER
+from utilities.readiness import PageReadiness
+from utilities.scoring_engine import BatchScoringEngine
+from utilities.visual_audit import DEFAULT_AUDIT_MODE, VisualAudit
+from utilities.word_vectors import DEFAULT_TABLE_DIR, SpacyEmbedder, WordVectorTable
 
 
 class AIAutomationFramework:
-    def __init__(self, driver, timeout=10, memory_file="ai_ui_memory.json"):
+    # 🚀 ARCHITECT WEIGHTS: Optimized for Modern Web (React/Angular)
+    THRESHOLD = 38.0
+    WEIGHTS = {
+        'aria-label': 1.0,
+        'placeholder': 0.9,
+        'label_text': 1.0,
+        'name': 0.4,
+        'id': 0.05
+    }
+
+    def __init__(self, driver, timeout=10, memory_file="ai_ui_memory.json", memory_flush_interval=30,
+                 memory_backend=None, scrape_mode="full", prefilter_top_k=30, vector_table=DEFAULT_TABLE_DIR,
+                 embedding_cache=DEFAULT_CACHE_PATH, audit_mode=DEFAULT_AUDIT_MODE, timer=PHASE_TIMER,
+                 trust_ttl=DEFAULT_TRUST_TTL, trust_per_context=None, candidate_top_n=50,
+                 scrape_max_nodes=None, scrape_max_depth=None):
         self.driver = driver
         self.timeout = timeout
         self.memory_file = os.path.join(os.getcwd(), memory_file)
+        # 🧠 JSON (write-behind) or SQLite (multi-worker) backend, picked by name or file extension
+        self.memory = open_memory_store(self.memory_file, memory_backend,
+                                        flush_interval=memory_flush_interval)
 
         # 🟢 ARCHITECT'S NAMESPACE: Default context
         self.active_page_context = "common"
 
-        # 🚀 ARCHITECT WEIGHTS: Optimized for Modern Web (React/Angular)
-        self.THRESHOLD = 38.0
-        self.WEIGHTS = {
-            'aria-label': 1.0,
-            'placeholder': 0.9,
-            'label_text': 1.0,
-            'name': 0.4,
-            'id': 0.05
-        }
         self._nlp = None
+        self._scorer = None
+        # ⚡ Exported word-vector table (python -m utilities.word_vectors) skips the full spaCy load
+        self.vector_table = vector_table
+        # 🗃️ Label/intent vectors survive across steps and runs (None keeps them in memory only)
+        self.embedding_cache = embedding_cache
+        # 🛰️ MutationObserver-backed scrape cache (generation counter + dirty subtrees), uncapped by default
+        self.dom_cache = DomSnapshotCache(max_nodes=scrape_max_nodes, max_depth=scrape_max_depth)
+        # ⏱️ Event-driven readiness before a heal (network idle + frames settled + no loader); no
+        # quiet period: the page already rendered the step before and a ticking widget would stall it
+        self.readiness = PageReadiness(quiet_ms=0, timeout=3)
+        # 🎥 off | live (in-page highlights) | recorded (boxes drawn later onto one screenshot per step)
+        self.audit = VisualAudit(audit_mode)
+        # ✅ Cached XPaths are validated in bulk, one execute_script per step
+        self.validator = BulkLocatorValidator()
+        # 🤝 Recently verified locators (TTL / unchanged DOM generation) skip that roundtrip entirely
+        self.trust = LocatorTrust(trust_ttl, trust_per_context)
+        # 🔎 "full" ships every element to Python; "query" prefilters in the browser and ships top-K
+        self.scrape_mode = scrape_mode
+        self.prefilter_top_k = prefilter_top_k
+        # 📇 Full scrapes: trigram/token inverted index hands the scorer the top-N per intent only
+        self.pruner = CandidatePruner(candidate_top_n)
+        # ⏱️ Per-phase spans (no-op unless enabled, e.g. by the pytest phase-timing plugin)
+        self.timer = timer
 
     def set_context(self, page_name):
         """🚀 THE NAVIGATOR: Sets the folder name in JSON for the current Feature."""
@@ -43,10 +79,33 @@ class AIAutomationFramework:
                 self._nlp = spacy.load("en_core_web_md")
         return self._nlp
 
+    def _get_embedder(self):
+        """Memory-mapped vector table when exported, full SpaCy otherwise; always behind the cache."""
+        if self.vector_table and WordVectorTable.exists(self.vector_table):
+            embedder = WordVectorTable(self.vector_table)
+        else:
+            embedder = SpacyEmbedder(self._get_nlp())
+        return EmbeddingCache(embedder, path=self.embedding_cache)
+
+    def _get_scorer(self):
+        """Lazy-builds the batch scoring engine on top of the shared embedder."""
+        if self._scorer is None:
+            with self.timer.span("model_load"):
+                self._scorer = BatchScoringEngine(self._get_embedder(), self.WEIGHTS, timer=self.timer)
+        return self._scorer
+
     # --- 🛠️ VISUALS & INTERACTION ---
 
     def highlight(self, element, color="orange"):
         """🚀 THE X-RAY: Non-destructive highlighting to preserve React styles."""
+        if self.audit.recording:
+            try:
+                self.audit.mark([element.rect], color)
+            except Exception:
+                pass
+            return
+        if not self.audit.live:
+            return
         try:
             self.driver.execute_script("""
                 var el = arguments[0];
@@ -65,159 +124,224 @@ class AIAutomationFramework:
     # --- 🏗️ STRUCTURED MEMORY (JSON) ---
 
     def _load_memory(self):
-        if os.path.exists(self.memory_file):
-            try:
-                with open(self.memory_file, 'r') as f:
-                    return json.load(f)
-            except:
-                return {}
-        return {}
+        return self.memory.snapshot()
 
     def _save_memory(self, intent, meta, page_context=None):
-        """🚀 NAMESPACED SAVING: Organizes locators by Page Name."""
-        memory = self._load_memory()
+        """🚀 NAMESPACED SAVING: Organizes locators by Page Name (flushed write-behind)."""
         ctx = page_context or self.active_page_context
+        return self.memory.record_heal(intent, meta, ctx)
 
-        if ctx not in memory:
-            memory[ctx] = {}
-
-        memory[ctx][intent.lower()] = {
-            "xpath": meta['xpath'],
-            "tag": meta['tag'],
-            "component_type": meta.get('component_type', 'BUTTON'),
-            "class": meta.get('class', ''),
-            "last_verified": time.strftime("%Y-%m-%d %H:%M:%S")
+    def validate_memory(self, page_context=None):
+        """Validates every remembered locator of a page in one roundtrip: {intent: status}."""
+        ctx = page_context or self.active_page_context
+        entries = self.memory.snapshot().get(ctx, {})
+        statuses = self.validator.validate(self.driver, [meta['xpath'] for meta in entries.values()])
+        return dict(zip(entries, statuses))
+
+    def stats(self):
+        """📊 One dict with every subsystem's counters, for the run summary."""
+        return {
+            "memory": self.memory.stats(),
+            "dom": self.dom_cache.stats(),
+            "validation": self.validator.stats(),
+            "trust": self.trust.stats(),
+            "pruning": self.pruner.stats(),
+            "embeddings": self._scorer.embedder.stats() if self._scorer else {},
+            "audit": self.audit.stats()
         }
 
-        with open(self.memory_file, 'w') as f:
-            json.dump(memory, f, indent=4)
+    def flush_memory(self):
+        """Writes pending healed locators to disk. Called at scenario end."""
+        return self.memory.flush()
+
+    def capture_audit(self, label):
+        """Closes the step's audit frame (recorded mode): one screenshot for all of its marks."""
+        return self.audit.capture(self.driver, label)
+
+    def render_audit(self):
+        """Writes the recorded audit frames (annotated screenshots) to disk."""
+        return self.audit.render()
 
     # --- 🔍 CORE ENGINE: THE SCRAPER ---
 
-    def _get_deep_elements(self):
-        """Master Scraper: Extracts metadata from the DOM using JavaScript."""
-        return self.driver.execute_script("""
-            const found = [];
-            const findAllElements = (root) => {
-                const query = 'input, button, select, textarea, [role], a, div, span, i, svg';
-                let elements = Array.from(root.querySelectorAll(query));
-                root.querySelectorAll('*').forEach(el => {
-                    if (el.shadowRoot) { elements.push(...findAllElements(el.shadowRoot)); }
-                });
-                return elements;
-            };
-
-            const allElements = findAllElements(document);
-            allElements.forEach(el => {
-                try {
-                    const style = window.getComputedStyle(el);
-                    if (el.offsetWidth === 0 || style.visibility === 'hidden' || style.display === 'none') return;
-
-                    const tag = el.tagName.toLowerCase();
-                    const cls = el.className.toString().toLowerCase();
-                    const role = (el.getAttribute('role') || "").toLowerCase();
-
-                    let cType = "BUTTON";
-                    if (tag === 'textarea' || (tag === 'input' && !['checkbox', 'radio'].includes(el.type))) { cType = "TEXTBOX"; }
-                    else if (el.type === 'checkbox' || role === 'checkbox') { cType = "CHECKBOX"; }
-                    else if (tag === 'select' || el.hasAttribute('aria-haspopup')) { cType = "DROPDOWN"; }
-
-                    let intent = (el.placeholder || el.getAttribute('aria-label') || "").trim();
-                    if (intent.length < 2) {
-                        let neighbor = el.previousElementSibling || el.parentElement.querySelector('label');
-                        if (neighbor && neighbor.innerText.trim().length > 1) { intent = neighbor.innerText; }
-                    }
-                    if (intent.length < 2) intent = el.innerText || "";
-                    intent = intent.split('\\n')[0].trim().replace(/:$/, "");
-                    if (intent.length < 2) return;
-
-                    found.push({
-                        intent: intent, component_type: cType, 
-                        xpath: el.id ? `//*[@id='${el.id}']` : `//*[contains(text(), '${intent}')]`,
-                        tag: tag, class: cls, 
-                        placeholder: el.placeholder || "", aria: el.getAttribute('aria-label') || ""
-                    });
-                } catch (e) {}
-            });
-            return found;
-        """)
+    def _get_deep_elements(self, intents=None):
+        """Master Scraper: Extracts metadata from the DOM, re-scraping only what the page changed."""
+        with self.timer.span("scrape") as span:
+            elements = None
+            if intents and self.scrape_mode == "query":
+                elements = self.dom_cache.snapshot(self.driver, intents, self.prefilter_top_k)
+                if not all(any(i in el['prefilter'] for el in elements) for i in intents):
+                    # No lexical overlap for some intent (e.g. 'sign in' vs 'Login'): give NLP the whole page
+                    elements = None
+            if elements is None:
+                elements = self.dom_cache.snapshot(self.driver)
+            span.count(elements=len(elements))
+
+        # 📼 Record mode (utilities.replay_driver.RecordingDriver) keeps every scrape as benchmark input
+        record_scrape = getattr(self.driver, 'record_scrape', None)
+        if record_scrape:
+            record_scrape(intents, elements)
+        return elements
+
+    def _candidates(self, queries, elements):
+        """Narrows a full-page scrape through the inverted index (query-mode scrapes are prefiltered)."""
+        if not elements or 'prefilter' in elements[0]:
+            return elements
+        with self.timer.span("prune") as span:
+            candidates = self.pruner.prune(queries, elements, self.dom_cache.version)
+            span.count(elements=len(elements), candidates=len(candidates))
+        return candidates
 
     # --- 🧠 THE BRAIN: NLP & FUZZY MATCHING ---
 
-    def _find_locator_weighted(self, user_query):
+    def _find_locator_weighted(self, user_query, top_k=1):
         self._wait_for_app_ready()
-        nlp = self._get_nlp()
-        elements = self._get_deep_elements()
+        elements = self._candidates([user_query], self._get_deep_elements([user_query]))
         if not elements: return None
 
-        query_doc = nlp(user_query.lower())
-        matches = []
-
-        for el in elements:
-            scores = {
-                'aria-label': fuzz.partial_ratio(user_query.lower(), el['aria'].lower()),
-                'placeholder': fuzz.partial_ratio(user_query.lower(), el['placeholder'].lower()),
-                'label_text': fuzz.token_sort_ratio(user_query.lower(), el['intent'].lower())
-            }
-            weighted_sum = sum(scores[k] * self.WEIGHTS.get(k, 0) for k in scores)
-
-            el_doc = nlp(el['intent'].lower())
-            sim = query_doc.similarity(el_doc) if query_doc.vector_norm > 0 else 0
-            total = (weighted_sum / 2) + (sim * 50)
-            matches.append({"total": total, "element": el})
-
-        matches.sort(key=lambda x: x['total'], reverse=True)
+        # One nlp.pipe batch + one cosine matrix product for the whole page
+        matches = self._get_scorer().rank(user_query, elements, top_k=top_k)
         if matches and matches[0]['total'] >= self.THRESHOLD:
             return matches[0]['element']
         return None
 
     # --- 🚀 THE P2 ORCHESTRATOR: RESOLVE & HEAL ---
 
-    def get_step_metadata(self, step_text, page_context=None):
-        """🚀 THE RESOLVER: Hierarchy -> Memory[Page] -> Memory[Common] -> Heal."""
+    @staticmethod
+    def extract_intents(step_text):
+        """Pulls the quoted / <param> / {param} intents out of a raw Gherkin step."""
         params = re.findall(r"[\"'](.*?)[\"']|<(.*?)>|\{(.*?)\}", step_text)
-        intents = [next((i for i in g if i), None) for g in params if any(g)]
-        results = []
-        memory = self._load_memory()
+        return [next((i for i in g if i), None) for g in params if any(g)]
 
+    def get_step_metadata(self, step_text, page_context=None):
+        """🚀 THE RESOLVER: Hierarchy -> Memory[Page] -> Memory[Common] -> Heal."""
+        intents = self.extract_intents(step_text)
+        self.timer.set_scope(step=step_text)
+        return [meta for meta in self.resolve_many(intents, page_context) if meta]
+
+    def resolve_many(self, intents, page_context=None):
+        """
+        🚀 THE BATCH RESOLVER: Memory first, then ONE wait, ONE scrape and ONE
+        intents x elements score matrix for everything that needs healing.
+        Elements are assigned one-to-one, so two intents never claim the same node.
+        Recently verified locators come back with trusted=True and no validation;
+        pass them through confirm_many() before acting on them.
+        Returns one meta (or None) per intent, in order.
+        """
         ctx = page_context or self.active_page_context
+        self.timer.set_scope(context=ctx)
+        with self.timer.span("resolve", intents=len(intents)) as span:
+            results = self._resolve_many(intents, ctx)
+            span.count(resolved=sum(1 for meta in results if meta))
+        return results
 
-        for intent in intents:
-            intent_key = intent.lower()
-            meta = None
-
-            # 1. Check Memory (Page Context then Common)
-            if ctx in memory and intent_key in memory[ctx]:
-                meta = memory[ctx][intent_key]
-            elif "common" in memory and intent_key in memory["common"]:
-                meta = memory["common"][intent_key]
-
-            # 2. P2 Validation: Is the locator still alive?
-            if meta:
-                try:
-                    el = self.driver.find_element(By.XPATH, meta['xpath'])
-                    if not el.is_displayed(): raise Exception("Element Hidden")
-                    self.highlight(el, "cyan")  # Success Highlight
-                except:
-                    print(f"🛠️ UI Changed for '{intent}'. Triggering Healing...")
-                    meta = None
-
-                    # 3. P1 Fallback: Discover and Update Memory
-            if not meta:
-                meta = self._find_locator_weighted(intent)
-                if meta:
-                    self._save_memory(intent, meta, ctx)
-                    el = self.driver.find_element(By.XPATH, meta['xpath'])
-                    self.highlight(el, "springgreen")  # New discovery highlight
-
-            if meta:
-                results.append(meta)
+    def _resolve_many(self, intents, ctx):
+        results = [None] * len(intents)
+        claimed = set()
+
+        # 1. Check Memory (Page Context then Common)
+        with self.timer.span("memory", lookups=len(intents)):
+            cached = [(idx, self.memory.lookup(intent, ctx)) for idx, intent in enumerate(intents)]
+            cached = [(idx, meta) for idx, meta in cached if meta]
+
+        # 2. Trust: verified recently / DOM generation unchanged -> used as is, confirmed at action time.
+        #    Only a fully trusted step skips the roundtrip; otherwise every locator rides along with it.
+        dom_state = self.dom_cache.generation()
+        unverified = cached
+        if cached and all(self.trust.trusted(ctx, meta['xpath'], dom_state) for _, meta in cached):
+            for idx, meta in cached:
+                results[idx] = dict(meta, intent=meta.get('intent', intents[idx]), trusted=True)
+                claimed.add(meta['xpath'])
+            unverified = []
+            self.trust.skipped(1)
+
+        # 3. P2 Validation: Are the locators still alive? (one roundtrip for the whole step)
+        with self.timer.span("validate", locators=len(unverified)):
+            statuses = self.validator.validate(self.driver, [meta['xpath'] for _, meta in unverified], "cyan",
+                                               audit=self.audit)
+        for (idx, meta), status in zip(unverified, statuses):
+            if status == 'ok':
+                results[idx] = dict(meta, intent=meta.get('intent', intents[idx]))
+                claimed.add(meta['xpath'])
+                self.trust.verified(ctx, meta['xpath'], dom_state)
+            else:
+                print(f"🛠️ UI Changed for '{intents[idx]}' ({status}). Triggering Healing...")
+
+        # 4. P1 Fallback: Discover every miss together and Update Memory
+        pending = [idx for idx, meta in enumerate(results) if meta is None]
+        if pending:
+            self._heal(intents, pending, results, claimed, ctx)
+        return results
 
+    def _heal(self, intents, pending, results, claimed, ctx):
+        """Scrapes and scores the `pending` intents together; fills `results` in place."""
+        self._wait_for_app_ready()
+        queries = [intents[idx] for idx in pending]
+        elements = self._candidates(queries, self._get_deep_elements(queries))
+        elements = [el for el in elements if el['xpath'] not in claimed]
+        if not elements:
+            return
+
+        totals = self._get_scorer().score_matrix(queries, elements)
+        with self.timer.span("assign", intents=len(queries), elements=len(elements)):
+            picks = self._get_scorer().assign(totals, self.THRESHOLD)
+
+        with self.timer.span("heal") as span:
+            healed = []
+            for idx, col in zip(pending, picks):
+                if col is None:
+                    continue
+                meta = elements[col]
+                self._save_memory(intents[idx], meta, ctx)
+                results[idx] = meta
+                healed.append(meta['xpath'])
+                # Just picked from a fresh scrape: as verified as it gets
+                self.trust.verified(ctx, meta['xpath'], self.dom_cache.generation())
+
+            # New discovery highlight, all in one roundtrip
+            self.validator.highlight(self.driver, healed, "springgreen", audit=self.audit)
+            span.count(healed=len(healed))
+
+    def confirm(self, meta, page_context=None):
+        """✅ LAZY CONFIRMATION of one resolved meta; see confirm_many."""
+        return self.confirm_many([meta], page_context)[0]
+
+    def confirm_many(self, metas, page_context=None):
+        """
+        ✅ LAZY CONFIRMATION: Call right before acting on resolved metas. Trusted ones
+        (resolved without validation) are checked now, all in one roundtrip; stale ones
+        are revoked and healed together. Returns the metas to act on (None where lost).
+        """
+        ctx = page_context or self.active_page_context
+        results = list(metas)
+        trusted = [idx for idx, meta in enumerate(results) if meta and meta.get('trusted')]
+        if not trusted:
+            return results
+        self.trust.confirmed(len(trusted))
+        with self.timer.span("validate", locators=len(trusted)):
+            statuses = self.validator.validate(self.driver, [results[idx]['xpath'] for idx in trusted])
+
+        stale = []
+        for idx, status in zip(trusted, statuses):
+            meta = results[idx]
+            if status == 'ok':
+                self.trust.verified(ctx, meta['xpath'], self.dom_cache.generation())
+                results[idx] = dict(meta, trusted=False)
+                continue
+            print(f"🛠️ Trusted locator for '{meta['intent']}' went stale ({status}). Triggering Healing...")
+            self.trust.failed()
+            self.trust.revoke(ctx, meta['xpath'])
+            results[idx] = None
+            stale.append(idx)
+
+        if stale:
+            # Every element still held by another intent of the step stays out of the heal
+            claimed = {meta['xpath'] for idx, meta in enumerate(results) if meta and idx not in stale}
+            intents = [meta['intent'] if meta else None for meta in metas]
+            with self.timer.span("resolve", intents=len(stale)):
+                self._heal(intents, stale, results, claimed, ctx)
         return results
 
     def _wait_for_app_ready(self):
-        try:
-            WebDriverWait(self.driver, 3).until_not(
-                EC.presence_of_element_located((By.XPATH, "//*[contains(@class, 'loader')]")))
-        except:
-            pass
+        with self.timer.span("wait"):
+            return self.readiness.wait(self.driver, label="heal")
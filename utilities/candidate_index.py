@@ -0,0 +1,118 @@
+import re
+import numpy as np
+
+# Element identities (key names of both scrapers) and how much a match in each one counts
+INDEX_FIELDS = {"intent": 1.0, "aria": 1.0, "aria-label": 1.0, "placeholder": 0.9, "labelText": 1.0, "text": 0.7}
+_WORDS = re.compile(r"[a-z0-9]+")
+
+
+def grams(text):
+    """Whole-word tokens plus padded character trigrams (' us', 'use', ..., 'me ') of a text."""
+    out = set()
+    for word in _WORDS.findall(str(text).lower()):
+        out.add("w:" + word)
+        padded = f" {word} "
+        out.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return out
+
+
+class CandidateIndex:
+    """
+    📇 INVERTED INDEX: gram -> (element ids, weights) over the element identities.
+    A posting weighs field_weight / sqrt(grams in that field), so summing a query's
+    postings gives a field-weighted cosine overlap: "Username" beats "Username 82".
+    A query only touches the postings of its own grams, so ranking candidates
+    costs the size of those postings, not the size of the page.
+    """
+
+    def __init__(self, elements, fields=INDEX_FIELDS):
+        self.elements = list(elements)
+        # Labels repeat a lot on real pages: group elements by (field, value), split each value once
+        groups = {}
+        for field in fields:
+            for i, el in enumerate(self.elements):
+                value = el.get(field)
+                if value:
+                    groups.setdefault((field, value), []).append(i)
+
+        ids, weights = {}, {}
+        for (field, value), members in groups.items():
+            value_grams = grams(value)
+            if not value_grams:
+                continue
+            members = np.array(members, dtype=np.intp)
+            w = np.full(len(members), fields[field] / np.sqrt(len(value_grams)))
+            for g in value_grams:
+                ids.setdefault(g, []).append(members)
+                weights.setdefault(g, []).append(w)
+        self.postings = {g: (np.concatenate(ids[g]), np.concatenate(weights[g])) for g in ids}
+
+    def top(self, query, top_n):
+        """Ids of the top_n elements by weighted gram overlap (best first); empty on no overlap."""
+        hits = [self.postings[g] for g in grams(query) if g in self.postings]
+        if not hits:
+            return np.zeros(0, dtype=np.intp)
+        ids, inverse = np.unique(np.concatenate([h[0] for h in hits]), return_inverse=True)
+        overlap = np.bincount(inverse, weights=np.concatenate([h[1] for h in hits]))
+        if len(ids) > top_n:
+            keep = np.argpartition(-overlap, top_n - 1)[:top_n]
+            ids, overlap = ids[keep], overlap[keep]
+        return ids[np.argsort(-overlap, kind="stable")]
+
+    def candidates(self, queries, top_n):
+        """Union of every query's top_n (page order), or None when some query matched nothing."""
+        picked = []
+        for query in queries:
+            ids = self.top(query, top_n)
+            if not len(ids):
+                return None
+            picked.append(ids)
+        return [self.elements[i] for i in np.unique(np.concatenate(picked))]
+
+
+class CandidatePruner:
+    """
+    ✂️ CANDIDATE PRUNING: Keeps one CandidateIndex per scrape version and hands the
+    scorer only the top_n elements per intent. Pages under min_elements (where building
+    the index costs more than scoring everything), and intents without any lexical
+    overlap (e.g. 'sign in' vs 'Login'), get the full scan. top_n=None disables pruning.
+    """
+
+    def __init__(self, top_n=50, min_elements=1000):
+        self.top_n = top_n
+        self.min_elements = min_elements
+        self._index = None
+        self._version = None
+
+        # 📊 Counters
+        self.builds = 0
+        self.pruned = 0
+        self.fallbacks = 0
+        self.page_elements = 0
+        self.candidates = 0
+
+    def prune(self, queries, elements, version):
+        """`version` changes whenever `elements` does (DomSnapshotCache.version)."""
+        if not self.top_n or len(elements) <= max(self.top_n, self.min_elements) or not queries:
+            return elements
+        if self._index is None or version != self._version:
+            self._index = CandidateIndex(elements)
+            self._version = version
+            self.builds += 1
+        picked = self._index.candidates(queries, self.top_n)
+        if picked is None:
+            self.fallbacks += 1
+            return elements
+        self.pruned += 1
+        self.page_elements += len(elements)
+        self.candidates += len(picked)
+        return picked
+
+    def stats(self):
+        return {
+            "top_n": self.top_n,
+            "index_builds": self.builds,
+            "pruned": self.pruned,
+            "fallbacks": self.fallbacks,
+            "kept_ratio": round(self.candidates / self.page_elements, 4) if self.page_elements else 0.0
+        }
@@ -0,0 +1,347 @@
+import time
+
+SCRAPER_JS = """
+    const { knownDoc, knownGen, maxDirty, intents, topK } = arguments[0];
+    // null = uncapped
+    const maxNodes = arguments[0].maxNodes == null ? Infinity : arguments[0].maxNodes;
+    const maxDepth = arguments[0].maxDepth == null ? Infinity : arguments[0].maxDepth;
+    const QUERY = 'input, button, select, textarea, [role], a, div, span, i, svg';
+    const OPTS = { subtree: true, childList: true, attributes: true, characterData: true };
+
+    // 🛰️ One observer per document: bumps the generation and remembers which subtrees moved
+    let st = window.__aiDom;
+    if (!st) {
+        st = window.__aiDom = {
+            docId: Math.random().toString(36).slice(2), gen: 0, dirty: new Set(), overflow: false,
+            ids: new WeakMap(), records: null, nextId: 1, observed: new WeakSet(), maxDirty: maxDirty
+        };
+        const toElement = (n) => n.nodeType === 1 ? n : (n.parentElement || n.host || (n.parentNode && n.parentNode.host) || null);
+        st.onMutations = (records) => {
+            if (!records.length) return;
+            st.gen++;
+            if (st.overflow) return;
+            for (const r of records) {
+                const el = toElement(r.target);
+                // One level up so sibling labels and parent text are re-read with the change
+                const root = el ? (el.parentElement || (el.parentNode && el.parentNode.host) || el) : null;
+                if (!root || root === document.documentElement || root === document.body || root.closest('head')
+                        || st.dirty.size >= st.maxDirty) {
+                    st.overflow = true; st.dirty.clear(); return;
+                }
+                st.dirty.add(root);
+            }
+        };
+        st.observer = new MutationObserver(st.onMutations);
+        st.observer.observe(document, OPTS);
+        st.observed.add(document);
+    }
+    st.maxDirty = maxDirty;
+    st.onMutations(st.observer.takeRecords());
+
+    // The dirty set is relative to the last scrape; a caller that missed it cannot take a delta
+    const canDelta = knownDoc === st.docId && knownGen === st.scrapedGen && !st.overflow;
+    if (knownDoc === st.docId && knownGen === st.gen && (intents || canDelta)) {
+        return { docId: st.docId, gen: st.gen, unchanged: true };
+    }
+
+    const describe = (el, out) => {
+        try {
+            const style = window.getComputedStyle(el);
+            if (el.offsetWidth === 0 || style.visibility === 'hidden' || style.display === 'none') return;
+
+            const tag = el.tagName.toLowerCase();
+            const cls = el.className.toString().toLowerCase();
+            const role = (el.getAttribute('role') || "").toLowerCase();
+
+            let cType = "BUTTON";
+            if (tag === 'textarea' || (tag === 'input' && !['checkbox', 'radio'].includes(el.type))) { cType = "TEXTBOX"; }
+            else if (el.type === 'checkbox' || role === 'checkbox') { cType = "CHECKBOX"; }
+            else if (tag === 'select' || el.hasAttribute('aria-haspopup')) { cType = "DROPDOWN"; }
+
+            let intent = (el.placeholder || el.getAttribute('aria-label') || "").trim();
+            let fromNeighbor = false;
+            if (intent.length < 2) {
+                let neighbor = el.previousElementSibling || el.parentElement.querySelector('label');
+                if (neighbor && neighbor.innerText.trim().length > 1) { intent = neighbor.innerText; fromNeighbor = true; }
+            }
+            if (intent.length < 2) intent = el.innerText || "";
+            intent = intent.split('\\n')[0].trim().replace(/:$/, "");
+            if (intent.length < 2) return;
+
+            let sid = st.ids.get(el);
+            if (!sid) { sid = st.nextId++; st.ids.set(el, sid); }
+            const rec = {
+                sid: sid, intent: intent, component_type: cType,
+                xpath: el.id ? `//*[@id='${el.id}']` : `//*[contains(text(), '${intent}')]`,
+                tag: tag, class: cls,
+                placeholder: el.placeholder || "", aria: el.getAttribute('aria-label') || ""
+            };
+            st.records.set(sid, { ref: new WeakRef(el), rec: rec, neighbor: fromNeighbor });
+            out.push(rec);
+        } catch (e) {}
+    };
+
+    // 🚶 Single linear pass: one TreeWalker per root, open shadow roots walked inline
+    const scan = { visited: 0, ms: 0, truncated: false, depthCapped: false };
+    const visit = (el, depth, out) => {
+        scan.visited++;
+        if (el.matches(QUERY)) describe(el, out);
+        if (el.shadowRoot) {
+            if (depth >= maxDepth) { scan.depthCapped = true; return; }
+            if (!st.observed.has(el.shadowRoot)) { st.observer.observe(el.shadowRoot, OPTS); st.observed.add(el.shadowRoot); }
+            walkTree(el.shadowRoot, depth, out);
+        }
+    };
+    const walkTree = (root, depth, out) => {
+        const w = document.createTreeWalker(root, NodeFilter.SHOW_ELEMENT);
+        let node = w.firstChild();
+        let d = depth + 1;
+        while (node && !scan.truncated) {
+            visit(node, d, out);
+            if (scan.visited >= maxNodes) { scan.truncated = true; break; }
+            if (w.firstChild()) {
+                if (d < maxDepth) { d++; node = w.currentNode; continue; }
+                scan.depthCapped = true;
+                w.parentNode();
+            }
+            node = null;
+            while (true) {
+                if (w.nextSibling()) { node = w.currentNode; break; }
+                if (!w.parentNode() || w.currentNode === root) break;
+                d--;
+            }
+        }
+    };
+    const scrapeRoot = (root, out) => {
+        const t0 = performance.now();
+        if (root.nodeType === 1) visit(root, 0, out);
+        if (!scan.truncated) walkTree(root, 0, out);
+        scan.ms += performance.now() - t0;
+    };
+
+    // 🔄 Bring the in-page record table up to the current generation
+    const refresh = () => {
+        if (st.records && !st.overflow && st.scrapedGen === st.gen) return { full: false, changed: [], dropped: [] };
+        if (!st.records || st.overflow) {
+            // 🌍 Full scrape: first call on this document, or too much churn to track
+            st.records = new Map(); st.dirty.clear(); st.overflow = false;
+            scrapeRoot(document, []);
+            st.scrapedGen = st.gen;
+            return { full: true };
+        }
+
+        // 🧩 Incremental: re-scrape only the outermost dirty subtrees and report what left
+        const within = (root, el) => { for (let n = el; n; n = n.parentNode || n.host) { if (n === root) return true; } return false; };
+        let roots = Array.from(st.dirty).filter(r => r.isConnected);
+        roots = roots.filter(r => !roots.some(o => o !== r && within(o, r)));
+
+        const dropped = [];
+        st.records.forEach((entry, sid) => {
+            const el = entry.ref.deref();
+            if (!el || !el.isConnected || roots.some(r => within(r, el))) { st.records.delete(sid); dropped.push(sid); }
+        });
+        const changed = [];
+        roots.forEach(r => scrapeRoot(r, changed));
+        if (scan.truncated || scan.depthCapped) {
+            // A capped delta would leave the cut-off part of a dropped subtree missing: start over
+            Object.assign(scan, { visited: 0, truncated: false, depthCapped: false });
+            st.overflow = true;
+            return refresh();
+        }
+
+        // ⬆️ Records outside the roots that read text from inside them: every ancestor (innerText
+        // intents) and the ancestors' children whose intent came from a sibling / nested label
+        const up = (n) => n.parentElement || (n.parentNode && n.parentNode.host) || null;
+        const stale = new Set();
+        roots.forEach(r => {
+            for (let a = up(r); a && a !== document.documentElement; a = up(a)) {
+                stale.add(a);
+                for (const c of a.children) {
+                    const entry = st.records.get(st.ids.get(c));
+                    if (entry && entry.neighbor) stale.add(c);
+                }
+            }
+        });
+        stale.forEach(el => {
+            if (roots.some(r => within(r, el))) return;
+            const sid = st.ids.get(el);
+            if (sid && st.records.delete(sid)) dropped.push(sid);
+            if (el.isConnected && el.matches(QUERY)) describe(el, changed);
+        });
+        st.dirty.clear();
+        st.scrapedGen = st.gen;
+        return { full: false, changed: changed, dropped: dropped };
+    };
+
+    // 🔎 Query-aware mode: cheap trigram containment prefilter, only the top-K per intent go over the wire
+    if (intents) {
+        refresh();
+        const grams = (text) => {
+            const g = new Set();
+            text.toLowerCase().split(/[^a-z0-9]+/).forEach(w => {
+                if (!w) return;
+                const p = ` ${w} `;
+                for (let i = 0; i + 3 <= p.length; i++) g.add(p.slice(i, i + 3));
+            });
+            return g;
+        };
+        const picked = new Map();
+        intents.forEach(intent => {
+            const q = grams(intent);
+            if (!q.size) return;
+            const scored = [];
+            st.records.forEach((entry, sid) => {
+                if (!entry.grams) entry.grams = grams(`${entry.rec.intent} ${entry.rec.aria} ${entry.rec.placeholder}`);
+                let hit = 0;
+                q.forEach(g => { if (entry.grams.has(g)) hit++; });
+                if (hit) scored.push([hit / q.size, sid, entry.rec]);
+            });
+            scored.sort((a, b) => b[0] - a[0]);
+            scored.slice(0, topK).forEach(([score, sid, rec]) => {
+                if (!picked.has(sid)) picked.set(sid, Object.assign({}, rec, { prefilter: {} }));
+                picked.get(sid).prefilter[intent] = Math.round(score * 1000) / 1000;
+            });
+        });
+        return { docId: st.docId, gen: st.gen, query: true, elements: Array.from(picked.values()), total: st.records.size, scan: scan };
+    }
+
+    // 📦 Full mode: send a delta when the caller holds the previous scrape, everything otherwise
+    const r = refresh();
+    if (!canDelta || r.full) {
+        return { docId: st.docId, gen: st.gen, full: true, elements: Array.from(st.records.values(), e => e.rec), dropped: [], scan: scan };
+    }
+    return { docId: st.docId, gen: st.gen, full: false, elements: r.changed, dropped: r.dropped, scan: scan };
+"""
+
+
+class DomSnapshotCache:
+    """
+    🛰️ THE DOM GENERATION CACHE: Keeps the last scrape on the Python side and
+    asks the page (via an injected MutationObserver) what changed since then.
+    Unchanged generation -> served from cache; a few dirty subtrees -> only those
+    (plus their ancestor chains, whose text may include the change) are re-scraped
+    and merged; navigation or heavy churn -> full scrape.
+
+    The page is walked in one linear TreeWalker pass (open shadow roots inline),
+    uncapped unless max_nodes / max_depth are given (depth counts shadow nesting too);
+    each walk's visited count and time land in last_scan, and a capped walk is reported.
+
+    Query mode (intents given) keeps the full table in the page and only ships the
+    top-K prefiltered candidates per intent, each tagged with its 'prefilter' score.
+    """
+
+    def __init__(self, max_dirty_roots=50, max_nodes=None, max_depth=None):
+        self.max_dirty_roots = max_dirty_roots
+        self.max_nodes = max_nodes
+        self.max_depth = max_depth
+        self.last_scan = None
+        self._observed = None
+        # Bumped whenever the cached element table changes (keys derived indexes)
+        self.version = 0
+        self._doc_id = None
+        self._gen = None
+        self._elements = {}
+        self._query_key = None
+        self._query_state = (None, None)
+        self._query_result = []
+
+        # 📊 Counters
+        self.cache_hits = 0
+        self.incremental_scrapes = 0
+        self.full_scrapes = 0
+        self.query_scrapes = 0
+        self.elements_transferred = 0
+        self.nodes_visited = 0
+        self.scan_ms = 0.0
+        self.capped_scans = 0
+
+    def invalidate(self):
+        self.version += 1
+        self._doc_id = None
+        self._gen = None
+        self._elements = {}
+        self._query_key = None
+
+    def _run(self, driver, doc_id, gen, intents=None, top_k=None):
+        payload = driver.execute_script(SCRAPER_JS, {
+            "knownDoc": doc_id, "knownGen": gen, "maxDirty": self.max_dirty_roots,
+            "intents": intents, "topK": top_k, "maxNodes": self.max_nodes, "maxDepth": self.max_depth
+        })
+        if payload:
+            self._observed = (payload['docId'], payload['gen'], time.monotonic())
+        scan = payload.get('scan') if payload else None
+        if scan:
+            # {'visited', 'ms', 'truncated', 'depthCapped'} of the walk behind this payload
+            self.last_scan = scan
+            self.nodes_visited += scan['visited']
+            self.scan_ms += scan['ms']
+            if scan.get('truncated') or scan.get('depthCapped'):
+                self.capped_scans += 1
+                print(f"⚠️ DOM scrape capped (max_nodes={self.max_nodes}, max_depth={self.max_depth}): "
+                      f"{scan['visited']} nodes visited, elements beyond the cap are missing")
+        return payload
+
+    def generation(self):
+        """(doc_id, gen, monotonic time) the page reported on the last scrape, or None."""
+        return self._observed
+
+    def snapshot(self, driver, intents=None, top_k=None):
+        """Returns the visible element records for the current page, reusing what it can."""
+        if intents:
+            return self._query(driver, list(intents), top_k)
+
+        payload = self._run(driver, self._doc_id, self._gen)
+        if not payload:
+            self.invalidate()
+            return []
+
+        if payload.get('unchanged'):
+            self.cache_hits += 1
+            return list(self._elements.values())
+
+        if payload.get('full'):
+            self.full_scrapes += 1
+            self._elements = {}
+        else:
+            self.incremental_scrapes += 1
+            for sid in payload.get('dropped', []):
+                self._elements.pop(sid, None)
+
+        for el in payload['elements']:
+            self._elements[el['sid']] = el
+        self.version += 1
+        self.elements_transferred += len(payload['elements'])
+        self._doc_id, self._gen = payload['docId'], payload['gen']
+        return list(self._elements.values())
+
+    def _query(self, driver, intents, top_k):
+        key = (tuple(intents), top_k)
+        doc_id, gen = self._query_state if key == self._query_key else (None, None)
+        payload = self._run(driver, doc_id, gen, intents, top_k)
+        if not payload:
+            self._query_key = None
+            return []
+
+        if payload.get('unchanged'):
+            self.cache_hits += 1
+            return list(self._query_result)
+
+        self.query_scrapes += 1
+        self.elements_transferred += len(payload['elements'])
+        self._query_key = key
+        self._query_state = (payload['docId'], payload['gen'])
+        self._query_result = payload['elements']
+        return list(self._query_result)
+
+    def stats(self):
+        return {
+            "cache_hits": self.cache_hits,
+            "incremental_scrapes": self.incremental_scrapes,
+            "full_scrapes": self.full_scrapes,
+            "query_scrapes": self.query_scrapes,
+            "elements_transferred": self.elements_transferred,
+            "nodes_visited": self.nodes_visited,
+            "scan_ms": round(self.scan_ms, 1),
+            "capped_scans": self.capped_scans,
+            "cached_elements": len(self._elements)
+        }
@@ -0,0 +1,162 @@
+import hashlib
+import os
+import struct
+import tempfile
+import threading
+from collections import OrderedDict
+import numpy as np
+
+DEFAULT_CACHE_PATH = os.getenv("AI_EMBEDDING_CACHE", os.path.join(os.getcwd(), ".ai_cache", "embeddings.bin"))
+
+MAGIC = b"AIEMBv01"
+HEADER = struct.Struct("<8sI4x")
+KEY_BYTES = 16
+
+
+class EmbeddingCache:
+    """
+    🗃️ CONTENT-ADDRESSED EMBEDDINGS: Wraps any embedder (SpacyEmbedder / WordVectorTable)
+    and remembers vectors by hash(normalized text + model version).
+
+    Tier 1: in-memory LRU bounded by `memory_items`.
+    Tier 2: append-only binary file of fixed-size [key | float32 vector] records;
+            the key column is indexed into a dict when the file is opened.
+    Misses are embedded in one batch and appended in one write (O_APPEND, so xdist
+    workers can share the file). A partial tail is skipped, never truncated; records
+    written after a torn tail left by a killed worker are not found again (misses
+    only, keys never match misaligned bytes) until the file is deleted.
+    """
+
+    def __init__(self, embedder, path=DEFAULT_CACHE_PATH, memory_items=20000):
+        self.embedder = embedder
+        self.path = path
+        self.memory_items = memory_items
+        self.version = getattr(embedder, 'version', type(embedder).__name__)
+        self._lru = OrderedDict()
+        self._index = {}
+        self._lock = threading.Lock()
+        self._record = KEY_BYTES + 4 * self.width
+
+        # 📊 Counters
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if self.path:
+            self._open_disk_tier()
+
+    @property
+    def width(self):
+        return self.embedder.width
+
+    # --- 💽 DISK TIER ---
+
+    def _create_disk_file(self):
+        """Header-only file, published with os.link so two workers never both create (and wipe) it."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(HEADER.pack(MAGIC, self.width))
+            os.link(tmp, self.path)
+        except FileExistsError:
+            pass
+        finally:
+            os.remove(tmp)
+
+    def _open_disk_tier(self):
+        if not os.path.exists(self.path):
+            self._create_disk_file()
+
+        with open(self.path, 'rb') as f:
+            header = f.read(HEADER.size)
+        magic, width = HEADER.unpack(header) if len(header) == HEADER.size else (None, None)
+        if magic != MAGIC or width != self.width:
+            print(f"⚠️ Embedding cache {self.path} has another layout ({width}d), disk tier disabled")
+            self.path = None
+            return
+
+        # Only whole records are indexed. A partial tail is another worker's append in flight
+        # (or a killed worker's leftover): never truncate a file other processes append to
+        count = (os.path.getsize(self.path) - HEADER.size) // self._record
+        if count:
+            records = np.memmap(self.path, dtype=np.uint8, mode='r', offset=HEADER.size,
+                                shape=(count, self._record))
+            for i, key in enumerate(records[:, :KEY_BYTES]):
+                self._index[key.tobytes()] = HEADER.size + i * self._record + KEY_BYTES
+            del records
+
+    def _read_disk(self, offset):
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            return np.frombuffer(f.read(4 * self.width), dtype=np.float32).copy()
+
+    def _append_disk(self, items):
+        # O_APPEND + one write per batch keeps records whole when several workers share the file
+        payload = b"".join(key + vec.astype(np.float32).tobytes() for key, vec in items)
+        with open(self.path, 'ab') as f:
+            f.write(payload)
+            f.flush()
+            start = f.tell() - len(payload)
+        for i, (key, _) in enumerate(items):
+            self._index[key] = start + i * self._record + KEY_BYTES
+
+    # --- 🧬 EMBEDDER CONTRACT ---
+
+    @staticmethod
+    def normalize(text):
+        # Whitespace only rescales spaCy's mean vector, so collapsing it never moves a cosine
+        return " ".join(text.lower().split())
+
+    def _key(self, text):
+        return hashlib.blake2b(f"{self.version}\0{text}".encode('utf-8'), digest_size=KEY_BYTES).digest()
+
+    def _remember(self, key, vec):
+        self._lru[key] = vec
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.memory_items:
+            self._lru.popitem(last=False)
+
+    def vectors(self, texts):
+        out = np.zeros((len(texts), self.width), dtype=np.float32)
+        missing = {}
+        with self._lock:
+            for i, text in enumerate(texts):
+                norm = self.normalize(text)
+                key = self._key(norm)
+                vec = self._lru.get(key)
+                if vec is not None:
+                    self._lru.move_to_end(key)
+                    self.memory_hits += 1
+                elif key in self._index:
+                    vec = self._read_disk(self._index[key])
+                    self._remember(key, vec)
+                    self.disk_hits += 1
+                else:
+                    missing.setdefault(norm, (key, []))[1].append(i)
+                    continue
+                out[i] = vec
+
+            if missing:
+                fresh = self.embedder.vectors(list(missing))
+                appended = []
+                for (key, rows), vec in zip(missing.values(), fresh):
+                    out[rows] = vec
+                    self._remember(key, vec)
+                    appended.append((key, vec))
+                self.misses += sum(len(rows) for _, rows in missing.values())
+                if self.path:
+                    self._append_disk(appended)
+        return out
+
+    def stats(self):
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+            "memory_items": len(self._lru),
+            "disk_items": len(self._index)
+        }
@@ -2,6 +2,7 @@ import time
 import os
 from selenium import webdriver
 from utilities.ai_engine import AIAutomationFramework
+from utilities.readiness import READINESS_REPORT, wait_until_ready
 # from utilities.engine_runner import SparkAssistRunner
 
 
@@ -23,7 +24,7 @@ def run_accelerated_discovery():
         url = "https://opensource-demo.orangehrmlive.com/web/index.php/auth/login"
         print(f"--- 1. Navigating to {url} ---")
         driver.get(url)
-        time.sleep(5)
+        wait_until_ready(driver, baseline=5, label="orangehrm login")
 
         # Step 2: Define the BDD requirement and the Prompt
         # In standalone mode, we manually define the # prompt you'd usually have in the feature file
@@ -44,7 +45,9 @@ def run_accelerated_discovery():
             metadata = ai_engine.get_step_metadata(step)
             if metadata:
                 all_mappings.extend(metadata)
-            time.sleep(1)  # Brief pause for visual highlight audit
+            ai_engine.capture_audit(step)
+            if ai_engine.audit.live:
+                time.sleep(1)  # Brief pause for visual highlight audit
 
         # Step 3: Send consolidated data to Spark Assist
         print(f"--- 3. Connecting to Spark Assist for final code generation ---")
@@ -66,6 +69,8 @@ def run_accelerated_discovery():
         # print(generated_code)
         print("-" * 60)
 
+        print("\n".join(READINESS_REPORT.lines()))
+        ai_engine.render_audit()
         print("\n💡 Check the 'logs' folder for visual audit screenshots.")
         time.sleep(5)
 
@@ -0,0 +1,61 @@
+import numpy as np
+from rapidfuzz import fuzz, process
+from rapidfuzz.utils import default_process
+
+# thefuzz's token_* scorers run full_process(force_ascii=True) on both sides first
+_ASCII_ONLY = {i: None for i in range(128, 256)}
+
+
+def _thefuzz_full_process(text):
+    return default_process(text.translate(_ASCII_ONLY))
+
+
+# name -> (rapidfuzz scorer, preprocessing thefuzz applies before it)
+SCORERS = {
+    "partial_ratio": (fuzz.partial_ratio, None),
+    "token_sort_ratio": (fuzz.token_sort_ratio, _thefuzz_full_process),
+    "ratio": (fuzz.ratio, None),
+}
+
+
+def fuzzy_scores(queries, choices, scorer="partial_ratio", workers=1):
+    """
+    ⚡ BATCHED FUZZY KERNEL: len(queries) x len(choices) score matrix from one native
+    rapidfuzz cdist call. Scores equal thefuzz.fuzz.<scorer>(query, choice) exactly
+    (same preprocessing, same int(round()) rounding), returned as float64.
+    """
+    if not len(queries) or not len(choices):
+        return np.zeros((len(queries), len(choices)), dtype=np.float64)
+    score_fn, prepare = SCORERS[scorer]
+    queries = [str(q) for q in queries]
+    choices = [str(c) for c in choices]
+    if prepare:
+        queries = [prepare(q) for q in queries]
+        choices = [prepare(c) for c in choices]
+    scores = process.cdist(queries, choices, scorer=score_fn, dtype=np.float64, workers=workers)
+    # thefuzz returns int(round(x)): Python rounds half to even, and so does np.rint
+    return np.rint(scores)
+
+
+def weighted_attribute_scores(query, elements, weights, workers=1):
+    """
+    sum(partial_ratio(query, el[attr]) * weight) over the attributes each element has,
+    from ONE cdist call over the distinct attribute values of the whole page.
+    """
+    rows, texts, factors = [], [], []
+    for attr, weight in weights.items():
+        column = [el.get(attr) for el in elements]
+        present = [i for i, value in enumerate(column) if value]  # missing attributes add nothing
+        rows.extend(present)
+        texts.extend([str(column[i]).lower() for i in present])
+        factors.extend([weight] * len(present))
+
+    totals = np.zeros(len(elements), dtype=np.float64)
+    if not texts:
+        return totals
+    distinct = {text: j for j, text in enumerate(dict.fromkeys(texts))}
+    scores = fuzzy_scores([query], list(distinct), workers=workers)[0]
+    terms = scores[[distinct[t] for t in texts]] * np.array(factors, dtype=np.float64)
+    # Unbuffered, in attribute order: each element's terms are added exactly like the legacy sum()
+    np.add.at(totals, np.array(rows, dtype=np.intp), terms)
+    return totals
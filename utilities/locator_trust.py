@@ -0,0 +1,96 @@
+import os
+import time
+
+# Off by default: trusted locators must be confirmed before acting (AIAutomationFramework.confirm_many)
+DEFAULT_TRUST_TTL = float(os.getenv("AI_TRUST_TTL", "0"))
+
+
+class LocatorTrust:
+    """
+    🤝 TTL TRUST POLICY: Remembers which cached XPaths were verified in this session,
+    when, and at which DOM generation (utilities.dom_snapshot). A remembered locator
+    is used without a validation roundtrip while:
+      - the page has been observed at the SAME generation since it was verified, or
+      - it was verified less than ttl seconds ago.
+    The DOM state is what the LAST scrape reported, not the live page: a navigation
+    revokes trust only once a scrape has seen the new document. Trusted locators are
+    therefore never final; confirm them (AIAutomationFramework.confirm_many) before acting.
+
+    ttl=0 disables trust (every lookup is validated, the legacy behaviour);
+    per_context overrides the ttl per page context, e.g. {"dashboard": 5}.
+    """
+
+    def __init__(self, ttl=DEFAULT_TRUST_TTL, per_context=None):
+        self.ttl = ttl
+        self.per_context = dict(per_context or {})
+        self._verified = {}
+
+        # 📊 Counters
+        self.trusted_ttl = 0
+        self.trusted_generation = 0
+        self.skips = 0
+        self.revoked = 0
+        self.confirmations = 0
+        self.confirmation_batches = 0
+        self.confirm_failures = 0
+
+    def ttl_for(self, page_context):
+        return self.per_context.get(page_context, self.ttl)
+
+    def verified(self, page_context, xpath, dom_state=None):
+        """Stamps a locator that just passed validation (or was just healed)."""
+        doc_id, gen = (dom_state or (None, None, None))[:2]
+        self._verified[(page_context, xpath)] = (time.monotonic(), doc_id, gen)
+
+    def revoke(self, page_context, xpath):
+        if self._verified.pop((page_context, xpath), None):
+            self.revoked += 1
+
+    def trusted(self, page_context, xpath, dom_state=None):
+        """True when `xpath` may skip validation. dom_state = DomSnapshotCache.generation()."""
+        ttl = self.ttl_for(page_context)
+        stamp = self._verified.get((page_context, xpath))
+        if not ttl or not stamp:
+            return False
+        verified_at, doc_id, gen = stamp
+        if dom_state and doc_id is not None:
+            seen_doc, seen_gen, seen_at = dom_state
+            if seen_doc != doc_id:
+                # Navigated since the locator was verified
+                self.revoke(page_context, xpath)
+                return False
+            if seen_gen == gen and seen_at >= verified_at:
+                self.trusted_generation += 1
+                return True
+        if time.monotonic() - verified_at <= ttl:
+            self.trusted_ttl += 1
+            return True
+        return False
+
+    def skipped(self, roundtrips):
+        self.skips += roundtrips
+
+    def confirmed(self, locators):
+        """One confirmation roundtrip for `locators` trusted locators: it spends a roundtrip a skip saved."""
+        self.confirmations += locators
+        self.confirmation_batches += 1
+
+    def failed(self):
+        """A trusted locator that did not survive its confirmation."""
+        self.confirm_failures += 1
+
+    def roundtrips_avoided(self):
+        # Net: a skip followed by a confirmation saved nothing
+        return self.skips - self.confirmation_batches
+
+    def stats(self):
+        return {
+            "ttl": self.ttl,
+            "trusted_ttl": self.trusted_ttl,
+            "trusted_generation": self.trusted_generation,
+            "roundtrips_avoided": self.roundtrips_avoided(),
+            "revoked": self.revoked,
+            "confirmations": self.confirmations,
+            "confirm_failures": self.confirm_failures,
+            "tracked": len(self._verified)
+        }
@@ -0,0 +1,192 @@
+BULK_VALIDATE_JS = """
+    const [xpaths, color, wantRects] = arguments;
+    const rects = [];
+    const statuses = xpaths.map(xp => {
+        rects.push(null);
+        let el;
+        try {
+            el = document.evaluate(xp, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        } catch (e) { return 'invalid'; }
+        if (!el || el.nodeType !== 1) return 'missing';
+
+        const style = window.getComputedStyle(el);
+        if (!el.getClientRects().length || style.visibility === 'hidden' || style.display === 'none') return 'hidden';
+
+        if (wantRects) {
+            const r = el.getBoundingClientRect();
+            rects[rects.length - 1] = { x: r.left, y: r.top, width: r.width, height: r.height };
+        }
+
+        if (color) {
+            // Same non-destructive X-RAY as AIAutomationFramework.highlight, minus the extra roundtrip
+            const originalBorder = el.style.border;
+            el.style.border = '3px solid ' + color;
+            el.style.backgroundColor = 'rgba(255, 165, 0, 0.1)';
+            setTimeout(() => { el.style.border = originalBorder; el.style.backgroundColor = ''; }, 1500);
+        }
+        return 'ok';
+    });
+    return wantRects ? { statuses: statuses, rects: rects } : statuses;
+"""
+
+
+class BulkLocatorValidator:
+    """
+    ✅ ONE-ROUNDTRIP VALIDATION: Checks a whole batch of cached XPaths with a single
+    execute_script (document.evaluate + visibility) instead of find_element,
+    is_displayed and highlight per locator. Status per XPath: ok | hidden | missing | invalid.
+    """
+
+    def __init__(self):
+        self.batches = 0
+        self.checked = 0
+        self.stale = 0
+
+    def validate(self, driver, xpaths, highlight_color=None, audit=None):
+        """`audit` (VisualAudit) decides whether the color is painted live or recorded as rects."""
+        if not xpaths:
+            return []
+        xpaths = list(xpaths)
+        statuses = self._run(driver, xpaths, highlight_color, audit)
+        self.batches += 1
+        self.checked += len(xpaths)
+        self.stale += sum(1 for s in statuses if s != 'ok')
+        return statuses
+
+    def highlight(self, driver, xpaths, highlight_color, audit=None):
+        """Paints elements that were just found; not a validation, so the counters stay put."""
+        if audit and not (audit.live or audit.recording):
+            return
+        if xpaths:
+            self._run(driver, list(xpaths), highlight_color, audit)
+
+    @staticmethod
+    def _run(driver, xpaths, highlight_color, audit):
+        want_rects = bool(audit and audit.recording and highlight_color)
+        paint = audit.color(highlight_color) if audit else highlight_color
+        try:
+            result = driver.execute_script(BULK_VALIDATE_JS, xpaths, paint, want_rects)
+        except Exception:
+            result = ['missing'] * len(xpaths)
+
+        statuses = result
+        if isinstance(result, dict):
+            statuses = result['statuses']
+            audit.mark(result['rects'], highlight_color, xpaths)
+        return statuses
+
+    def roundtrips_saved(self):
+        # Legacy path: find_element + is_displayed + highlight per locator
+        return max(0, self.checked * 3 - self.batches)
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "checked": self.checked,
+            "stale": self.stale,
+            "roundtrips_saved": self.roundtrips_saved()
+        }
+
+
+STRATEGY_PROBE_JS = """
+    // __aiProbe: every strategy of every candidate, resolved the way Selenium's By would
+    const [candidates] = arguments;
+    const quote = v => '"' + CSS.escape(v) + '"';
+    function resolve(by, value) {
+        switch (by) {
+            case 'id': return document.querySelectorAll('[id=' + quote(value) + ']');
+            case 'name': return document.querySelectorAll('[name=' + quote(value) + ']');
+            case 'css selector': return document.querySelectorAll(value);
+            case 'class name': return document.getElementsByClassName(value);
+            case 'tag name': return document.getElementsByTagName(value);
+            case 'xpath': {
+                const snap = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+                const nodes = [];
+                for (let i = 0; i < snap.snapshotLength; i++) {
+                    if (snap.snapshotItem(i).nodeType === 1) nodes.push(snap.snapshotItem(i));
+                }
+                return nodes;
+            }
+        }
+        throw new Error('unsupported strategy ' + by);
+    }
+    function usable(el) {
+        const style = window.getComputedStyle(el);
+        return el.getClientRects().length > 0 && style.visibility !== 'hidden' && style.display !== 'none' && !el.disabled;
+    }
+    return candidates.map(strategies => strategies.map(([by, value]) => {
+        let found;
+        try { found = Array.from(resolve(by, value)); } catch (e) { return { count: 0, visible: 0, invalid: true }; }
+        const hit = found.find(usable) || null;
+        const r = hit ? hit.getBoundingClientRect() : null;
+        return {
+            count: found.length, visible: found.filter(usable).length, element: hit,
+            rect: r ? { x: r.left, y: r.top, width: r.width, height: r.height } : null
+        };
+    }));
+"""
+
+
+class StrategyVerifier:
+    """
+    🎯 ONE-CALL WATERFALL: Probes every locator strategy of the top `top_k` candidates
+    with a single execute_script (match count, visible + enabled count, first usable
+    element) instead of a WebDriverWait per strategy, so misses cost nothing.
+    The pick is the first unique, usable strategy in score order; a usable but
+    ambiguous one is only taken when the batch has no unique one.
+    """
+
+    def __init__(self, top_k=5):
+        self.top_k = top_k
+        self.batches = 0
+        self.probed = 0
+        self.unique_picks = 0
+        self.ambiguous_picks = 0
+
+    def probe(self, driver, candidates):
+        """candidates: [[(By, value), ...], ...] -> the same shape of {count, visible, element, rect} dicts."""
+        payload = [[[by, value] for by, value in strategies] for strategies in candidates]
+        try:
+            results = driver.execute_script(STRATEGY_PROBE_JS, payload)
+        except Exception:
+            results = None
+        if not isinstance(results, list) or len(results) != len(payload):
+            results = [[{"count": 0, "visible": 0, "invalid": True} for _ in strategies] for strategies in payload]
+        self.batches += 1
+        self.probed += sum(len(strategies) for strategies in payload)
+        return results
+
+    def pick(self, driver, candidates, unique=True):
+        """
+        (candidate index, (By, value), probe) for the best usable strategy, or None.
+        Candidates are probed top_k at a time, so a page whose best guesses all miss
+        still costs one roundtrip per top_k candidates.
+        """
+        for start in range(0, len(candidates), self.top_k):
+            batch = candidates[start:start + self.top_k]
+            if not any(batch):
+                continue
+            results = self.probe(driver, batch)
+            usable = [(start + i, strategy, found)
+                      for i, (strategies, probes) in enumerate(zip(batch, results))
+                      for strategy, found in zip(strategies, probes) if found.get("visible")]
+            if not usable:
+                continue
+            choice = next((c for c in usable if c[2].get("count") == 1), None) if unique else None
+            choice = choice or usable[0]
+            if choice[2].get("count") == 1:
+                self.unique_picks += 1
+            else:
+                self.ambiguous_picks += 1
+            return choice
+        return None
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "strategies_probed": self.probed,
+            "unique_picks": self.unique_picks,
+            "ambiguous_picks": self.ambiguous_picks,
+            # Legacy path: one WebDriverWait (1.2-2 s on a miss) per strategy
+            "roundtrips_saved": max(0, self.probed - self.batches)
+        }
@@ -0,0 +1,300 @@
+import atexit
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+
+SQLITE_EXTENSIONS = ('.db', '.sqlite', '.sqlite3')
+
+
+def _entry(meta):
+    return {
+        "xpath": meta['xpath'],
+        "tag": meta['tag'],
+        "component_type": meta.get('component_type', 'BUTTON'),
+        "class": meta.get('class', ''),
+        "last_verified": time.strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+
+class MemoryBackend(ABC):
+    """
+    🧩 PLUGGABLE MEMORY: The contract every locator memory backend honours.
+    Entries are namespaced as {page_context: {intent: meta}}; lookups try the
+    page context first and fall back to 'common'.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.RLock()
+
+        # 📊 Counters for the run summary
+        self.hits = 0
+        self.misses = 0
+        self.heals = 0
+        self.flushes = 0
+
+    @abstractmethod
+    def snapshot(self):
+        """Full namespaced view: {page_context: {intent: meta}}."""
+
+    @abstractmethod
+    def lookup(self, intent, page_context="common"):
+        """Page context first, then 'common'. Returns the stored meta or None."""
+
+    @abstractmethod
+    def record_heal(self, intent, meta, page_context="common"):
+        """Stores a freshly discovered locator; returns the stored entry."""
+
+    def flush(self):
+        return 0
+
+    def close(self):
+        pass
+
+    def pending(self):
+        return 0
+
+    def _count(self, meta):
+        if meta is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return meta
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "heals": self.heals,
+            "flushes": self.flushes,
+            "pending": self.pending(),
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+
+class JsonMemoryStore(MemoryBackend):
+    """
+    🧠 WRITE-BEHIND MEMORY: Loads ai_ui_memory.json once per session and serves
+    lookups from a dict. Healed entries are marked dirty and written in batches
+    (scenario end, timer or exit) with an atomic temp-file-and-rename.
+    """
+
+    def __init__(self, path, flush_interval=None):
+        super().__init__(path)
+        self.flush_interval = flush_interval
+        self._data = None
+        self._dirty = {}
+        self._timer = None
+
+        atexit.register(self.close)
+
+    # --- 📖 READ PATH ---
+
+    def _read_disk(self):
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r') as f:
+                    return json.load(f)
+            except Exception:
+                return {}
+        return {}
+
+    def _loaded(self):
+        if self._data is None:
+            self._data = self._read_disk()
+        return self._data
+
+    def snapshot(self):
+        """Full namespaced view ({page: {intent: meta}}) as currently held in memory."""
+        with self._lock:
+            return {ctx: dict(entries) for ctx, entries in self._loaded().items()}
+
+    def lookup(self, intent, page_context="common"):
+        """Page context first, then 'common'. Returns the stored meta or None."""
+        key = intent.lower()
+        with self._lock:
+            data = self._loaded()
+            for ctx in (page_context, "common"):
+                if ctx in data and key in data[ctx]:
+                    return self._count(data[ctx][key])
+            return self._count(None)
+
+    # --- ✍️ WRITE PATH ---
+
+    def record_heal(self, intent, meta, page_context="common"):
+        """Stores a freshly discovered locator and queues it for the next flush."""
+        entry = _entry(meta)
+        key = intent.lower()
+        with self._lock:
+            self._loaded().setdefault(page_context, {})[key] = entry
+            self._dirty[(page_context, key)] = entry
+            self.heals += 1
+            self._schedule_flush()
+        return entry
+
+    def _schedule_flush(self):
+        if not self.flush_interval or self._timer is not None:
+            return
+        self._timer = threading.Timer(self.flush_interval, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def flush(self):
+        """Merges dirty entries into the file on disk in one atomic write."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return 0
+
+            # Re-read so entries healed by another process since our load survive
+            on_disk = self._read_disk()
+            for (ctx, key), entry in self._dirty.items():
+                on_disk.setdefault(ctx, {})[key] = entry
+
+            folder = os.path.dirname(os.path.abspath(self.path))
+            fd, tmp_path = tempfile.mkstemp(prefix=".ai_memory_", suffix=".tmp", dir=folder)
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(on_disk, f, indent=4)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+            written = len(self._dirty)
+            self._dirty.clear()
+            self._data = on_disk
+            self.flushes += 1
+            return written
+
+    def close(self):
+        try:
+            self.flush()
+        except Exception:
+            pass
+
+    def pending(self):
+        return len(self._dirty)
+
+
+class SqliteMemoryStore(MemoryBackend):
+    """
+    🗄️ SHARED MEMORY: SQLite backend that stays consistent when several
+    pytest-xdist workers heal at once. WAL mode lets readers run alongside the
+    writer, and every heal is a single-row upsert committed immediately.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS locators (
+            page_context   TEXT NOT NULL,
+            intent         TEXT NOT NULL,
+            xpath          TEXT NOT NULL,
+            tag            TEXT,
+            component_type TEXT,
+            class          TEXT,
+            last_verified  TEXT,
+            PRIMARY KEY (page_context, intent)   -- the (page_context, intent) lookup index
+        ) WITHOUT ROWID;
+    """
+    COLUMNS = ("xpath", "tag", "component_type", "class", "last_verified")
+
+    UPSERT = """
+        INSERT INTO locators (page_context, intent, xpath, tag, component_type, class, last_verified)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (page_context, intent) DO UPDATE SET
+            xpath = excluded.xpath, tag = excluded.tag, component_type = excluded.component_type,
+            class = excluded.class, last_verified = excluded.last_verified
+    """
+
+    def __init__(self, path, busy_timeout=5.0):
+        super().__init__(path)
+        # Autocommit: each heal is its own short transaction, so writers never queue behind us
+        self._conn = sqlite3.connect(path, timeout=busy_timeout, isolation_level=None,
+                                     check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+
+    def _row(self, page_context, key, entry):
+        return (page_context, key) + tuple(entry.get(c, '') for c in self.COLUMNS)
+
+    def snapshot(self):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT page_context, intent, xpath, tag, component_type, class, last_verified FROM locators"
+            ).fetchall()
+        memory = {}
+        for ctx, intent, *values in rows:
+            memory.setdefault(ctx, {})[intent] = dict(zip(self.COLUMNS, values))
+        return memory
+
+    def lookup(self, intent, page_context="common"):
+        """Page context then common, resolved by one indexed query."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT xpath, tag, component_type, class, last_verified FROM locators "
+                "WHERE intent = ? AND page_context IN (?, 'common') "
+                "ORDER BY page_context = ? DESC LIMIT 1",
+                (intent.lower(), page_context, page_context)
+            ).fetchone()
+            return self._count(dict(zip(self.COLUMNS, row)) if row else None)
+
+    def record_heal(self, intent, meta, page_context="common"):
+        entry = _entry(meta)
+        with self._lock:
+            self._conn.execute(self.UPSERT, self._row(page_context, intent.lower(), entry))
+            self.heals += 1
+        return entry
+
+    def import_json(self, json_path):
+        """One-shot import of the namespaced ai_ui_memory.json layout. Newer rows win."""
+        with open(json_path, 'r') as f:
+            memory = json.load(f)
+        rows = [self._row(ctx, intent.lower(), meta)
+                for ctx, entries in memory.items() for intent, meta in entries.items()
+                if meta.get('xpath')]
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    self.UPSERT + " WHERE excluded.last_verified >= locators.last_verified", rows)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def open_memory_store(path, backend=None, **options):
+    """Factory: picks the backend from `backend` ('json'/'sqlite') or the file extension."""
+    backend = backend or ('sqlite' if path.lower().endswith(SQLITE_EXTENSIONS) else 'json')
+    if backend == 'sqlite':
+        return SqliteMemoryStore(path)
+    if backend == 'json':
+        return JsonMemoryStore(path, flush_interval=options.get('flush_interval'))
+    raise ValueError(f"Unknown memory backend: {backend}")
+
+
+if __name__ == "__main__":
+    # python -m utilities.memory_store ai_ui_memory.json ai_ui_memory.db
+    if len(sys.argv) != 3:
+        sys.exit("usage: python -m utilities.memory_store <ai_ui_memory.json> <target.db>")
+    store = SqliteMemoryStore(sys.argv[2])
+    print(f"✅ Imported {store.import_json(sys.argv[1])} locators into {sys.argv[2]}")
+    store.close()
@@ -0,0 +1,265 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+import numpy as np
+
+DEFAULT_OCR_CACHE_DIR = os.getenv("AI_OCR_CACHE", os.path.join(os.getcwd(), ".ai_cache", "ocr"))
+# Differing dHash bits still counted as the same frame (0 = perceptually identical only)
+DEFAULT_TOLERANCE = int(os.getenv("AI_OCR_CACHE_TOLERANCE", "0"))
+HASH_SIZE = 32
+
+
+def _block_mean(gray, rows, cols):
+    """Area-average downscale to rows x cols (numpy only, no OpenCV needed)."""
+    h, w = gray.shape
+    r = np.linspace(0, h, rows + 1).astype(np.intp)[:-1]
+    c = np.linspace(0, w, cols + 1).astype(np.intp)[:-1]
+    sums = np.add.reduceat(np.add.reduceat(gray, r, axis=0), c, axis=1)
+    counts = np.outer(np.diff(np.append(r, h)), np.diff(np.append(c, w)))
+    return sums / counts
+
+
+def frame_hash(image, size=HASH_SIZE):
+    """
+    Perceptual difference hash (dHash) of a decoded frame: size x size bits saying whether
+    each block is brighter than its right neighbour. A caret blink or anti-aliasing jitter
+    leaves it (nearly) unchanged; real content changes flip bits.
+    Frames smaller than the hash grid fall back to an exact content digest.
+    """
+    h, w = image.shape[:2]
+    if h < size or w < size + 1:
+        return hashlib.blake2b(np.ascontiguousarray(image).tobytes(), digest_size=size * size // 8).digest()
+    step = max(1, min(h, w) // (size * 8))  # plenty of pixels per block either way
+    gray = image[::step, ::step].astype(np.float32)
+    if gray.ndim == 3:
+        gray = gray.mean(axis=2)
+    small = _block_mean(gray, size, size + 1)
+    return np.packbits(small[:, 1:] > small[:, :-1]).tobytes()
+
+
+def _hamming(a, b):
+    return int(np.unpackbits(np.bitwise_xor(np.frombuffer(a, np.uint8), np.frombuffer(b, np.uint8))).sum())
+
+
+def _plain(results):
+    """EasyOCR output (numpy ints/floats inside) -> JSON-safe lists."""
+    return [[[[float(x), float(y)] for x, y in bbox], str(text), float(prob)] for bbox, text, prob in results]
+
+
+class OcrResultCache:
+    """
+    🖼️ SCREENSHOT-FINGERPRINT CACHE: OCR results keyed by (URL, frame size, dHash), so
+    pixel-identical pages (e.g. Scenario Outline rows) reuse their OCR results.
+    Tier 1: in-memory LRU of `memory_items` frames.
+    Tier 2: one JSON file per frame under `path`, evicted oldest-used first once the
+            directory passes `max_disk_bytes`. Files are written atomically, so xdist
+            workers can share the directory.
+    `tolerance` > 0 also reuses frames whose hash differs in at most that many bits.
+    """
+
+    def __init__(self, path=DEFAULT_OCR_CACHE_DIR, tolerance=DEFAULT_TOLERANCE, memory_items=64,
+                 max_disk_bytes=50 * 2 ** 20, include_url=True):
+        self.path = path
+        self.tolerance = tolerance
+        self.memory_items = memory_items
+        self.max_disk_bytes = max_disk_bytes
+        self.include_url = include_url
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes = None
+
+        # 📊 Counters
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _bucket(self, image, url):
+        scope = url if self.include_url and url else ""
+        digest = hashlib.blake2b(scope.encode('utf-8'), digest_size=6).hexdigest()
+        return f"{digest}_{image.shape[1]}x{image.shape[0]}"
+
+    # --- 💽 DISK TIER ---
+
+    def _file(self, bucket, fingerprint):
+        # The hash itself is stored inside the file; the name only needs to be unique
+        digest = hashlib.blake2b(fingerprint, digest_size=10).hexdigest()
+        return os.path.join(self.path, f"{bucket}_{digest}.json")
+
+    def _load(self, path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            return bytes.fromhex(entry["fingerprint"]), entry["results"]
+        except (OSError, ValueError, KeyError):
+            return None, None
+
+    def _disk_candidates(self, bucket):
+        """Fingerprints stored for this URL + frame size (only read when tolerance > 0)."""
+        try:
+            names = os.listdir(self.path)
+        except OSError:
+            return []
+        prefix = bucket + "_"
+        found = (self._load(os.path.join(self.path, n))[0] for n in names
+                 if n.startswith(prefix) and n.endswith(".json"))
+        return [fp for fp in found if fp is not None]
+
+    def _read_disk(self, bucket, fingerprint):
+        path = self._file(bucket, fingerprint)
+        stored, results = self._load(path)
+        if stored != fingerprint:
+            return None
+        try:
+            os.utime(path)  # recently used: evicted last
+        except OSError:
+            pass
+        return results
+
+    def _write_disk(self, bucket, fingerprint, results):
+        os.makedirs(self.path, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({"fingerprint": fingerprint.hex(), "results": results}, f)
+        os.replace(tmp, self._file(bucket, fingerprint))
+        if self._disk_bytes is None:
+            self._disk_bytes = sum(os.path.getsize(os.path.join(self.path, n)) for n in os.listdir(self.path))
+        else:
+            self._disk_bytes += os.path.getsize(self._file(bucket, fingerprint))
+        if self._disk_bytes > self.max_disk_bytes:
+            self._evict()
+
+    def _evict(self):
+        entries = []
+        for name in os.listdir(self.path):
+            full = os.path.join(self.path, name)
+            try:
+                entries.append((os.path.getmtime(full), os.path.getsize(full), full))
+            except OSError:
+                continue
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        budget = self.max_disk_bytes * 0.8  # some headroom, so every write does not evict
+        for _, size, full in entries:
+            if total <= budget:
+                break
+            try:
+                os.remove(full)
+                total -= size
+                self.evictions += 1
+            except OSError:
+                pass
+        self._disk_bytes = total
+
+    # --- 🔎 LOOKUP ---
+
+    def _nearest(self, fingerprint, candidates):
+        best, best_distance = None, self.tolerance + 1
+        for other in candidates:
+            if len(other) != len(fingerprint):
+                continue
+            distance = _hamming(fingerprint, other)
+            if distance < best_distance:
+                best, best_distance = other, distance
+        return best
+
+    def key(self, image, url=""):
+        return self._bucket(image, url), frame_hash(image)
+
+    def get(self, image, url="", key=None):
+        """Cached OCR results for this frame, or None."""
+        bucket, fingerprint = key = key or self.key(image, url)
+        with self._lock:
+            if key in self._lru:
+                self._lru.move_to_end(key)
+                self.memory_hits += 1
+                return self._lru[key]
+            if self.tolerance:
+                near = self._nearest(fingerprint, [fp for b, fp in self._lru if b == bucket])
+                if near is not None:
+                    self.near_hits += 1
+                    self.memory_hits += 1
+                    return self._lru[(bucket, near)]
+            if self.path:
+                near = fingerprint
+                if self.tolerance and not os.path.exists(self._file(bucket, fingerprint)):
+                    near = self._nearest(fingerprint, self._disk_candidates(bucket))
+                results = self._read_disk(bucket, near) if near is not None else None
+                if results is not None:
+                    if near != fingerprint:
+                        self.near_hits += 1
+                    self.disk_hits += 1
+                    self._remember((bucket, fingerprint), results)
+                    return results
+            self.misses += 1
+            return None
+
+    def put(self, image, results, url="", key=None):
+        bucket, fingerprint = key or self.key(image, url)
+        results = _plain(results)
+        with self._lock:
+            self._remember((bucket, fingerprint), results)
+            if self.path:
+                try:
+                    self._write_disk(bucket, fingerprint, results)
+                except OSError as e:
+                    print(f"⚠️ OCR cache disk tier disabled: {e}")
+                    self.path = None
+        return results
+
+    def _remember(self, key, results):
+        self._lru[key] = results
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.memory_items:
+            self._lru.popitem(last=False)
+
+    def readtext(self, ocr, image, url="", **kwargs):
+        """ocr.readtext(image) through the cache."""
+        key = self.key(image, url)
+        results = self.get(image, key=key)
+        if results is None:
+            results = self.put(image, ocr.readtext(image, **kwargs), key=key)
+        return results
+
+    def stats(self):
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "near_hits": self.near_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+            "memory_items": len(self._lru),
+            "evictions": self.evictions,
+            "tolerance": self.tolerance
+        }
+
+
+class CachedOcr:
+    """Drop-in for OcrService.readtext that goes through an OcrResultCache (scoped to `url`)."""
+
+    def __init__(self, ocr, cache, url=""):
+        self.ocr = ocr
+        self.cache = cache
+        self.url = url
+
+    def readtext(self, image, **kwargs):
+        return self.cache.readtext(self.ocr, image, self.url, **kwargs)
+
+
+def page_reader(ocr, cache, driver):
+    """`ocr` itself when caching is off, otherwise a CachedOcr scoped to the driver's current URL."""
+    if cache is None:
+        return ocr
+    try:
+        url = driver.current_url
+    except Exception:
+        url = ""
+    return CachedOcr(ocr, cache, url)
+
+
+OCR_CACHE = OcrResultCache()
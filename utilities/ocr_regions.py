@@ -0,0 +1,113 @@
+import os
+import numpy as np
+
+# full = whole screenshot; roi = padded candidate rects; band = the horizontal strip they span
+OCR_MODES = ("full", "roi", "band")
+DEFAULT_OCR_MODE = os.getenv("AI_OCR_MODE", "full")
+
+
+def _resize(image, scale):
+    try:
+        import cv2
+        return cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    except ImportError:
+        from PIL import Image
+        h, w = image.shape[:2]
+        size = (max(1, int(w * scale)), max(1, int(h * scale)))
+        return np.asarray(Image.fromarray(image).resize(size, Image.BILINEAR))
+
+
+def _to_frame_box(rect, dpr, pad, width, height):
+    """CSS-pixel DOM rect -> padded [x0, y0, x1, y1] in screenshot pixels, clipped to the frame."""
+    x0 = int((rect['x'] - pad) * dpr)
+    y0 = int((rect['y'] - pad) * dpr)
+    x1 = int(np.ceil((rect['x'] + rect['width'] + pad) * dpr))
+    y1 = int(np.ceil((rect['y'] + rect['height'] + pad) * dpr))
+    return [max(0, x0), max(0, y0), min(width, x1), min(height, y1)]
+
+
+def _merge(boxes, gap):
+    """Unions boxes that overlap or sit within `gap` pixels of each other (repeat until stable)."""
+    boxes = [list(b) for b in boxes]
+    merged = True
+    while merged:
+        merged = False
+        out = []
+        for box in boxes:
+            for other in out:
+                if (box[0] <= other[2] + gap and other[0] <= box[2] + gap and
+                        box[1] <= other[3] + gap and other[1] <= box[3] + gap):
+                    other[:] = [min(box[0], other[0]), min(box[1], other[1]),
+                                max(box[2], other[2]), max(box[3], other[3])]
+                    merged = True
+                    break
+            else:
+                out.append(box)
+        boxes = out
+    return boxes
+
+
+def candidate_regions(rects, frame_shape, dpr=1.0, pad=48, gap=16, mode="roi"):
+    """
+    Screenshot-pixel regions to OCR for these candidate rects: padded and merged
+    boxes ("roi"), or the full-width horizontal band they span ("band").
+    Rects outside the screenshot (below the fold) are skipped.
+    """
+    height, width = frame_shape[:2]
+    boxes = [_to_frame_box(r, dpr, pad, width, height) for r in rects if r and r.get('width') and r.get('height')]
+    boxes = [b for b in boxes if b[2] > b[0] and b[3] > b[1]]
+    if not boxes:
+        return []
+    if mode == "band":
+        return [[0, min(b[1] for b in boxes), width, max(b[3] for b in boxes)]]
+    return _merge(boxes, gap)
+
+
+def read_regions(ocr, image, regions, scale=1.0):
+    """
+    Runs OCR on each region crop (downscaled by `scale` when < 1) and maps every box
+    back to full-screenshot pixels, so results are interchangeable with a full-frame run.
+    """
+    results = []
+    for x0, y0, x1, y1 in regions:
+        crop = image[y0:y1, x0:x1]
+        if scale < 1.0:
+            crop = _resize(crop, scale)
+        for bbox, text, prob in ocr.readtext(np.ascontiguousarray(crop)):
+            results.append(([[x0 + px / scale, y0 + py / scale] for px, py in bbox], text, prob))
+    return results
+
+
+class RegionOcrReport:
+    """
+    📐 ROI TRADEOFF: Per-mode OCR latency, pixel share and anchor hit rate (steps that
+    found their OCR anchor), plus how often ROI/band runs fell back to a full frame
+    because no region held an anchor for any step.
+    """
+
+    def __init__(self):
+        self.runs = {}
+        self.fallbacks = 0
+
+    def record(self, mode, seconds, pixels, frame_pixels, texts, anchors=0, steps=0):
+        run = self.runs.setdefault(mode, {"runs": 0, "seconds": 0.0, "pixels": 0, "frame_pixels": 0,
+                                          "texts": 0, "anchors": 0, "steps": 0})
+        run["runs"] += 1
+        run["seconds"] += seconds
+        run["pixels"] += pixels
+        run["frame_pixels"] += frame_pixels
+        run["texts"] += texts
+        run["anchors"] += anchors
+        run["steps"] += steps
+
+    def stats(self):
+        out = {"fallbacks": self.fallbacks}
+        for mode, run in self.runs.items():
+            out[mode] = {
+                "runs": run["runs"],
+                "mean_ms": round(run["seconds"] * 1000 / run["runs"], 1),
+                "pixel_share": round(run["pixels"] / run["frame_pixels"], 3) if run["frame_pixels"] else 0.0,
+                "texts_per_run": round(run["texts"] / run["runs"], 1),
+                "anchor_rate": round(run["anchors"] / run["steps"], 3) if run["steps"] else None
+            }
+        return out
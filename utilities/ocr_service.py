@@ -0,0 +1,139 @@
+import os
+import threading
+import time
+
+DEFAULT_LANGUAGES = ("en",)
+
+
+def _rss_bytes():
+    """Current resident set size (Linux /proc), falling back to the peak RSS elsewhere."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        try:
+            import resource
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return peak if os.uname().sysname == "Darwin" else peak * 1024
+        except Exception:
+            return 0
+
+
+def _model_bytes(reader):
+    """Parameter + buffer bytes of the detector and recognizer torch modules."""
+    total = 0
+    for name in ("detector", "recognizer"):
+        module = getattr(reader, name, None)
+        try:
+            total += sum(t.numel() * t.element_size() for t in module.parameters())
+            total += sum(t.numel() * t.element_size() for t in module.buffers())
+        except Exception:
+            pass
+    return total
+
+
+class OcrService:
+    """
+    👁️ SHARED OCR: One easyocr.Reader per process (= per xdist worker), built on first
+    use or ahead of time with warm(). Every AIAutomationFramework OCR engine reads through
+    it, so the detection + recognition models load once instead of once per test.
+    Loading and inference are serialized by locks: the torch models are not re-entrant.
+    """
+
+    def __init__(self, languages=DEFAULT_LANGUAGES, gpu=None):
+        self.languages = list(languages)
+        self.gpu = gpu
+        self._reader = None
+        self._load_lock = threading.Lock()
+        self._infer_lock = threading.Lock()
+        self._warmer = None
+
+        # 📊 Counters
+        self.load_s = None
+        self.rss_delta_bytes = None
+        self.model_bytes = None
+        self.calls = 0
+        self.infer_s = 0.0
+        self.waited_s = 0.0
+
+    @property
+    def loaded(self):
+        return self._reader is not None
+
+    @property
+    def reader(self):
+        """The easyocr.Reader, loaded on first access (double-checked, one load per process)."""
+        if self._reader is None:
+            waited = time.perf_counter()
+            with self._load_lock:
+                if self._reader is None:
+                    self._load()
+                else:
+                    # Another thread (e.g. the session warm-up) finished the load while we waited
+                    self.waited_s += time.perf_counter() - waited
+        return self._reader
+
+    def _load(self):
+        import easyocr
+        rss_before = _rss_bytes()
+        started = time.perf_counter()
+        kwargs = {} if self.gpu is None else {"gpu": self.gpu}
+        reader = easyocr.Reader(self.languages, **kwargs)
+        self.load_s = time.perf_counter() - started
+        self.rss_delta_bytes = max(0, _rss_bytes() - rss_before)
+        self.model_bytes = _model_bytes(reader)
+        self._reader = reader
+        print(f"👁️ EasyOCR {self.languages} loaded in {self.load_s:.1f}s "
+              f"(+{self.rss_delta_bytes / 2 ** 20:.0f} MB RSS, {self.model_bytes / 2 ** 20:.0f} MB weights)")
+
+    def warm(self, block=False):
+        """Starts loading the models now; in a background thread unless block=True."""
+        if block:
+            return self.reader
+        with self._load_lock:
+            if self._reader is not None or (self._warmer and self._warmer.is_alive()):
+                return None
+            self._warmer = threading.Thread(target=lambda: self.reader, name="ocr-warmup", daemon=True)
+            self._warmer.start()
+        return None
+
+    def readtext(self, image, **kwargs):
+        """easyocr.Reader.readtext (path, bytes or ndarray), one inference at a time."""
+        reader = self.reader
+        with self._infer_lock:
+            started = time.perf_counter()
+            try:
+                return reader.readtext(image, **kwargs)
+            finally:
+                self.calls += 1
+                self.infer_s += time.perf_counter() - started
+
+    def stats(self):
+        return {
+            "languages": self.languages,
+            "loaded": self.loaded,
+            "load_s": round(self.load_s, 2) if self.load_s is not None else None,
+            "rss_delta_mb": round(self.rss_delta_bytes / 2 ** 20, 1) if self.rss_delta_bytes is not None else None,
+            "model_mb": round(self.model_bytes / 2 ** 20, 1) if self.model_bytes is not None else None,
+            "calls": self.calls,
+            "infer_s": round(self.infer_s, 2),
+            "waited_for_load_s": round(self.waited_s, 2)
+        }
+
+
+_SERVICES = {}
+_SERVICES_LOCK = threading.Lock()
+
+
+def get_ocr_service(languages=DEFAULT_LANGUAGES, gpu=None):
+    """The process-wide OcrService for these languages (created, not loaded, on first call)."""
+    key = (tuple(languages), gpu)
+    with _SERVICES_LOCK:
+        if key not in _SERVICES:
+            _SERVICES[key] = OcrService(languages, gpu)
+        return _SERVICES[key]
+
+
+def loaded_services():
+    with _SERVICES_LOCK:
+        return [service for service in _SERVICES.values() if service.loaded]
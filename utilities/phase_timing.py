@@ -0,0 +1,207 @@
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+import numpy as np
+
+
+class _Span:
+    __slots__ = ("timer", "phase", "counts", "started")
+
+    def __init__(self, timer, phase, counts):
+        self.timer = timer
+        self.phase = phase
+        self.counts = counts
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.timer.record(self.phase, (time.perf_counter() - self.started) * 1000, **self.counts)
+        return False
+
+    def count(self, **counts):
+        """Attach counts known only after the work (elements scraped, intents resolved...)."""
+        self.counts.update(counts)
+
+
+class _NullSpan:
+    """Shared no-op span: with timing off a phase costs one attribute check."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def count(self, **counts):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+# Spans that enclose other phases: reported, but never named as the slow phase of a step
+ENVELOPES = ("step", "resolve", "pipeline")
+
+
+def _stats(rows):
+    ms = np.array([r['ms'] for r in rows], dtype=np.float64)
+    out = {
+        "count": len(rows),
+        "total_ms": round(float(ms.sum()), 3),
+        "p50_ms": round(float(np.percentile(ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(ms, 95)), 3),
+        "max_ms": round(float(ms.max()), 3)
+    }
+    totals = defaultdict(int)
+    for r in rows:
+        for key, value in r['counts'].items():
+            if isinstance(value, (int, float)):
+                totals[key] += value
+    out.update(totals)
+    return out
+
+
+class PhaseTimer:
+    """
+    ⏱️ PER-PHASE SPANS: `with timer.span("scrape") as s: ...; s.count(elements=n)`.
+    Every span is tagged with the current page context and step, so the report can
+    answer "which phase of which step on which page is slow".
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.spans = []
+        self.context = None
+        self.step = None
+
+    def set_scope(self, context=None, step=None):
+        if context is not None:
+            self.context = context
+        if step is not None:
+            self.step = step
+
+    def span(self, phase, **counts):
+        if not self.enabled:
+            return NULL_SPAN
+        return _Span(self, phase, counts)
+
+    def record(self, phase, ms, **counts):
+        if self.enabled:
+            self.spans.append({"phase": phase, "ms": ms, "context": self.context, "step": self.step,
+                               "counts": counts})
+
+    def summary(self):
+        """p50/p95 per phase, per page context and per step."""
+        by_phase = defaultdict(list)
+        by_context = defaultdict(lambda: defaultdict(list))
+        by_step = defaultdict(lambda: defaultdict(list))
+        for s in self.spans:
+            by_phase[s['phase']].append(s)
+            by_context[s['context'] or "common"][s['phase']].append(s)
+            if s['step']:
+                by_step[s['step']][s['phase']].append(s)
+        return {
+            "spans": len(self.spans),
+            "phases": {p: _stats(rows) for p, rows in by_phase.items()},
+            "contexts": {c: {p: _stats(rows) for p, rows in phases.items()} for c, phases in by_context.items()},
+            "steps": {st: {p: _stats(rows) for p, rows in phases.items()} for st, phases in by_step.items()}
+        }
+
+    def write_json(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, indent=4)
+        return path
+
+    def lines(self, slowest_steps=5):
+        summary = self.summary()
+        lines = [f"{'phase':<16}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'total ms':>12}"]
+        for phase, s in sorted(summary['phases'].items(), key=lambda kv: -kv[1]['total_ms']):
+            lines.append(f"{phase:<16}{s['count']:>6}{s['p50_ms']:>10.1f}{s['p95_ms']:>10.1f}{s['total_ms']:>12.1f}")
+        steps = sorted(summary['steps'].items(), key=lambda kv: -max(p['total_ms'] for p in kv[1].values()))
+        for step, phases in steps[:slowest_steps]:
+            inner = [p for p in phases if p not in ENVELOPES] or list(phases)
+            worst = max(inner, key=lambda p: phases[p]['total_ms'])
+            envelope = next((phases[p] for p in ENVELOPES if p in phases), None)
+            total = envelope['total_ms'] if envelope else sum(phases[p]['total_ms'] for p in inner)
+            lines.append(f"🐢 {step[:60]}: {total:.1f} ms (mostly {worst})")
+        return lines
+
+
+# One timer per process; the engine, the scorer and the BDD hooks all report into it
+PHASE_TIMER = PhaseTimer(enabled=os.getenv("AI_PHASE_TIMING", "") == "1")
+
+
+class StageClock:
+    """
+    ⚡ PIPELINE OVERLAP: Wall-clock intervals per stage, from any thread. finish() reports
+    how long the `background` stage (e.g. OCR on a worker thread) ran alongside the
+    foreground stages, as counts on one "pipeline" span of the timer. `waits` are
+    foreground stages that only block on the background one: timed, never overlap.
+    """
+
+    def __init__(self, timer=PHASE_TIMER, background="ocr", waits=("ocr_join",)):
+        self.timer = timer
+        self.background = background
+        self.waits = waits
+        self.started = time.perf_counter()
+        self.intervals = defaultdict(list)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name, **counts):
+        with self.timer.span(name, **counts) as span:
+            began = time.perf_counter()
+            try:
+                yield span
+            finally:
+                with self._lock:
+                    self.intervals[name].append((began, time.perf_counter()))
+
+    def busy_ms(self, name):
+        return sum(end - start for start, end in self.intervals.get(name, ())) * 1000
+
+    def finish(self):
+        wall_ms = (time.perf_counter() - self.started) * 1000
+        with self._lock:
+            background = list(self.intervals.get(self.background, ()))
+            foreground = [iv for name, ivs in self.intervals.items()
+                          if name != self.background and name not in self.waits for iv in ivs]
+        overlap_ms = sum(max(0.0, min(b_end, f_end) - max(b_start, f_start))
+                         for b_start, b_end in background for f_start, f_end in foreground) * 1000
+        report = {"wall_ms": round(wall_ms, 1), "overlap_ms": round(overlap_ms, 1)}
+        report.update({f"{name}_ms": round(self.busy_ms(name), 1) for name in self.intervals})
+        self.timer.record("pipeline", wall_ms, **{k: v for k, v in report.items() if k != "wall_ms"})
+        return report
+
+
+class PhaseTimingPlugin:
+    """🧩 pytest plugin: turns the timer on and reports p50/p95 at session end (JSON + terminal)."""
+
+    def __init__(self, json_path, timer=PHASE_TIMER):
+        self.timer = timer
+        worker = os.getenv("PYTEST_XDIST_WORKER")
+        if worker:
+            root, ext = os.path.splitext(json_path)
+            json_path = f"{root}.{worker}{ext}"
+        self.json_path = json_path
+
+    def pytest_sessionstart(self, session):
+        self.timer.enabled = True
+
+    def pytest_sessionfinish(self, session, exitstatus):
+        if self.timer.spans:
+            self.timer.write_json(self.json_path)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.timer.spans:
+            return
+        terminalreporter.section("AI resolver phase timing")
+        for line in self.timer.lines():
+            terminalreporter.write_line(line)
+        terminalreporter.write_line(f"📄 {self.json_path}")
@@ -0,0 +1,61 @@
+import numpy as np
+from scipy.spatial import cKDTree
+from utilities.fuzzy_kernel import fuzzy_scores
+
+# An OCR box counts as an anchor when partial_ratio(step, text) beats this
+ANCHOR_THRESHOLD = 75
+# Pixels from an anchor at which the proximity bonus reaches 0
+PROXIMITY_RADIUS = 500
+
+
+def ocr_anchors(query, ocr_results, threshold=ANCHOR_THRESHOLD):
+    """
+    Centers of every OCR box whose text matches `query` above the threshold, with a
+    weight relative to the best match (best = 1.0), from one cdist call over the texts.
+    """
+    if not ocr_results:
+        return np.empty((0, 2)), np.empty(0)
+    scores = fuzzy_scores([query.lower()], [str(text).lower() for _, text, _ in ocr_results])[0]
+    keep = np.flatnonzero(scores > threshold)
+    if not len(keep):
+        return np.empty((0, 2)), np.empty(0)
+    centers = np.array([np.asarray(ocr_results[i][0], dtype=np.float64).mean(axis=0) for i in keep])
+    return centers, scores[keep] / scores[keep].max()
+
+
+def element_centers(elements):
+    rects = [el['rect'] for el in elements]
+    return np.array([[r['x'] + r['width'] / 2, r['y'] + r['height'] / 2] for r in rects],
+                    dtype=np.float64).reshape(-1, 2)
+
+
+class ProximityIndex:
+    """
+    📍 SPATIAL INDEX: cKDTree over the scraped elements' centers. One sparse distance
+    query against all anchors gives every element within `radius` of any of them;
+    the bonus is 100 * (1 - distance / radius) * anchor weight, and the largest bonus
+    over the anchors wins.
+    With a single anchor this equals the old per-element _calculate_distance bonus.
+    """
+
+    def __init__(self, elements, radius=PROXIMITY_RADIUS):
+        self.radius = radius
+        self.centers = element_centers(elements)
+        self.tree = cKDTree(self.centers) if len(self.centers) else None
+
+    def bonuses(self, anchors, weights):
+        out = np.zeros(len(self.centers))
+        if self.tree is None or not len(anchors):
+            return out
+        pairs = self.tree.sparse_distance_matrix(cKDTree(anchors), self.radius, output_type='ndarray')
+        if len(pairs):
+            np.maximum.at(out, pairs['i'], weights[pairs['j']] * 100 * (1 - pairs['v'] / self.radius))
+        return out
+
+
+def proximity_bonuses(query, ocr_results, elements, radius=PROXIMITY_RADIUS, threshold=ANCHOR_THRESHOLD):
+    """Per-element proximity bonus to every OCR anchor of `query`, plus the anchor count."""
+    anchors, weights = ocr_anchors(query, ocr_results, threshold)
+    if not len(anchors):
+        return np.zeros(len(elements)), 0
+    return ProximityIndex(elements, radius).bonuses(anchors, weights), len(anchors)
@@ -0,0 +1,160 @@
+import time
+
+INSTRUMENT_JS = """
+(function () {
+    if (window.__aiReady) return;
+    const st = window.__aiReady = {
+        pending: new Map(), nextId: 1, lastNetwork: performance.now(),
+        lastMutation: performance.now(), framesSinceMutation: 0
+    };
+
+    // 🌐 In-flight fetch / XHR accounting
+    const begin = () => { const id = st.nextId++; st.pending.set(id, performance.now()); st.lastNetwork = performance.now(); return id; };
+    const end = (id) => { st.pending.delete(id); st.lastNetwork = performance.now(); };
+    if (window.fetch) {
+        const nativeFetch = window.fetch;
+        window.fetch = function () {
+            const id = begin();
+            try { return nativeFetch.apply(this, arguments).finally(() => end(id)); }
+            catch (e) { end(id); throw e; }
+        };
+    }
+    const nativeSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        const id = begin();
+        this.addEventListener('loadend', () => end(id), { once: true });
+        try { return nativeSend.apply(this, arguments); } catch (e) { end(id); throw e; }
+    };
+
+    // 🛰️ DOM quiet period + 🎞️ animation frames since the last mutation
+    // Inline style writes (our own highlights, CSS-driven spinners/carousels) are not content changes
+    const isContent = (r) => !(r.type === 'attributes' && r.attributeName === 'style');
+    new MutationObserver((records) => {
+        if (records.some(isContent)) { st.lastMutation = performance.now(); st.framesSinceMutation = 0; }
+    }).observe(document, { subtree: true, childList: true, attributes: true, characterData: true });
+    const tick = () => { st.framesSinceMutation++; requestAnimationFrame(tick); };
+    requestAnimationFrame(tick);
+
+    st.status = (o) => {
+        const now = performance.now();
+        let inflight = 0;
+        // Long-polling / streaming requests would never finish: stop counting them after longRequestMs
+        st.pending.forEach(started => { if (now - started < o.longRequestMs) inflight++; });
+        let loader = false;
+        if (o.loaderSelector) {
+            for (const el of document.querySelectorAll(o.loaderSelector)) { if (el.getClientRects().length) { loader = true; break; } }
+        }
+        const s = {
+            readyState: document.readyState, inflight: inflight, loader: loader,
+            quietMs: Math.round(now - st.lastMutation), networkQuietMs: Math.round(now - st.lastNetwork),
+            frames: st.framesSinceMutation
+        };
+        // Hidden tabs do not run rAF, so frames cannot be part of the verdict there
+        s.ready = s.readyState === 'complete' && !loader && inflight === 0 && s.quietMs >= o.quietMs
+            && s.networkQuietMs >= o.networkQuietMs && (document.hidden || s.frames >= o.minFrames);
+        return s;
+    };
+    st.whenReady = (o) => new Promise(resolve => {
+        const t0 = performance.now();
+        const check = () => {
+            const s = st.status(o);
+            s.waitedMs = Math.round(performance.now() - t0);
+            if (s.ready || s.waitedMs >= o.timeoutMs) resolve(s); else setTimeout(check, o.pollMs);
+        };
+        check();
+    });
+})();
+"""
+
+WAIT_JS = INSTRUMENT_JS + """
+    const done = arguments[arguments.length - 1];
+    window.__aiReady.whenReady(arguments[0]).then(done);
+"""
+
+
+class ReadinessReport:
+    """📊 Wall-clock spent waiting vs. the fixed sleeps each wait replaced."""
+
+    def __init__(self):
+        self.entries = []
+
+    def record(self, label, waited, baseline, ready):
+        self.entries.append({"label": label, "waited": waited, "baseline": baseline, "ready": ready})
+
+    def summary(self):
+        replaced = [e for e in self.entries if e['baseline'] is not None]
+        waited = sum(e['waited'] for e in replaced)
+        baseline = sum(e['baseline'] for e in replaced)
+        return {
+            "waits": len(self.entries),
+            "timeouts": sum(1 for e in self.entries if not e['ready']),
+            "total_wait_s": round(sum(e['waited'] for e in self.entries), 3),
+            "replaced_sleeps_s": round(baseline, 3),
+            "replaced_waits_s": round(waited, 3),
+            "saved_s": round(baseline - waited, 3)
+        }
+
+    def lines(self):
+        s = self.summary()
+        return [
+            f"Page readiness: {s['waits']} waits, {s['timeouts']} timeouts, {s['total_wait_s']}s waited in total",
+            f"Replaced fixed sleeps: {s['replaced_sleeps_s']}s -> {s['replaced_waits_s']}s (saved {s['saved_s']}s)"
+        ]
+
+
+READINESS_REPORT = ReadinessReport()
+
+
+class PageReadiness:
+    """
+    ⏱️ EVENT-DRIVEN READINESS: Instruments the page (in-flight fetch/XHR, MutationObserver
+    quiet period, requestAnimationFrame settling, loader visibility) and awaits a single
+    'ready' verdict with execute_async_script instead of sleeping a fixed amount.
+    Inline style mutations do not count as DOM activity; quiet_ms=0 drops the quiet
+    period (the other checks still apply).
+    """
+
+    def __init__(self, quiet_ms=300, network_quiet_ms=200, min_frames=2, timeout=10, poll_ms=50,
+                 long_request_ms=5000, loader_selector="[class*='loader']", report=READINESS_REPORT):
+        self.quiet_ms = quiet_ms
+        self.network_quiet_ms = network_quiet_ms
+        self.min_frames = min_frames
+        self.timeout = timeout
+        self.poll_ms = poll_ms
+        self.long_request_ms = long_request_ms
+        self.loader_selector = loader_selector
+        self.report = report
+
+    def attach(self, driver):
+        """Chrome only: instrument every new document before its own scripts run."""
+        try:
+            driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': INSTRUMENT_JS})
+            return True
+        except Exception:
+            return False
+
+    def _options(self):
+        return {
+            "quietMs": self.quiet_ms, "networkQuietMs": self.network_quiet_ms, "minFrames": self.min_frames,
+            "timeoutMs": int(self.timeout * 1000), "pollMs": self.poll_ms,
+            "longRequestMs": self.long_request_ms, "loaderSelector": self.loader_selector
+        }
+
+    def wait(self, driver, baseline=None, label=None):
+        """Blocks until the page reports ready (or timeout). `baseline`: the sleep this wait replaces."""
+        started = time.perf_counter()
+        try:
+            if self.timeout + 5 > 30:
+                driver.set_script_timeout(self.timeout + 5)
+            status = driver.execute_async_script(WAIT_JS, self._options()) or {}
+        except Exception as e:
+            status = {"ready": False, "error": str(e)}
+        waited = time.perf_counter() - started
+        self.report.record(label, waited, baseline, bool(status.get('ready')))
+        status['waited_s'] = round(waited, 3)
+        return status
+
+
+def wait_until_ready(driver, baseline=None, label=None, **thresholds):
+    """Drop-in for the post-navigation time.sleep(n) calls: wait_until_ready(driver, baseline=n)."""
+    return PageReadiness(**thresholds).wait(driver, baseline=baseline, label=label)
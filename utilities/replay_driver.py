@@ -0,0 +1,265 @@
+import base64
+import hashlib
+import json
+import os
+from collections import Counter, defaultdict
+
+FIXTURE_FILE = "fixture.json"
+
+
+def script_key(script):
+    """Stable id for a JS source: responses are stored and served per script."""
+    return hashlib.sha1(script.encode('utf-8')).hexdigest()[:16]
+
+
+def _locator_key(by, value):
+    return f"{by}|{value}"
+
+
+def _element_state(element):
+    """Everything the engines ask a WebElement for, captured once at record time."""
+    try:
+        return {
+            "tag_name": element.tag_name, "text": element.text, "rect": element.rect,
+            "displayed": element.is_displayed(), "enabled": element.is_enabled()
+        }
+    except Exception:
+        return {"displayed": False, "enabled": False}
+
+
+def _encode(value):
+    """JSON-safe copy of an execute_script response (WebElements become their recorded state)."""
+    if isinstance(value, dict):
+        return {k: _encode(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(v) for v in value]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if hasattr(value, 'is_displayed'):
+        return {"__element__": _element_state(value)}
+    return str(value)
+
+
+def _decode(value):
+    if isinstance(value, dict):
+        if "__element__" in value:
+            return ReplayElement(**value["__element__"])
+        return {k: _decode(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    return value
+
+
+def empty_fixture():
+    return {"meta": {"urls": []}, "scripts": {}, "async_scripts": {}, "finds": {}, "scrapes": [], "screenshots": []}
+
+
+class ReplayElement:
+    """WebElement stand-in with the state recorded for it (or a visible, enabled default)."""
+
+    def __init__(self, tag_name="div", text="", rect=None, displayed=True, enabled=True, attributes=None):
+        self.tag_name = tag_name
+        self.text = text
+        self.rect = rect or {"x": 0, "y": 0, "width": 0, "height": 0}
+        self.displayed = displayed
+        self.enabled = enabled
+        self.attributes = attributes or {}
+
+    def is_displayed(self):
+        return self.displayed
+
+    def is_enabled(self):
+        return self.enabled
+
+    def get_attribute(self, name):
+        return self.attributes.get(name)
+
+    def click(self):
+        pass
+
+    def clear(self):
+        pass
+
+    def send_keys(self, *value):
+        pass
+
+
+class RecordingDriver:
+    """
+    📼 RECORD MODE: Wraps a live WebDriver and writes everything the engines read from it
+    (execute_script responses, located elements, screenshots, scrape results) to a fixture
+    directory that ReplayDriver serves back without a browser or network.
+    """
+
+    def __init__(self, driver, fixture_dir):
+        self._driver = driver
+        self.fixture_dir = fixture_dir
+        self.fixture = empty_fixture()
+
+    def __getattr__(self, name):
+        return getattr(self._driver, name)
+
+    def _remember(self, table, script, response):
+        entry = self.fixture[table].setdefault(script_key(script), {"head": script.strip()[:80], "responses": []})
+        entry["responses"].append(_encode(response))
+        return response
+
+    def get(self, url):
+        self.fixture["meta"]["urls"].append(url)
+        return self._driver.get(url)
+
+    def execute_script(self, script, *args):
+        return self._remember("scripts", script, self._driver.execute_script(script, *args))
+
+    def execute_async_script(self, script, *args):
+        return self._remember("async_scripts", script, self._driver.execute_async_script(script, *args))
+
+    def find_elements(self, by, value=None):
+        elements = self._driver.find_elements(by, value)
+        self.fixture["finds"].setdefault(_locator_key(by, value), []).append([_element_state(e) for e in elements])
+        return elements
+
+    def find_element(self, by, value=None):
+        element = self._driver.find_element(by, value)
+        self.fixture["finds"].setdefault(_locator_key(by, value), []).append([_element_state(element)])
+        return element
+
+    def get_screenshot_as_png(self):
+        png = self._driver.get_screenshot_as_png()
+        self.fixture["screenshots"].append(base64.b64encode(png).decode('ascii'))
+        return png
+
+    def get_screenshot_as_base64(self):
+        return base64.b64encode(self.get_screenshot_as_png()).decode('ascii')
+
+    def save_screenshot(self, filename):
+        with open(filename, 'wb') as f:
+            f.write(self.get_screenshot_as_png())
+        return True
+
+    def record_scrape(self, intents, elements):
+        """Called by the engine with the final _get_deep_elements result (benchmark input)."""
+        self.fixture["scrapes"].append({"intents": list(intents or []), "elements": _encode(elements)})
+
+    def save(self):
+        os.makedirs(self.fixture_dir, exist_ok=True)
+        path = os.path.join(self.fixture_dir, FIXTURE_FILE)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.fixture, f)
+        return path
+
+
+class ReplayDriver:
+    """
+    ▶️ REPLAY DRIVER: Serves a recorded fixture back in call order, per script.
+    When a script has no (more) recorded responses, the first responder whose marker
+    appears in the script source answers instead; responders also drive synthetic pages.
+    """
+
+    def __init__(self, fixture=None, responders=None, default_element=True):
+        self.fixture = fixture or empty_fixture()
+        self.responders = DEFAULT_RESPONDERS + list(responders or [])
+        self.default_element = default_element
+        self.current_url = (self.fixture["meta"].get("urls") or ["about:blank"])[0]
+        self._cursor = defaultdict(int)
+        self.calls = Counter()
+
+    @classmethod
+    def load(cls, fixture_dir, responders=None):
+        with open(os.path.join(fixture_dir, FIXTURE_FILE), 'r', encoding='utf-8') as f:
+            return cls(json.load(f), responders)
+
+    def _next(self, table, key):
+        entry = self.fixture[table].get(key)
+        if not entry:
+            return False, None
+        responses = entry["responses"] if isinstance(entry, dict) else entry
+        i = self._cursor[(table, key)]
+        self._cursor[(table, key)] = i + 1
+        # Past the end of the recording the page is assumed to stay as it was last seen
+        return True, responses[min(i, len(responses) - 1)]
+
+    def _respond(self, table, script, args):
+        self.calls[table] += 1
+        found, response = self._next(table, script_key(script))
+        if found:
+            return _decode(response)
+        for marker, responder in self.responders:
+            if marker in script:
+                return responder(self, *args)
+        return None
+
+    def execute_script(self, script, *args):
+        return self._respond("scripts", script, args)
+
+    def execute_async_script(self, script, *args):
+        return self._respond("async_scripts", script, args)
+
+    def find_elements(self, by, value=None):
+        self.calls["finds"] += 1
+        found, states = self._next("finds", _locator_key(by, value))
+        if found:
+            return [ReplayElement(**s) for s in states]
+        return [ReplayElement()] if self.default_element else []
+
+    def find_element(self, by, value=None):
+        elements = self.find_elements(by, value)
+        if not elements:
+            from selenium.common.exceptions import NoSuchElementException
+            raise NoSuchElementException(f"{by}={value} not in fixture")
+        return elements[0]
+
+    def get_screenshot_as_png(self):
+        self.calls["screenshots"] += 1
+        shots = self.fixture["screenshots"]
+        if not shots:
+            return b""
+        i = self._cursor[("screenshots", None)]
+        self._cursor[("screenshots", None)] = i + 1
+        shot = shots[min(i, len(shots) - 1)]
+        return base64.b64decode(shot) if isinstance(shot, str) else shot
+
+    def get_screenshot_as_base64(self):
+        return base64.b64encode(self.get_screenshot_as_png()).decode('ascii')
+
+    def save_screenshot(self, filename):
+        with open(filename, 'wb') as f:
+            f.write(self.get_screenshot_as_png())
+        return True
+
+    def get(self, url):
+        self.current_url = url
+
+    def set_script_timeout(self, seconds):
+        pass
+
+    def execute_cdp_cmd(self, cmd, params):
+        return {}
+
+    def maximize_window(self):
+        pass
+
+    def quit(self):
+        pass
+
+
+def _validate_all_ok(driver, xpaths, color=None, want_rects=False):
+    statuses = ['ok'] * len(xpaths)
+    if want_rects:
+        return {"statuses": statuses, "rects": [{"x": 0, "y": 0, "width": 0, "height": 0}] * len(xpaths)}
+    return statuses
+
+
+def _probe_all_found(driver, candidates):
+    """Every strategy matches one visible element, like find_elements' default_element."""
+    found = {"count": 1, "visible": 1, "element": ReplayElement(), "rect": {"x": 0, "y": 0, "width": 0, "height": 0}}
+    return [[dict(found) for _ in strategies] for strategies in candidates]
+
+
+# Answers for the engine's own scripts when nothing was recorded for them
+DEFAULT_RESPONDERS = [
+    ("XPathResult.FIRST_ORDERED_NODE_TYPE", _validate_all_ok),
+    ("__aiReady", lambda driver, *args: {"ready": True, "readyState": "complete", "inflight": 0}),
+    ("devicePixelRatio", lambda driver, *args: 1),
+    ("__aiProbe", _probe_all_found),
+]
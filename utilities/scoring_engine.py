@@ -0,0 +1,112 @@
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+from utilities.fuzzy_kernel import fuzzy_scores
+from utilities.phase_timing import PHASE_TIMER
+
+
+class BatchScoringEngine:
+    """
+    🚀 THE MATRIX BRAIN: Scores every scraped element against a query in one pass.
+    Element labels are embedded in a single batch (spaCy nlp.pipe or the memory-mapped
+    word-vector table), stacked into a matrix and compared with one cosine product.
+    """
+
+    def __init__(self, embedder, weights, timer=PHASE_TIMER):
+        # embedder: anything with .width and .vectors(texts) -> float32 matrix (see utilities.word_vectors)
+        self.embedder = embedder
+        self.weights = weights
+        self.timer = timer
+
+    # --- 🧬 EMBEDDINGS ---
+
+    def embed(self, texts):
+        """Returns (matrix, norms) for the given texts, one row per text."""
+        if not texts:
+            width = self.embedder.width
+            return np.zeros((0, width), dtype=np.float32), np.zeros(0, dtype=np.float32)
+
+        # Labels repeat a lot on real pages ("Edit", "Delete"...), embed each one once.
+        unique = list(dict.fromkeys(texts))
+        index = {text: i for i, text in enumerate(unique)}
+        matrix = self.embedder.vectors(unique)[[index[t] for t in texts]]
+        return matrix, np.linalg.norm(matrix, axis=1)
+
+    def similarity(self, query, texts):
+        """Vectorized Doc.similarity of the query against every text (spaCy semantics)."""
+        return self.similarity_matrix([query], texts)[0]
+
+    def similarity_matrix(self, queries, texts):
+        """queries x texts Doc.similarity matrix from one embedding batch."""
+        sims = np.zeros((len(queries), len(texts)), dtype=np.float32)
+        if not queries or not texts:
+            return sims
+
+        matrix, norms = self.embed(list(queries) + list(texts))
+        q_mat, q_norms = matrix[:len(queries)], norms[:len(queries)]
+        t_mat, t_norms = matrix[len(queries):], norms[len(queries):]
+
+        denom = np.outer(q_norms, t_norms)
+        valid = denom > 0
+        sims[valid] = (q_mat @ t_mat.T)[valid] / denom[valid]
+
+        # spaCy short-circuits identical token sequences to 1.0, even when they are OOV.
+        # (The legacy loop never asked spaCy when the query itself had no vector.)
+        positions = {}
+        for j, text in enumerate(texts):
+            positions.setdefault(" ".join(text.split()), []).append(j)
+        for i, query in enumerate(queries):
+            same = positions.get(" ".join(query.split()))
+            if same and q_norms[i] > 0:
+                sims[i, same] = 1.0
+        return sims
+
+    # --- 🎯 RANKING ---
+
+    def _fuzzy_matrix(self, queries, elements):
+        """intents x elements weighted fuzzy scores: three native cdist calls for the whole step."""
+        aria = [el['aria'].lower() for el in elements]
+        placeholder = [el['placeholder'].lower() for el in elements]
+        intent = [el['intent'].lower() for el in elements]
+        return (fuzzy_scores(queries, aria, "partial_ratio") * self.weights.get('aria-label', 0) +
+                fuzzy_scores(queries, placeholder, "partial_ratio") * self.weights.get('placeholder', 0) +
+                fuzzy_scores(queries, intent, "token_sort_ratio") * self.weights.get('label_text', 0))
+
+    def score_matrix(self, queries, elements):
+        """intents x elements weighted totals: one fuzzy row per intent, one shared embedding pass."""
+        queries = [q.lower() for q in queries]
+        with self.timer.span("fuzzy", intents=len(queries), elements=len(elements)):
+            weighted = self._fuzzy_matrix(queries, elements)
+        with self.timer.span("embed", texts=len(queries) + len(elements)):
+            sims = self.similarity_matrix(queries, [el['intent'].lower() for el in elements])
+        return (weighted / 2) + (sims.astype(np.float64) * 50)
+
+    def score(self, query, elements):
+        """Returns the weighted total for every element, in scrape order."""
+        return self.score_matrix([query], elements)[0]
+
+    def rank(self, query, elements, top_k=None):
+        """Ranked [{'total', 'element'}] list, highest first. Ties keep scrape order."""
+        if not elements:
+            return []
+        totals = self.score(query, elements)
+        order = np.argsort(-totals, kind='stable')
+        if top_k is not None:
+            order = order[:top_k]
+        return [{"total": float(totals[i]), "element": elements[i]} for i in order]
+
+    @staticmethod
+    def assign(totals, threshold):
+        """
+        🧩 CONFLICT-FREE PICK: Maximum-total one-to-one matching of intents (rows) to
+        elements (columns). Pairs below the threshold are worth nothing, so they never
+        steal an element from another intent. Returns a column index or None per row.
+        """
+        picks = [None] * totals.shape[0]
+        if not totals.size:
+            return picks
+        gain = np.where(totals >= threshold, totals, 0.0)
+        rows, cols = linear_sum_assignment(gain, maximize=True)
+        for r, c in zip(rows, cols):
+            if totals[r, c] >= threshold:
+                picks[r] = int(c)
+        return picks
@@ -0,0 +1,125 @@
+import atexit
+import os
+import queue
+import threading
+import numpy as np
+
+# Optional debug images (raw screenshot + OCR boxes); off unless asked for
+DEFAULT_ARTIFACTS = os.getenv("AI_OCR_ARTIFACTS", "") == "1"
+
+
+def decode_png(png):
+    """PNG bytes -> HxWx3 RGB uint8 array (OpenCV when installed, Pillow otherwise)."""
+    try:
+        import cv2
+        bgr = cv2.imdecode(np.frombuffer(png, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if bgr is None:
+            raise ValueError("screenshot is not a decodable image")
+        return cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+    except ImportError:
+        from io import BytesIO
+        from PIL import Image
+        return np.asarray(Image.open(BytesIO(png)).convert("RGB"))
+
+
+def encode_png(image):
+    """BGR array -> PNG bytes (for ArtifactWriter renders)."""
+    import cv2
+    ok, buffer = cv2.imencode(".png", image)
+    return buffer.tobytes() if ok else b""
+
+
+class ScreenFrame:
+    """
+    📸 ZERO-DISK SCREENSHOT: get_screenshot_as_png bytes, decoded once into a NumPy
+    array that OCR, debug rendering and later analysis all share.
+    EasyOCR takes the RGB array directly (no temp file, no second decode); PNGs only
+    reach disk as optional ArtifactWriter artifacts (AI_OCR_ARTIFACTS=1).
+    """
+
+    def __init__(self, png):
+        self.png = png
+        self._rgb = None
+
+    @classmethod
+    def grab(cls, driver):
+        return cls(driver.get_screenshot_as_png())
+
+    @property
+    def rgb(self):
+        if self._rgb is None:
+            self._rgb = decode_png(self.png)  # shared: treat as read-only, draw on bgr() copies
+        return self._rgb
+
+    @property
+    def shape(self):
+        return self.rgb.shape
+
+    def bgr(self):
+        """Writable OpenCV-order copy, for drawing debug overlays."""
+        return np.ascontiguousarray(self.rgb[:, :, ::-1])
+
+
+def _worker_path(path):
+    """discovery_view.png -> discovery_view.gw1.png under xdist, so workers never share a file."""
+    worker = os.getenv("PYTEST_XDIST_WORKER")
+    if not worker:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}.{worker}{ext}"
+
+
+class ArtifactWriter:
+    """
+    💾 OFF THE HOT PATH: Debug images are queued and written by one background thread.
+    Disabled writers drop everything (the default); flush() waits for pending writes.
+    """
+
+    def __init__(self, enabled=DEFAULT_ARTIFACTS, out_dir="."):
+        self.enabled = enabled
+        self.out_dir = out_dir
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.written = 0
+        self.failed = 0
+
+    def _run(self):
+        while True:
+            path, render = self._queue.get()
+            try:
+                data = render()
+                if data:
+                    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+                    with open(path, 'wb') as f:
+                        f.write(data)
+                    self.written += 1
+            except Exception as e:
+                self.failed += 1
+                print(f"⚠️ Artifact {path} not written: {e}")
+            finally:
+                self._queue.task_done()
+
+    def submit(self, filename, render):
+        """Queues render() -> bytes to be written as filename (worker-suffixed). Returns the path or None."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="ocr-artifacts", daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+        path = _worker_path(os.path.join(self.out_dir, filename))
+        self._queue.put((path, render))
+        return path
+
+    def write_png(self, filename, png):
+        return self.submit(filename, lambda: png)
+
+    def flush(self):
+        if self._thread is not None:
+            self._queue.join()
+        return self.written
+
+
+ARTIFACTS = ArtifactWriter()
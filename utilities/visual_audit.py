@@ -0,0 +1,111 @@
+import os
+import re
+from io import BytesIO
+from utilities.screen_capture import ArtifactWriter
+
+# off: no visuals | live: in-page highlights (debugging) | recorded: one annotated screenshot per step
+AUDIT_MODES = ("off", "live", "recorded")
+DEFAULT_AUDIT_MODE = os.getenv("AI_AUDIT_MODE", "live")
+
+
+class VisualAudit:
+    """
+    🎥 RECORDABLE AUDIT TRAIL: Instead of painting (and sleeping on) every element in the
+    browser, 'recorded' mode keeps the rects + colors of each step in memory, takes ONE
+    screenshot at the end of the step and hands it to a background ArtifactWriter,
+    which draws the boxes and writes the PNG off the hot path.
+    """
+
+    def __init__(self, mode=DEFAULT_AUDIT_MODE, out_dir="logs", writer=None):
+        if mode not in AUDIT_MODES:
+            raise ValueError(f"Unknown audit mode '{mode}', use one of {list(AUDIT_MODES)}")
+        self.mode = mode
+        self.out_dir = out_dir
+        self.writer = writer or ArtifactWriter(enabled=True, out_dir=out_dir)
+        self._marks = []
+        self._paths = []
+        self._dpr = None
+        self._sequence = 0
+
+        # 📊 Counters
+        self.marks_recorded = 0
+        self.frames_captured = 0
+
+    @property
+    def live(self):
+        return self.mode == "live"
+
+    @property
+    def recording(self):
+        return self.mode == "recorded"
+
+    def color(self, color):
+        """The in-page highlight color to use: only 'live' mode touches the page."""
+        return color if self.live else None
+
+    def mark(self, rects, color, labels=None):
+        """Remembers element rects (CSS px, viewport-relative) for the current step. None rects are skipped."""
+        if not self.recording:
+            return
+        labels = labels or [None] * len(rects)
+        for rect, label in zip(rects, labels):
+            if rect:
+                self._marks.append({"rect": rect, "color": color, "label": label})
+                self.marks_recorded += 1
+
+    def capture(self, driver, label):
+        """Ends a step: one screenshot for all of its marks, drawn and written in the background."""
+        if not self.recording or not self._marks:
+            return False
+        try:
+            if self._dpr is None:
+                self._dpr = float(driver.execute_script("return window.devicePixelRatio || 1;"))
+            png = driver.get_screenshot_as_png()
+        except Exception:
+            self._marks = []
+            return False
+        frame = {"png": png, "marks": self._marks, "dpr": self._dpr}
+        self._marks = []
+        self.frames_captured += 1
+        self._sequence += 1
+        slug = re.sub(r'[^a-z0-9]+', '_', str(label).lower()).strip('_')[:60] or "step"
+        self._paths.append(self.writer.submit(f"audit_{self._sequence:03d}_{slug}.png",
+                                              lambda: self._draw(frame)))
+        return True
+
+    @staticmethod
+    def _draw(frame):
+        """Screenshot + boxes -> PNG bytes (runs on the writer thread)."""
+        from PIL import Image, ImageDraw
+
+        image = Image.open(BytesIO(frame['png'])).convert("RGB")
+        draw = ImageDraw.Draw(image)
+        scale = frame['dpr']
+        for mark in frame['marks']:
+            r = mark['rect']
+            box = [r['x'] * scale, r['y'] * scale,
+                   (r['x'] + r['width']) * scale, (r['y'] + r['height']) * scale]
+            try:
+                draw.rectangle(box, outline=mark['color'], width=3)
+                if mark['label']:
+                    draw.text((box[0], max(0, box[1] - 12)), str(mark['label'])[:60], fill=mark['color'])
+            except ValueError:
+                draw.rectangle(box, outline="orange", width=3)
+        buffer = BytesIO()
+        image.save(buffer, format="PNG")
+        return buffer.getvalue()
+
+    def render(self):
+        """Waits for the frames queued since the last call to be written. Returns their file paths."""
+        self.writer.flush()
+        paths, self._paths = self._paths, []
+        return paths
+
+    def stats(self):
+        return {
+            "mode": self.mode,
+            "marks_recorded": self.marks_recorded,
+            "frames_captured": self.frames_captured,
+            "frames_written": self.writer.written,
+            "failed": self.writer.failed
+        }
@@ -0,0 +1,206 @@
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+import numpy as np
+
+# Where the exported table lives; workers memory-map the same files and share the pages
+DEFAULT_TABLE_DIR = os.getenv("AI_VECTOR_TABLE", os.path.join(os.getcwd(), "word_vectors"))
+
+# Max |cosine(table) - cosine(spaCy)| we accept per storage type (checked at export time)
+TOLERANCE = {"float32": 1e-5, "float16": 2e-3, "int8": 2e-2}
+
+# spaCy's English rules for UI-label text: clitics split off ("Do" "n't", "User" "'s"), numbers kept
+# whole, hyphens and punctuation as their own tokens. Abbreviations ("Dr.") and emails still differ.
+# Part of the table's version: vectors cached under an older tokenization are not reused
+TOKENIZER_REVISION = 2
+TOKEN_RE = re.compile(r"\w+(?=n't\b)|n't\b|'(?:s|re|ve|ll|d|m)\b|\d+(?:[.,]\d+)+|\w+|[^\w\s]", re.IGNORECASE)
+VERIFY_TEXTS = [
+    "username", "password", "login button", "forgot your password", "company logo",
+    "employee name", "search", "submit", "first name", "country", "region", "gender",
+    "logo branding icon image graphic picture banner", "textbox input field textarea typing entry",
+    "button link click submit press toggle signin login", "enter user name", "click on login button",
+    # Where a naive tokenizer parts ways with spaCy's
+    "Don't have an account?", "User's e-mail:", "Can't log in? Reset it.", "We're sorry, you'll need to sign-in again.",
+    "Enter username as 'Admin'", "Total: 1,250.50 items",
+]
+
+
+def _key(word):
+    """Stable 64-bit key for a vocabulary string (no spaCy StringStore needed at runtime)."""
+    return int.from_bytes(hashlib.blake2b(word.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class SpacyEmbedder:
+    """Full spaCy model as an embedder: Doc.vector for each text, pipeline components disabled."""
+
+    def __init__(self, nlp, batch_size=256):
+        self.nlp = nlp
+        self.batch_size = batch_size
+
+    @property
+    def width(self):
+        return self.nlp.vocab.vectors_length
+
+    @property
+    def version(self):
+        return f"{self.nlp.meta.get('name', '')}-{self.nlp.meta.get('version', '')}"
+
+    def vectors(self, texts):
+        docs = self.nlp.pipe(texts, batch_size=self.batch_size, disable=self.nlp.pipe_names)
+        return np.vstack([doc.vector for doc in docs] or [np.zeros((0, self.width))]).astype(np.float32)
+
+
+class WordVectorTable:
+    """
+    ⚡ VECTOR-ONLY MODE: The model's word vectors in a compact memory-mapped table.
+    Tokenize + mean-pool gives the same Doc.vector spaCy would (OOV tokens count as
+    zeros), so cosine similarities match within TOLERANCE[dtype]. Opening the table
+    costs milliseconds and the OS shares its pages between pytest workers.
+    """
+
+    def __init__(self, table_dir=DEFAULT_TABLE_DIR):
+        started = time.perf_counter()
+        self.table_dir = table_dir
+        with open(os.path.join(table_dir, "meta.json"), 'r') as f:
+            self.meta = json.load(f)
+        self._data = np.load(os.path.join(table_dir, "vectors.npy"), mmap_mode='r')
+        self._keys = np.load(os.path.join(table_dir, "keys.npy"), mmap_mode='r')
+        self._rows = np.load(os.path.join(table_dir, "rows.npy"), mmap_mode='r')
+        self._scales = (np.load(os.path.join(table_dir, "scales.npy"), mmap_mode='r')
+                        if self.meta['dtype'] == 'int8' else None)
+        self._row_cache = {}
+        self.load_ms = (time.perf_counter() - started) * 1000
+
+    @staticmethod
+    def exists(table_dir=DEFAULT_TABLE_DIR):
+        return os.path.exists(os.path.join(table_dir, "meta.json"))
+
+    @property
+    def width(self):
+        return self.meta['width']
+
+    @property
+    def version(self):
+        return f"{self.meta['model']}-{self.meta['model_version']}-{self.meta['dtype']}-tok{TOKENIZER_REVISION}"
+
+    def _row(self, token):
+        row = self._row_cache.get(token)
+        if row is None:
+            key = np.uint64(_key(token))
+            pos = int(np.searchsorted(self._keys, key))
+            row = int(self._rows[pos]) if pos < len(self._keys) and self._keys[pos] == key else -1
+            self._row_cache[token] = row
+        return row
+
+    def vector(self, text):
+        tokens = TOKEN_RE.findall(text)
+        if not tokens:
+            return np.zeros(self.width, dtype=np.float32)
+        rows = [r for r in (self._row(t) for t in tokens) if r >= 0]
+        if not rows:
+            return np.zeros(self.width, dtype=np.float32)
+        block = np.asarray(self._data[rows], dtype=np.float32)
+        if self._scales is not None:
+            block *= np.asarray(self._scales[rows], dtype=np.float32)[:, None]
+        # Divide by ALL tokens: spaCy averages OOV tokens in as zero vectors
+        return block.sum(axis=0) / len(tokens)
+
+    def vectors(self, texts):
+        out = np.zeros((len(texts), self.width), dtype=np.float32)
+        for i, text in enumerate(texts):
+            out[i] = self.vector(text)
+        return out
+
+
+def load_embedder(model="en_core_web_md", table_dir=DEFAULT_TABLE_DIR):
+    """Vector table when one has been exported, otherwise the full spaCy model."""
+    if WordVectorTable.exists(table_dir):
+        return WordVectorTable(table_dir)
+    import spacy
+    try:
+        nlp = spacy.load(model)
+    except OSError:
+        os.system(f"python -m spacy download {model}")
+        nlp = spacy.load(model)
+    return SpacyEmbedder(nlp)
+
+
+def cosine_similarities(vec, matrix):
+    """Cosine of one vector against every row; 0.0 where either side has no vector (spaCy semantics)."""
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(vec)
+    sims = np.zeros(len(matrix), dtype=np.float32)
+    valid = norms > 0
+    sims[valid] = (matrix[valid] @ vec) / norms[valid]
+    return sims
+
+
+def _cosine(a, b):
+    na, nb = np.linalg.norm(a), np.linalg.norm(b)
+    return float(np.dot(a, b) / (na * nb)) if na and nb else 0.0
+
+
+def verify_against_spacy(table, nlp, texts=VERIFY_TEXTS):
+    """Max absolute cosine-similarity difference between the table and spaCy over all text pairs."""
+    docs = list(nlp.pipe(texts))
+    vecs = table.vectors(texts)
+    worst = 0.0
+    for i in range(len(texts)):
+        for j in range(i + 1, len(texts)):
+            ref = docs[i].similarity(docs[j]) if docs[i].vector_norm and docs[j].vector_norm else 0.0
+            worst = max(worst, abs(ref - _cosine(vecs[i], vecs[j])))
+    return worst
+
+
+def export_vectors(table_dir=DEFAULT_TABLE_DIR, model="en_core_web_md", dtype="float16"):
+    """📦 One-time exporter: model vectors + vocabulary -> memory-mappable table."""
+    if dtype not in TOLERANCE:
+        raise ValueError(f"Unsupported dtype '{dtype}', use one of {list(TOLERANCE)}")
+    import spacy
+
+    nlp = spacy.load(model)
+    vectors = nlp.vocab.vectors
+    data = np.asarray(vectors.data, dtype=np.float32)
+
+    pairs = {}
+    for orth, row in vectors.key2row.items():
+        try:
+            pairs.setdefault(_key(nlp.vocab.strings[orth]), row)
+        except KeyError:
+            continue
+    keys = np.array(sorted(pairs), dtype=np.uint64)
+    rows = np.array([pairs[int(k)] for k in keys], dtype=np.int32)
+
+    os.makedirs(table_dir, exist_ok=True)
+    if dtype == "int8":
+        scales = np.abs(data).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        np.save(os.path.join(table_dir, "scales.npy"), scales.astype(np.float32))
+        np.save(os.path.join(table_dir, "vectors.npy"), np.round(data / scales[:, None]).astype(np.int8))
+    else:
+        np.save(os.path.join(table_dir, "vectors.npy"), data.astype(dtype))
+    np.save(os.path.join(table_dir, "keys.npy"), keys)
+    np.save(os.path.join(table_dir, "rows.npy"), rows)
+
+    meta = {
+        "model": model, "model_version": nlp.meta.get('version', ''), "dtype": dtype,
+        "width": int(data.shape[1]), "rows": int(data.shape[0]), "keys": int(len(keys)),
+        "tolerance": TOLERANCE[dtype]
+    }
+    with open(os.path.join(table_dir, "meta.json"), 'w') as f:
+        json.dump(meta, f, indent=4)
+
+    meta["max_error"] = verify_against_spacy(WordVectorTable(table_dir), nlp)
+    with open(os.path.join(table_dir, "meta.json"), 'w') as f:
+        json.dump(meta, f, indent=4)
+    if meta["max_error"] > meta["tolerance"]:
+        print(f"⚠️ Max similarity error {meta['max_error']:.5f} exceeds tolerance {meta['tolerance']}")
+    return meta
+
+
+if __name__ == "__main__":
+    # python -m utilities.word_vectors [table_dir] [float32|float16|int8]
+    target = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_TABLE_DIR
+    print(export_vectors(target, dtype=sys.argv[2] if len(sys.argv) > 2 else "float16"))